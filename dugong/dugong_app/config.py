@@ -40,6 +40,7 @@ class DugongConfig:
     sync_idle_max_multiplier: int
     journal_retention_days: int
     journal_fsync: bool
+    journal_backend: str
     derived_rebuild_seconds: int
     data_dir: Path
     file_transport_dir: Path
@@ -55,6 +56,13 @@ class DugongConfig:
     reward_valid_ratio_percent: int
     cofocus_milestone_seconds: int
     cofocus_bonus_pearls: int
+    presence_min_interval_seconds: int
+    state_flush_seconds: int
+    auto_compact_keep_days: int
+    auto_compact_max_mb: int
+    auto_compact_max_lines: int
+    auto_compact_throttle_ms: int
+    state_snapshot_events: int
 
     @classmethod
     def from_env(cls, repo_root: Path) -> "DugongConfig":
@@ -67,6 +75,9 @@ class DugongConfig:
         file_transport_dir = Path(os.getenv("DUGONG_FILE_TRANSPORT_DIR", str(file_transport_default)))
         journal_fsync_raw = os.getenv("DUGONG_JOURNAL_FSYNC", "0").strip().lower()
         journal_fsync = journal_fsync_raw in {"1", "true", "yes", "on"}
+        journal_backend = os.getenv("DUGONG_JOURNAL_BACKEND", "jsonl").strip().lower()
+        if journal_backend not in {"jsonl", "sqlite"}:
+            journal_backend = "jsonl"
 
         return cls(
             source_id=source_id,
@@ -77,6 +88,7 @@ class DugongConfig:
             sync_idle_max_multiplier=max(1, _env_int("DUGONG_SYNC_IDLE_MAX_MULTIPLIER", 6)),
             journal_retention_days=max(1, _env_int("DUGONG_JOURNAL_RETENTION_DAYS", 30)),
             journal_fsync=journal_fsync,
+            journal_backend=journal_backend,
             derived_rebuild_seconds=max(1, _env_int("DUGONG_DERIVED_REBUILD_SECONDS", 5)),
             data_dir=data_dir,
             file_transport_dir=file_transport_dir,
@@ -92,4 +104,12 @@ class DugongConfig:
             reward_valid_ratio_percent=max(50, min(100, _env_int("DUGONG_REWARD_VALID_RATIO_PERCENT", 80))),
             cofocus_milestone_seconds=max(60, _env_int("DUGONG_COFOCUS_MILESTONE_SECONDS", 600)),
             cofocus_bonus_pearls=max(1, _env_int("DUGONG_COFOCUS_BONUS_PEARLS", 5)),
+            presence_min_interval_seconds=max(0, _env_int("DUGONG_PRESENCE_MIN_INTERVAL_SECONDS", 10)),
+            state_flush_seconds=max(1, _env_int("DUGONG_STATE_FLUSH_SECONDS", 1)),
+            # 0 disables background compaction.
+            auto_compact_keep_days=max(0, _env_int("DUGONG_AUTO_COMPACT_KEEP_DAYS", 7)),
+            auto_compact_max_mb=max(1, _env_int("DUGONG_AUTO_COMPACT_MAX_MB", 4)),
+            auto_compact_max_lines=max(1, _env_int("DUGONG_AUTO_COMPACT_MAX_LINES", 20000)),
+            auto_compact_throttle_ms=max(0, _env_int("DUGONG_AUTO_COMPACT_THROTTLE_MS", 50)),
+            state_snapshot_events=max(1, _env_int("DUGONG_STATE_SNAPSHOT_EVENTS", 20)),
         )
@@ -1,24 +1,23 @@
 ﻿from __future__ import annotations
 
 import queue
+import sys
 import threading
 import time
+import traceback
 from pathlib import Path
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from uuid import uuid4
 
 from dugong_app.config import DugongConfig
 from dugong_app.core.event_bus import EventBus
-from dugong_app.core.events import DugongEvent
+from dugong_app.core.events import DugongEvent, utc_now_iso
 from dugong_app.core.events import (
     co_focus_milestone_event,
     click_event,
     manual_ping_event,
     mode_change_event,
     profile_update_event,
-    presence_bye_event,
-    presence_heartbeat_event,
-    presence_hello_event,
     pomo_complete_event,
     pomo_pause_event,
     pomo_resume_event,
@@ -31,6 +30,7 @@ from dugong_app.core.rules import apply_tick, switch_mode
 from dugong_app.interaction.transport_file import FileTransport
 from dugong_app.interaction.transport_github import GithubTransport
 from dugong_app.persistence.event_journal import EventJournal
+from dugong_app.persistence.event_journal_sqlite import SqliteEventJournal, open_event_journal
 from dugong_app.persistence.focus_sessions_json import FocusSessionsStorage
 from dugong_app.persistence.storage_json import JsonStorage
 from dugong_app.persistence.summary_json import SummaryStorage
@@ -38,17 +38,40 @@ from dugong_app.persistence.sync_cursor_json import SyncCursorStorage
 from dugong_app.persistence.runtime_health_json import RuntimeHealthStorage
 from dugong_app.persistence.pomodoro_state_json import PomodoroStateStorage
 from dugong_app.persistence.reward_state_json import RewardStateStorage
-from dugong_app.services.daily_summary import summarize_events
+from dugong_app.persistence.rollup_archive import ROLLUP_ARCHIVE_FILENAME, RollupArchive
+from dugong_app.persistence.state_store import PREVIOUS_GENERATION_KEY, STATE_STORE_FILENAME, StateStore
+from dugong_app.services.daily_summary import summarize_days
 from dugong_app.services.focus_sessions import build_focus_sessions
+from dugong_app.services.job_lanes import OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, JobLane
+from dugong_app.services.journal_compaction import compact_daily_journal, compact_sqlite_journal, compaction_backlog
+from dugong_app.services.presence import PresencePublisher, PresenceTable
+from dugong_app.services.scheduler import DeadlineScheduler
+from dugong_app.services.state_replay import (
+    CURSOR_KEY,
+    REPLAY_EVENT_TYPES,
+    advance,
+    event_time,
+    is_after,
+    snapshot_cursor,
+)
 from dugong_app.services.pomodoro_service import POMO_BREAK, POMO_FOCUS, POMO_PAUSED, PomodoroService
 from dugong_app.services.reward_service import RewardService
 from dugong_app.services.sync_engine import SyncEngine
 from dugong_app.services.data_migration import migrate_legacy_repo_data
 from dugong_app.ui.renderer import Renderer
 from dugong_app.ui.shell_qt import DugongShell
+from dugong_app.ui.view_model import ViewModel
 
 
 class DugongController:
+    # Local persistence must never lose events, so a full lane blocks the
+    # submitter; network/derived jobs can be redone, so they drop the oldest.
+    LOCAL_LANE_MAXSIZE = 1024
+    NETWORK_LANE_MAXSIZE = 256
+    DERIVED_LANE_MAXSIZE = 8
+    # Cheap check (counters + a stat per old shard); the run itself is on the derived lane.
+    AUTO_COMPACT_CHECK_SECONDS = 60
+
     def __init__(self, config: DugongConfig) -> None:
         self.config = config
         self.tick_seconds = config.tick_seconds
@@ -56,8 +79,13 @@ class DugongController:
         self.sync_interval_seconds = config.sync_interval_seconds
 
         self.bus = EventBus()
-        self.storage = JsonStorage(config.data_dir / "dugong_state.json")
+        # Write-behind: the storages below only stage their sections here and
+        # the "flush_state_store" job commits all dirty ones in one transaction.
+        self.state_store = StateStore(config.data_dir / STATE_STORE_FILENAME)
+        self.storage = JsonStorage(config.data_dir / "dugong_state.json", store=self.state_store)
         self.renderer = Renderer()
+        self._view_model = ViewModel()
+        self.scheduler = DeadlineScheduler(on_error=self._on_scheduled_job_error)
         self.state = self.storage.load()
 
         self.unread_remote_count = 0
@@ -65,7 +93,6 @@ class DugongController:
         self._state_dirty = False
         self._pomo_dirty = False
         self._reward_dirty = False
-        self._remote_presence: dict[str, dict[str, str | float]] = {}
         self._last_pomo_render_key: tuple[str, str, int] | None = None
         self._cofocus_last_monotonic = time.monotonic()
         self._cofocus_seconds = 0.0
@@ -73,18 +100,31 @@ class DugongController:
         self._presence_heartbeat_seconds = 15
         self._presence_offline_ttl_seconds = max(90.0, float(self.sync_interval_seconds * 10))
         self._presence_last_heartbeat_monotonic = 0.0
+        self._presence_closed = False
+        # Presence is an ephemeral channel: records go through the transport's
+        # presence files on their own cadence and land in this TTL map, never in
+        # the journal.
+        self._remote_presence = PresenceTable(ttl_seconds=self._presence_offline_ttl_seconds)
+        self.presence_publisher = PresencePublisher(
+            min_interval_seconds=config.presence_min_interval_seconds,
+            keepalive_seconds=max(float(config.presence_min_interval_seconds), self._presence_offline_ttl_seconds / 3.0),
+        )
 
-        self.journal = EventJournal(
-            config.data_dir / "event_journal.jsonl",
+        self.journal = open_event_journal(
+            config.data_dir,
+            backend=config.journal_backend,
             retention_days=config.journal_retention_days,
             fsync_writes=config.journal_fsync,
         )
+        # Closed days are archived before the first append can prune them.
+        self.rollup_archive = RollupArchive(config.data_dir / ROLLUP_ARCHIVE_FILENAME, fsync_writes=config.journal_fsync)
+        self._archive_closed_days(self.journal.day_totals())
         self.summary_storage = SummaryStorage(config.data_dir / "daily_summary.json")
         self.focus_sessions_storage = FocusSessionsStorage(config.data_dir / "focus_sessions.json")
-        self.sync_cursor_storage = SyncCursorStorage(config.data_dir / "sync_cursor.json")
-        self.health_storage = RuntimeHealthStorage(config.data_dir / "sync_health.json")
-        self.pomodoro_storage = PomodoroStateStorage(config.data_dir / "pomodoro_state.json")
-        self.reward_storage = RewardStateStorage(config.data_dir / "reward_state.json")
+        self.sync_cursor_storage = SyncCursorStorage(config.data_dir / "sync_cursor.json", store=self.state_store)
+        self.health_storage = RuntimeHealthStorage(config.data_dir / "sync_health.json", store=self.state_store)
+        self.pomodoro_storage = PomodoroStateStorage(config.data_dir / "pomodoro_state.json", store=self.state_store)
+        self.reward_storage = RewardStateStorage(config.data_dir / "reward_state.json", store=self.state_store)
 
         self.pomodoro = PomodoroService(
             focus_minutes=config.pomo_focus_minutes,
@@ -92,13 +132,26 @@ class DugongController:
             focus_seconds=config.pomo_focus_seconds,
             break_seconds=config.pomo_break_seconds,
         )
-        self.pomodoro.restore(self.pomodoro_storage.load())
+        pomodoro_payload = self.pomodoro_storage.load()
+        self.pomodoro.restore(pomodoro_payload)
 
         self.reward = RewardService(
             base_pearls=config.reward_base_pearls,
             valid_ratio=(config.reward_valid_ratio_percent / 100.0),
         )
-        self.reward.restore(self.reward_storage.load())
+        reward_payload = self.reward_storage.load()
+        self.reward.restore(reward_payload)
+        # Snapshots trail the journal by up to state_snapshot_events events, and
+        # never past the UTC day of the oldest event they have not folded in.
+        self._journal_cursor: dict = {}
+        self._events_since_snapshot = 0
+        self._unsnapshotted_day = ""
+        self._snapshot_requested = False
+        self._replay_journal(
+            snapshot_cursor(pomodoro_payload),
+            snapshot_cursor(reward_payload),
+            reward_ledgers_ahead=bool(reward_payload.get(PREVIOUS_GENERATION_KEY)),
+        )
         self._cofocus_seconds = float(self.reward.cofocus_seconds_total)
 
         transport, init_sync_status = self._create_transport()
@@ -113,7 +166,6 @@ class DugongController:
         if self.sync_status == "auth_missing":
             self.sync_engine.last_status = "auth_missing"
 
-        self._jobs: queue.Queue[dict] = queue.Queue()
         self._results: queue.Queue[dict] = queue.Queue()
         self._sync_lock = threading.Lock()
         self._sync_pending = False
@@ -125,6 +177,8 @@ class DugongController:
         self._derived_dirty = False
         self._derived_rebuild_interval_seconds = config.derived_rebuild_seconds
         self._derived_last_rebuild_monotonic = 0.0
+        self._compaction_day = ""
+        self._compaction_runs = 0
         self._health_dirty = False
         self._health = {
             "sync_state": self.sync_status,
@@ -138,10 +192,42 @@ class DugongController:
             "last_pull_received": 0,
             "cursor_last_seen_event_id_by_source": {},
             "cursor_last_seen_timestamp_by_source": {},
+            "lanes": {},
+            "batches": {},
+            "presence": {},
+            "compaction": {},
         }
-
-        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
-        self._worker.start()
+        self._batch_lock = threading.Lock()
+        self._batch_stats: dict[str, dict] = {}
+        # Journaled events waiting for the network lane. The lane only carries a
+        # publish token, so drop-oldest can never lose them.
+        self._publish_lock = threading.Lock()
+        self._unpublished: list = []
+        self._publish_queued = False
+
+        self._local_lane = JobLane(
+            "local",
+            self._run_local_job,
+            maxsize=self.LOCAL_LANE_MAXSIZE,
+            overflow=OVERFLOW_BLOCK,
+            on_error=self._on_lane_error,
+        )
+        self._network_lane = JobLane(
+            "network",
+            self._run_network_job,
+            maxsize=self.NETWORK_LANE_MAXSIZE,
+            overflow=OVERFLOW_DROP_OLDEST,
+            on_error=self._on_lane_error,
+            on_drop=self._on_network_job_dropped,
+        )
+        self._derived_lane = JobLane(
+            "derived",
+            self._run_derived_job,
+            maxsize=self.DERIVED_LANE_MAXSIZE,
+            overflow=OVERFLOW_DROP_OLDEST,
+            on_error=self._on_lane_error,
+            on_idle=lambda: self._maybe_rebuild_derived(force=False),
+        )
 
         self.shell = self._create_shell()
         self.bus.subscribe("*", self._on_any_event)
@@ -186,89 +272,269 @@ class DugongController:
             )
 
     def _rebuild_derived(self) -> None:
-        all_events = self.journal.load_all()
-        self.summary_storage.save(summarize_events(all_events))
-        self.focus_sessions_storage.save(build_focus_sessions(all_events))
+        # Both backends keep per-day totals (SQL GROUP BY / rollup sidecar): O(days),
+        # plus a few dozen archived week/month records for everything older.
+        day_rows = self.journal.day_totals()
+        self._archive_closed_days(day_rows)
+        self.summary_storage.save(summarize_days(day_rows, self.rollup_archive.records()))
+        if isinstance(self.journal, SqliteEventJournal):
+            session_events = self.journal.load_by_type(["mode_change"])
+        else:
+            session_events = self.journal.load_all()
+        self.focus_sessions_storage.save(build_focus_sessions(session_events))
+
+    def _archive_closed_days(self, day_rows: list[dict]) -> None:
+        today = datetime.now(tz=timezone.utc).date()
+        retention_cutoff = today - timedelta(days=self.config.journal_retention_days - 1)
+        changed = self.rollup_archive.ingest(day_rows, before_day=today.isoformat())
+        if self.rollup_archive.fold(before_day=retention_cutoff.isoformat()) or changed:
+            self.rollup_archive.save()
+
+    def _run_local_job(self, job: dict) -> None:
+        if job.get("kind") != "local_event":
+            return
+        # Coalesce bursts (pomo_complete -> reward_grant -> profile_update, tick +
+        # heartbeat) into one journal write and one publish job.
+        jobs = [job, *self._local_lane.drain_pending()]
+        self._handle_local_events([j["event"] for j in jobs if j.get("kind") == "local_event"])
+
+    def _run_network_job(self, job: dict) -> None:
+        kind = job.get("kind")
+        if kind == "publish":
+            self._handle_publish_events(self._take_unpublished())
+        elif kind == "sync":
+            self._handle_sync_job(manual=bool(job.get("manual", False)))
+        elif kind == "presence":
+            jobs = [job, *self._network_lane.drain_pending(lambda j: j.get("kind") == "presence")]
+            self._handle_presence_job(
+                online=all(bool(j.get("online", True)) for j in jobs),
+                reason=str(jobs[-1].get("reason", "")),
+                force=any(bool(j.get("force", False)) for j in jobs),
+            )
 
-    def _worker_loop(self) -> None:
-        while True:
-            try:
-                job = self._jobs.get(timeout=1)
-            except queue.Empty:
-                self._maybe_rebuild_derived(force=False)
-                continue
+    def _run_derived_job(self, job: dict) -> None:
+        kind = job.get("kind")
+        if kind == "rebuild":
+            self._maybe_rebuild_derived(force=bool(job.get("force", False)))
+        elif kind == "compact":
+            self._handle_compaction_job(trigger=str(job.get("trigger", "")))
+
+    def _on_lane_error(self, lane: str, exc: Exception) -> None:
+        self._results.put({"kind": "worker_error", "lane": lane, "error": str(exc)})
+
+    def _on_scheduled_job_error(self, name: str, exc: Exception) -> None:
+        # Same visibility as an exception escaping a QTimer slot (full
+        # traceback), without taking the other jobs in the wakeup down with it.
+        print(f"[dugong] scheduled job {name} failed:", file=sys.stderr)
+        traceback.print_exception(exc)
+        health = getattr(self, "_health", None)
+        if health is None:
+            return
+        failure = health.setdefault("scheduler_failures", {}).setdefault(name, {"count": 0})
+        failure["count"] = int(failure.get("count", 0)) + 1
+        failure["last_error"] = repr(exc)
+        failure["at"] = datetime.now(tz=timezone.utc).isoformat()
+        self._health_dirty = True
 
-            try:
-                kind = job.get("kind")
-                if kind == "local_event":
-                    self._handle_local_event(job["event"])
-                elif kind == "sync":
-                    self._handle_sync_job(manual=bool(job.get("manual", False)))
-            except Exception as exc:
-                self._results.put({"kind": "worker_error", "error": str(exc)})
-
-    def _handle_local_event(self, event) -> None:
-        self.journal.append(event)
+    def _on_network_job_dropped(self, job: dict) -> None:
+        # A dropped sync must release the pending flag or auto-sync stalls forever.
+        if job.get("kind") == "sync":
+            with self._sync_lock:
+                self._sync_pending = False
+        elif job.get("kind") == "publish":
+            # Its events are still buffered; put a fresh token at the tail.
+            with self._publish_lock:
+                self._publish_queued = False
+            self._queue_publish([])
+
+    def _queue_publish(self, events: list) -> None:
+        with self._publish_lock:
+            self._unpublished.extend(events)
+            if self._publish_queued or not self._unpublished:
+                return
+            self._publish_queued = True
+        self._network_lane.submit({"kind": "publish"})
+
+    def _take_unpublished(self) -> list:
+        # Everything buffered so far goes out as one batch; later events queue a new token.
+        with self._publish_lock:
+            events, self._unpublished = self._unpublished, []
+            self._publish_queued = False
+        return events
+
+    def _record_batch(self, name: str, size: int, started_monotonic: float) -> None:
+        elapsed_ms = (time.monotonic() - started_monotonic) * 1000.0
+        with self._batch_lock:
+            stats = self._batch_stats.setdefault(
+                name,
+                {
+                    "batches": 0,
+                    "events": 0,
+                    "avg_size": 0.0,
+                    "last_size": 0,
+                    "max_size": 0,
+                    "last_ms": 0.0,
+                    "max_ms": 0.0,
+                },
+            )
+            stats["batches"] += 1
+            stats["events"] += int(size)
+            stats["last_size"] = int(size)
+            stats["max_size"] = max(int(stats["max_size"]), int(size))
+            stats["last_ms"] = round(elapsed_ms, 3)
+            stats["max_ms"] = round(max(float(stats["max_ms"]), elapsed_ms), 3)
+            stats["avg_size"] = round(stats["events"] / stats["batches"], 3)
+
+    def _batch_metrics(self) -> dict[str, dict]:
+        with self._batch_lock:
+            return {name: dict(stats) for name, stats in self._batch_stats.items()}
+
+    def _lane_metrics(self) -> dict[str, dict]:
+        return {lane.name: lane.metrics() for lane in (self._local_lane, self._network_lane, self._derived_lane)}
+
+    def _render_metrics(self) -> dict:
+        shell = getattr(self, "shell", None)
+        if shell is None or not hasattr(shell, "render_metrics"):
+            return {}
+        try:
+            return dict(shell.render_metrics())
+        except Exception:
+            return {}
+
+    def _handle_local_events(self, events: list) -> None:
+        # Local lane: journal only. Network publish happens on its own lane so a
+        # stalled transport never delays persistence.
+        if not events:
+            return
+        started = time.monotonic()
+        self.journal.append_many(events)
         self._derived_dirty = True
+        self._record_batch("journal", len(events), started)
+        self._queue_publish(events)
 
+    def _handle_publish_events(self, events: list) -> None:
+        if not events:
+            return
+        started = time.monotonic()
         status = "ok"
         pushed_count = 0
         try:
-            published = self.sync_engine.publish_local_event(event)
-            pushed_count = 1 if published else 0
+            pushed_count = self.sync_engine.publish_local_events(events)
             status = self.sync_engine.last_status
         except Exception:
             status = "fail"
         if self.sync_status == "auth_missing" and status == "disabled":
             status = "auth_missing"
         self._publish_presence_file(
-            online=(event.event_type != "presence_bye"),
+            online=True,
             reason="event",
-            last_event_id=str(getattr(event, "event_id", "") or ""),
+            last_event_id=str(getattr(events[-1], "event_id", "") or ""),
         )
+        self._record_batch("publish", len(events), started)
 
         self._results.put({"kind": "local_done", "status": status, "pushed_count": pushed_count})
-        self._maybe_rebuild_derived(force=False)
 
     def _handle_sync_job(self, manual: bool) -> None:
         result = self.sync_engine.sync_once(force=manual)
         imported = int(result.get("imported", 0))
         received = len(result.get("events", [])) if isinstance(result.get("events", []), list) else 0
-        presence: list[dict] = []
-        transport = self.sync_engine.transport
-        if transport is not None and hasattr(transport, "receive_presence"):
-            try:
-                raw_presence = transport.receive_presence()
-                if isinstance(raw_presence, list):
-                    presence = [p for p in raw_presence if isinstance(p, dict)]
-            except Exception:
-                presence = []
         if imported > 0:
             self._derived_dirty = True
-            self._maybe_rebuild_derived(force=True)
+            self._derived_lane.submit({"kind": "rebuild", "force": True})
         self._results.put(
             {
                 "kind": "sync_done",
                 "status": result.get("status", "fail"),
                 "imported": imported,
                 "events": result.get("events", []),
+                "presence_events": result.get("presence_events", []),
                 "received": received,
-                "presence": presence,
                 "manual": manual,
             }
         )
 
+    def _handle_presence_job(self, online: bool, reason: str, force: bool) -> None:
+        self._publish_presence_file(online=online, reason=reason, force=force)
+        if not online:
+            return
+        presence: list[dict] = []
+        transport = self.sync_engine.transport
+        if transport is not None and hasattr(transport, "receive_presence"):
+            try:
+                raw_presence = transport.receive_presence()
+                if isinstance(raw_presence, list):
+                    presence = [p for p in raw_presence if isinstance(p, dict)]
+            except Exception:
+                presence = []
+        self._results.put({"kind": "presence_done", "presence": presence})
+
+    def _compaction_keep_days(self) -> int:
+        # Replay cannot read events back out of a daily_rollup: keep every day
+        # that still holds events the snapshots have not folded in.
+        keep_days = self.config.auto_compact_keep_days
+        pending_day = getattr(self, "_unsnapshotted_day", "")
+        if not pending_day:
+            return keep_days
+        try:
+            age_days = (datetime.now(tz=timezone.utc).date() - date.fromisoformat(pending_day)).days
+        except ValueError:
+            return keep_days
+        return max(keep_days, age_days + 1)
+
+    def _handle_compaction_job(self, trigger: str) -> None:
+        keep_days = self._compaction_keep_days()
+        backlog = compaction_backlog(self.journal, keep_days)
+        if not trigger:
+            if backlog["bytes"] >= self.config.auto_compact_max_mb * 1024 * 1024:
+                trigger = "bytes"
+            elif backlog["lines"] >= self.config.auto_compact_max_lines:
+                trigger = "lines"
+            else:
+                return
+        started = time.monotonic()
+        stats = {"trigger": trigger, "backlog_lines": backlog["lines"], "backlog_bytes": backlog["bytes"], "error": ""}
+        try:
+            if isinstance(self.journal, SqliteEventJournal):
+                result = compact_sqlite_journal(self.journal, keep_days=keep_days)
+            else:
+                self.journal.flush_rollups()  # lets current days be promoted without a re-read
+                result = compact_daily_journal(
+                    self.journal.dir_path,
+                    keep_days=keep_days,
+                    shard_lock=self.journal.write_lock,
+                    throttle_seconds=self.config.auto_compact_throttle_ms / 1000.0,
+                )
+                self.journal.refresh_rollups()
+            stats.update(result)
+            if result.get("compacted_days", 0):
+                self._derived_dirty = True
+        except Exception as exc:
+            # Compaction is best-effort housekeeping: report it, never fail sync over it.
+            stats["error"] = str(exc)
+        stats["last_ms"] = round((time.monotonic() - started) * 1000.0, 3)
+        stats["at"] = datetime.now(tz=timezone.utc).isoformat()
+        self._results.put({"kind": "compaction_done", "stats": stats})
+
     def _mark_health_dirty(self) -> None:
         self._health["sync_state"] = self.sync_status
         self._health["unread_remote_count"] = int(self.unread_remote_count)
         self._health["bad_lines_skipped"] = int(self.journal.last_read_stats().get("bad_lines_skipped", 0))
-        cursor_state = self.sync_cursor_storage.load()
-        self._health["cursor_last_seen_event_id_by_source"] = dict(
-            cursor_state.get("last_seen_event_id_by_source", {})
-        )
-        self._health["cursor_last_seen_timestamp_by_source"] = dict(
-            cursor_state.get("last_seen_timestamp_by_source", {})
-        )
+        self._health["lanes"] = self._lane_metrics()
+        self._health["batches"] = self._batch_metrics()
+        self._health["presence"] = self.presence_publisher.metrics()
+        self._health["render"] = self._render_metrics()
+        view_model = getattr(self, "_view_model", None)
+        self._health["view"] = view_model.metrics() if view_model is not None else {}
+        scheduler = getattr(self, "scheduler", None)
+        self._health["scheduler"] = scheduler.metrics() if scheduler is not None else {}
+        state_store = getattr(self, "state_store", None)
+        self._health["state_store"] = state_store.metrics() if state_store is not None else {}
+        # The engine publishes an immutable snapshot; only copy it when it moved.
+        cursor = self.sync_engine.cursor_snapshot
+        if cursor.version != self._health.get("cursor_version"):
+            self._health["cursor_version"] = cursor.version
+            self._health["cursor_last_seen_event_id_by_source"] = dict(cursor.last_seen_event_id_by_source)
+            self._health["cursor_last_seen_timestamp_by_source"] = dict(cursor.last_seen_timestamp_by_source)
         self._health_dirty = True
 
     def _flush_health_if_dirty(self) -> None:
@@ -283,9 +549,14 @@ class DugongController:
         now = time.monotonic()
         if not force and (now - self._derived_last_rebuild_monotonic) < self._derived_rebuild_interval_seconds:
             return
-        self._rebuild_derived()
+        # Clear before rebuilding: appends racing with the rebuild re-mark it dirty.
         self._derived_dirty = False
         self._derived_last_rebuild_monotonic = now
+        try:
+            self._rebuild_derived()
+        except Exception:
+            self._derived_dirty = True
+            raise
 
     def _remote_bubble(self, event) -> str:
         if event.event_type == "presence_hello":
@@ -375,35 +646,7 @@ class DugongController:
                 except ValueError:
                     seen_at = now
 
-            entry = self._remote_presence.setdefault(
-                source,
-                {
-                    "source": source,
-                    "mode": "unknown",
-                    "last_seen": 0.0,
-                    "event_type": "",
-                    "event_id": "",
-                    "pomo_phase": "",
-                    "pomo_session_id": "",
-                    "pearls": 0,
-                    "today_pearls": 0,
-                    "lifetime_pearls": 0,
-                    "focus_streak": 0,
-                    "day_streak": 0,
-                    "exp": 0,
-                    "today_exp": 0,
-                    "lifetime_exp": 0,
-                    "level": 1,
-                    "exp_in_level": 0,
-                    "exp_to_next": 50,
-                    "title_id": "drifter",
-                    "skin_id": "default",
-                    "bubble_style": "default",
-                    "online": 1.0,
-                    "heartbeat_at": 0.0,
-                    "instance_id": "",
-                },
-            )
+            entry = self._remote_presence.entry(source)
             if seen_at < float(entry.get("last_seen", 0.0)):
                 # Out-of-order old event: do not roll back presence view.
                 continue
@@ -461,40 +704,18 @@ class DugongController:
                 entry["skin_id"] = str(ev.payload.get("skin_id", entry.get("skin_id", "default")))
                 entry["bubble_style"] = str(ev.payload.get("bubble_style", entry.get("bubble_style", "default")))
 
-    def _update_remote_presence_files(self, snapshots: list[dict]) -> None:
+    def _update_remote_presence_files(self, snapshots: list[dict]) -> list[str]:
+        """Apply last-value-wins presence records; returns sources that just came online."""
+        now = time.time()
+        joined: list[str] = []
         for snap in snapshots:
             source = str(snap.get("source_id", "")).strip()
             if not source or source == self.source_id:
                 continue
-            entry = self._remote_presence.setdefault(
-                source,
-                {
-                    "source": source,
-                    "mode": "unknown",
-                    "last_seen": 0.0,
-                    "event_type": "presence_snapshot",
-                    "event_id": "",
-                    "pomo_phase": "",
-                    "pomo_session_id": "",
-                    "pearls": 0,
-                    "today_pearls": 0,
-                    "lifetime_pearls": 0,
-                    "focus_streak": 0,
-                    "day_streak": 0,
-                    "exp": 0,
-                    "today_exp": 0,
-                    "lifetime_exp": 0,
-                    "level": 1,
-                    "exp_in_level": 0,
-                    "exp_to_next": 50,
-                    "title_id": "drifter",
-                    "skin_id": "default",
-                    "bubble_style": "default",
-                    "online": 1.0,
-                    "heartbeat_at": 0.0,
-                    "instance_id": "",
-                },
-            )
+            known = source in self._remote_presence
+            entry = self._remote_presence.entry(source)
+            was_online = known and self._remote_presence.is_online(entry, now)
+            previous_instance = str(entry.get("instance_id", ""))
             hb_ts = str(snap.get("last_heartbeat", "")).strip()
             hb = float(entry.get("heartbeat_at", 0.0))
             if hb_ts:
@@ -505,6 +726,9 @@ class DugongController:
                     hb = parsed.timestamp()
                 except ValueError:
                     pass
+            if hb < float(entry.get("heartbeat_at", 0.0)):
+                # Older record than the one we already applied.
+                continue
             entry["heartbeat_at"] = hb
             entry["last_seen"] = max(float(entry.get("last_seen", 0.0)), hb)
             entry["online"] = 1.0 if bool(snap.get("online", True)) else 0.0
@@ -526,15 +750,14 @@ class DugongController:
             entry["level"] = int(snap.get("level", entry.get("level", 1)))
             entry["exp_in_level"] = int(snap.get("exp_in_level", entry.get("exp_in_level", 0)))
             entry["exp_to_next"] = int(snap.get("exp_to_next", entry.get("exp_to_next", 50)))
+            if self._remote_presence.is_online(entry, now) and (
+                not was_online or (previous_instance and previous_instance != entry["instance_id"])
+            ):
+                joined.append(source)
+        return joined
 
     def _is_remote_online(self, info: dict[str, str | float], now: float | None = None) -> bool:
-        if float(info.get("online", 1.0)) <= 0.0:
-            return False
-        ts = max(float(info.get("heartbeat_at", 0.0)), float(info.get("last_seen", 0.0)))
-        if ts <= 0:
-            return True
-        now_ts = now if now is not None else time.time()
-        return (now_ts - ts) <= self._presence_offline_ttl_seconds
+        return self._remote_presence.is_online(info, now)
 
     def _shared_entities(self) -> list[dict[str, str | float]]:
         now = time.time()
@@ -563,8 +786,7 @@ class DugongController:
                 "online": float(info.get("online", 1.0)),
                 "is_local": 0.0,
             }
-            for src, info in self._remote_presence.items()
-            if self._is_remote_online(info, now)
+            for src, info in self._remote_presence.online_items(now)
         ]
         remote.sort(key=lambda x: str(x["source"]))
         local = {
@@ -632,7 +854,7 @@ class DugongController:
                 imported = int(result.get("imported", 0))
                 events = result.get("events", [])
                 received = int(result.get("received", 0))
-                presence = result.get("presence", [])
+                presence_events = result.get("presence_events", [])
                 manual = bool(result.get("manual", False))
                 self._update_auto_sync_policy(status=self.sync_status, imported=imported, manual=manual)
                 self._health["last_pull_at"] = datetime.now(tz=timezone.utc).isoformat()
@@ -661,10 +883,10 @@ class DugongController:
                     bubble = self.sync_status
                 elif self.sync_status == "fail":
                     bubble = "Sync failed"
-                elif received > 0 or (isinstance(presence, list) and len(presence) > 0):
-                    self._update_remote_presence(events)
-                    if isinstance(presence, list) and presence:
-                        self._update_remote_presence_files(presence)
+                elif received > 0 or presence_events:
+                    # Legacy peers still emit presence_* events; they feed the TTL
+                    # map only (SyncEngine does not journal them).
+                    self._update_remote_presence([*events, *presence_events])
                     if imported > 0:
                         self.unread_remote_count += self._signal_event_count(events)
                     representative = self._pick_representative_remote_event(events)
@@ -672,6 +894,17 @@ class DugongController:
                         bubble = self._remote_bubble(representative)
                 elif manual:
                     bubble = "Sync now: +0"
+            elif kind == "presence_done":
+                presence = result.get("presence", [])
+                joined = self._update_remote_presence_files(presence) if isinstance(presence, list) else []
+                self._remote_presence.expire()
+                if joined:
+                    bubble = f"[{joined[0]}] joined aquarium"
+                changed = True
+            elif kind == "compaction_done":
+                self._compaction_runs += 1
+                self._health["compaction"] = {**result.get("stats", {}), "runs": self._compaction_runs}
+                changed = True
             elif kind == "worker_error":
                 self.sync_status = "fail"
                 bubble = f"Worker error: {result.get('error', 'unknown')}"
@@ -735,14 +968,22 @@ class DugongController:
             "bubble_style": str(self.reward.equipped_bubble_style),
         }
 
-    def _publish_presence_file(self, online: bool, reason: str = "", last_event_id: str = "") -> None:
+    def _publish_presence_file(
+        self, online: bool, reason: str = "", last_event_id: str = "", force: bool = False
+    ) -> None:
         transport = self.sync_engine.transport
         if transport is None or not hasattr(transport, "update_presence"):
             return
-        try:
-            transport.update_presence(self._presence_snapshot(online=online, reason=reason, last_event_id=last_event_id))
-        except Exception:
+        if online and self._presence_closed:
             return
+        if not online:
+            self._presence_closed = True
+        # Debounced + hash-guarded; hello and bye always flush.
+        self.presence_publisher.publish(
+            self._presence_snapshot(online=online, reason=reason, last_event_id=last_event_id),
+            transport.update_presence,
+            force=force or not online,
+        )
 
     def _update_cofocus_progress(self) -> None:
         now_mono = time.monotonic()
@@ -780,49 +1021,105 @@ class DugongController:
 
     def refresh(self, bubble: str | None = None) -> None:
         sprite = self.renderer.sprite_for(self.state)
+        pomo_view = self.pomodoro.view()
+        sections = {
+            "sprite": sprite,
+            "state_text": self._state_text(),
+            "pomo_text": self._pomo_text(),
+            "pomo_state": pomo_view.state,
+            "reward_stats": {
+                "pearls": int(self.reward.pearls),
+                "lifetime_pearls": int(self.reward.lifetime_pearls),
+                "today_pearls": int(self.reward.today_pearls),
+                "exp": int(self.reward.exp),
+                "lifetime_exp": int(self.reward.lifetime_exp),
+                "today_exp": int(self.reward.today_exp),
+                "level": int(self.reward.level),
+                "exp_in_level": int(self.reward.exp_in_level),
+                "exp_to_next": int(self.reward.exp_to_next_level()),
+                "focus_streak": int(self.reward.focus_streak),
+                "day_streak": int(self.reward.day_streak),
+                "equipped_skin_id": self.reward.equipped_skin_id,
+                "equipped_bubble_style": self.reward.equipped_bubble_style,
+                "equipped_title_id": self.reward.equipped_title_id,
+                "shop_owned_skins": list(self.reward.shop_owned_skins),
+                "shop_owned_bubbles": list(self.reward.shop_owned_bubbles),
+                "shop_owned_titles": list(self.reward.shop_owned_titles),
+            },
+            "local_profile": {
+                "source": self.source_id,
+                "mode": self.state.mode,
+                "pomo_phase": pomo_view.phase,
+                "pomo_state": pomo_view.state.lower(),
+                "energy": int(self.state.energy),
+                "mood": int(self.state.mood),
+                "focus": int(self.state.focus),
+            },
+        }
+        # Only changed sections / entities reach the shell; an unchanged view
+        # with no bubble skips the shell call entirely.
+        changes = self._view_model.diff(sections, self._shared_entities())
+        if changes is None and bubble is None:
+            return
         try:
-            self.shell.update_view(
-                sprite=sprite,
-                state_text=self._state_text(),
-                pomo_text=self._pomo_text(),
-                pomo_state=self.pomodoro.view().state,
-                reward_stats={
-                    "pearls": int(self.reward.pearls),
-                    "lifetime_pearls": int(self.reward.lifetime_pearls),
-                    "today_pearls": int(self.reward.today_pearls),
-                    "exp": int(self.reward.exp),
-                    "lifetime_exp": int(self.reward.lifetime_exp),
-                    "today_exp": int(self.reward.today_exp),
-                    "level": int(self.reward.level),
-                    "exp_in_level": int(self.reward.exp_in_level),
-                    "exp_to_next": int(self.reward.exp_to_next_level()),
-                    "focus_streak": int(self.reward.focus_streak),
-                    "day_streak": int(self.reward.day_streak),
-                    "equipped_skin_id": self.reward.equipped_skin_id,
-                    "equipped_bubble_style": self.reward.equipped_bubble_style,
-                    "equipped_title_id": self.reward.equipped_title_id,
-                    "shop_owned_skins": list(self.reward.shop_owned_skins),
-                    "shop_owned_bubbles": list(self.reward.shop_owned_bubbles),
-                    "shop_owned_titles": list(self.reward.shop_owned_titles),
-                },
-                local_profile={
-                    "source": self.source_id,
-                    "mode": self.state.mode,
-                    "pomo_phase": self.pomodoro.view().phase,
-                    "pomo_state": self.pomodoro.view().state.lower(),
-                    "energy": int(self.state.energy),
-                    "mood": int(self.state.mood),
-                    "focus": int(self.state.focus),
-                },
-                bubble=bubble,
-                entities=self._shared_entities(),
-                local_source=self.source_id,
-            )
+            self.shell.update_view(**(changes or {}), bubble=bubble, local_source=self.source_id)
         except TypeError:
+            self._view_model.reset()
             self.shell.update_view(sprite=sprite, state_text=self._state_text(), bubble=bubble)
 
+    def _replay_journal(
+        self, pomodoro_cursor: dict | None, reward_cursor: dict | None, reward_ledgers_ahead: bool = False
+    ) -> None:
+        """Fold own-source journal events after each snapshot's cursor back into the services.
+
+        `reward_ledgers_ahead`: the reward snapshot is a previous generation whose
+        dedupe chunks may already list the events being replayed.
+        """
+        cursors = [cursor for cursor in (pomodoro_cursor, reward_cursor) if cursor is not None]
+        if not cursors:
+            # Snapshots from before replay already hold everything; start counting now.
+            self._journal_cursor = {"timestamp": utc_now_iso(), "event_ids": []}
+            return
+        self._journal_cursor = max(cursors, key=lambda cursor: cursor.get("timestamp", ""))
+        since = min(str(cursor.get("timestamp", "")) for cursor in cursors)
+        pomodoro_events: list[tuple[str, dict, float]] = []
+        events = self.journal.load_source_since(self.source_id, since, REPLAY_EVENT_TYPES)
+        if reward_ledgers_ahead and reward_cursor is not None:
+            for event in events:
+                if is_after(event, reward_cursor):
+                    self.reward.forget_event(event.event_type, event.payload)
+        for event in events:
+            moment = event_time(event)
+            if moment is None:
+                continue
+            at_wall, day = moment
+            replay_pomodoro = pomodoro_cursor is not None and is_after(event, pomodoro_cursor)
+            replay_reward = reward_cursor is not None and is_after(event, reward_cursor)
+            if not (replay_pomodoro or replay_reward):
+                continue
+            if replay_pomodoro:
+                pomodoro_events.append((event.event_type, event.payload, at_wall))
+            if replay_reward:
+                self.reward.apply_event(
+                    event.event_type, event.payload, day, cofocus_pearls=int(self.config.cofocus_bonus_pearls)
+                )
+                self._reward_dirty = True
+            self._count_unsnapshotted(event, day)
+        if pomodoro_events:
+            self.pomodoro.replay(pomodoro_events)
+            self._pomo_dirty = True
+
+    def _count_unsnapshotted(self, event: DugongEvent, day: str) -> None:
+        self._journal_cursor = advance(self._journal_cursor, event)
+        if not getattr(self, "_unsnapshotted_day", ""):
+            self._unsnapshotted_day = day
+        self._events_since_snapshot += 1
+
     def _on_any_event(self, event) -> None:
         self._state_dirty = True
+        if event.event_type in REPLAY_EVENT_TYPES and str(event.source) == self.source_id:
+            moment = event_time(event)
+            self._count_unsnapshotted(event, moment[1] if moment else datetime.now(tz=timezone.utc).date().isoformat())
         if event.event_type.startswith("pomo_"):
             self._pomo_dirty = True
         if event.event_type == "pomo_complete" and str(event.source) == self.source_id:
@@ -878,7 +1175,7 @@ class DugongController:
                 )
         elif event.event_type == "reward_grant":
             self._reward_dirty = True
-        self._jobs.put({"kind": "local_event", "event": event})
+        self._local_lane.submit({"kind": "local_event", "event": event})
 
     def _flush_state_if_dirty(self) -> None:
         if not self._state_dirty:
@@ -886,17 +1183,37 @@ class DugongController:
         self.storage.save(self.state)
         self._state_dirty = False
 
-    def _flush_pomodoro_if_dirty(self) -> None:
-        if not self._pomo_dirty:
+    def _flush_snapshots_if_due(self, force: bool = False) -> None:
+        # The journal append is the per-change write for pomodoro/reward; their
+        # snapshots are only checkpoints, written together under one cursor.
+        if not (self._pomo_dirty or self._reward_dirty or self._events_since_snapshot):
             return
-        self.pomodoro_storage.save(self.pomodoro.snapshot())
-        self._pomo_dirty = False
-
-    def _flush_reward_if_dirty(self) -> None:
-        if not self._reward_dirty:
+        pending_day = getattr(self, "_unsnapshotted_day", "")
+        due = (
+            self._snapshot_requested
+            or self._events_since_snapshot >= self.config.state_snapshot_events
+            or bool(pending_day and pending_day < datetime.now(tz=timezone.utc).date().isoformat())
+        )
+        if not (force or due):
             return
-        self.reward_storage.save(self.reward.snapshot())
+        cursor = dict(self._journal_cursor)
+        self.pomodoro_storage.save({**self.pomodoro.snapshot(), CURSOR_KEY: cursor})
+        # Dedupe sets go out as changed chunks only; the rest is small.
+        self.reward_storage.save(
+            {**self.reward.snapshot(include_ledgers=False), CURSOR_KEY: cursor},
+            ledger_chunks=self.reward.drain_ledger_chunks(),
+        )
+        self._pomo_dirty = False
         self._reward_dirty = False
+        self._events_since_snapshot = 0
+        self._unsnapshotted_day = ""
+        self._snapshot_requested = False
+
+    def _flush_state_store(self, final: bool = False) -> None:
+        self._flush_state_if_dirty()
+        self._flush_snapshots_if_due(force=final)
+        self._flush_health_if_dirty()
+        self.state_store.commit()
 
     def on_mode_change(self, mode: str) -> None:
         self.state = switch_mode(self.state, mode)
@@ -955,6 +1272,9 @@ class DugongController:
     def on_shop_action(self, item_kind: str, item_id: str, price: int) -> None:
         ok, reason = self.reward.buy_shop_item(item_kind=item_kind, item_id=item_id, price=price)
         self._reward_dirty = True
+        if ok:
+            # Purchases are not journaled, so they cannot wait for the next snapshot.
+            self._snapshot_requested = True
         if ok:
             self._emit_profile_update()
             self.refresh(bubble=f"Shop {reason}: {item_kind}/{item_id}")
@@ -1123,7 +1443,7 @@ class DugongController:
             if self._sync_pending:
                 return
             self._sync_pending = True
-        self._jobs.put({"kind": "sync", "manual": manual})
+        self._network_lane.submit({"kind": "sync", "manual": manual})
 
     def _request_fast_sync(self) -> None:
         now = time.monotonic()
@@ -1149,46 +1469,54 @@ class DugongController:
         if (now_mono - self._presence_last_heartbeat_monotonic) < max(3.0, float(self._presence_heartbeat_seconds * 0.6)):
             return
         self._presence_last_heartbeat_monotonic = now_mono
-        self.bus.emit(
-            presence_heartbeat_event(
-                mode=self.state.mode,
-                pomo_phase=str(self.pomodoro.view().phase),
-                instance_id=self._instance_id,
-                source=self.source_id,
-            )
-        )
-        self._request_fast_sync()
+        self._network_lane.submit({"kind": "presence", "online": True, "reason": "heartbeat"})
+
+    def on_compaction_check(self) -> None:
+        # First check after start and each UTC day change always run; otherwise
+        # the job only compacts when the backlog passes a threshold.
+        today = datetime.now(tz=timezone.utc).date().isoformat()
+        trigger = ""
+        if today != self._compaction_day:
+            trigger = "day_rollover" if self._compaction_day else "startup"
+            self._compaction_day = today
+        self._derived_lane.submit({"kind": "compact", "trigger": trigger})
 
     def on_quit_requested(self) -> None:
-        event = presence_bye_event(reason="quit", instance_id=self._instance_id, source=self.source_id)
-        try:
-            # Keep quit path non-blocking: do not perform network I/O here.
-            self.bus.emit(event)
-        except Exception:
-            pass
+        # Keep quit path non-blocking: the bye record is written on the network lane.
+        self._network_lane.submit({"kind": "presence", "online": False, "reason": "quit", "force": True})
 
     def run(self) -> None:
-        self.bus.emit(
-            presence_hello_event(
-                mode=self.state.mode,
-                instance_id=self._instance_id,
-                source=self.source_id,
-            )
-        )
+        self._network_lane.submit({"kind": "presence", "online": True, "reason": "hello", "force": True})
         self._emit_profile_update()
         self._request_fast_sync()
         self.refresh(bubble=f"Dugong online [{self.source_id}]")
         self.on_sync_now()
-        self.shell.schedule_every(self._presence_heartbeat_seconds, self.on_presence_heartbeat)
-        self.shell.schedule_every(self.tick_seconds, self.on_tick)
-        self.shell.schedule_every(1, self.on_pomo_tick)
-        self.shell.schedule_every(self.sync_interval_seconds, self.on_sync_tick)
-        self.shell.schedule_every(1, self._drain_worker_results)
-        self.shell.schedule_every(1, self._flush_state_if_dirty)
-        self.shell.schedule_every(1, self._flush_pomodoro_if_dirty)
-        self.shell.schedule_every(1, self._flush_reward_if_dirty)
-        self.shell.schedule_every(1, self._flush_health_if_dirty)
+        # One deadline heap behind one shell timer: the 1s jobs share a single
+        # wakeup, and the slower ones fold into it when they come due.
+        self.scheduler.every(
+            "presence_heartbeat", self._presence_heartbeat_seconds, self.on_presence_heartbeat, jitter_seconds=1.0
+        )
+        self.scheduler.every("tick", self.tick_seconds, self.on_tick)
+        self.scheduler.every("pomo_tick", 1, self.on_pomo_tick)
+        self.scheduler.every("sync", self.sync_interval_seconds, self.on_sync_tick, jitter_seconds=0.5)
+        self.scheduler.every("drain_results", 1, self._drain_worker_results)
+        self.scheduler.every("flush_state_store", self.config.state_flush_seconds, self._flush_state_store)
+        if self.config.auto_compact_keep_days > 0:
+            self.scheduler.every(
+                "auto_compact", self.AUTO_COMPACT_CHECK_SECONDS, self.on_compaction_check, first_delay_seconds=30
+            )
+        if hasattr(self.shell, "attach_scheduler"):
+            self.shell.attach_scheduler(self.scheduler)
+        else:
+            self.shell.schedule_every(1, self._run_scheduler_once)
         self.shell.run()
+        self._flush_state_store(final=True)
+        self.state_store.close()
+        if isinstance(self.journal, EventJournal):
+            self.journal.flush_rollups()
+
+    def _run_scheduler_once(self) -> None:
+        self.scheduler.run_due()
 
 
 def create_default_controller() -> DugongController:
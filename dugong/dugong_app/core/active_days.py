@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+
+class ActiveDayBitmap:
+    """One bit per day since `start` (bit i = start + i days), in a Python int.
+
+    Streak queries are shifts, masks and bit_length on the whole int, so they
+    cost a handful of word operations per 64 days instead of a walk over
+    ISO date strings.
+    """
+
+    __slots__ = ("start", "bits")
+
+    def __init__(self, start: date | None = None, bits: int = 0) -> None:
+        self.start = start
+        self.bits = max(0, int(bits)) if start is not None else 0
+
+    def mark(self, day: date) -> bool:
+        """Set `day`; returns False if it was already set."""
+        if self.start is None:
+            self.start, self.bits = day, 1
+            return True
+        if day < self.start:
+            self.bits <<= (self.start - day).days
+            self.start = day
+        bit = 1 << (day - self.start).days
+        if self.bits & bit:
+            return False
+        self.bits |= bit
+        return True
+
+    def mark_run(self, start: date, mask: int) -> None:
+        """OR in a whole mask of days beginning at `start` (archive records)."""
+        mask = int(mask)
+        if mask <= 0:
+            return
+        if self.start is None:
+            self.start, self.bits = start, mask
+            return
+        if start < self.start:
+            self.bits <<= (self.start - start).days
+            self.start = start
+        self.bits |= mask << (start - self.start).days
+
+    def is_active(self, day: date) -> bool:
+        if self.start is None or day < self.start:
+            return False
+        return bool(self.bits >> (day - self.start).days & 1)
+
+    def last_active(self) -> date | None:
+        if self.start is None or not self.bits:
+            return None
+        return self.start + timedelta(days=self.bits.bit_length() - 1)
+
+    def streak_ending(self, day: date) -> int:
+        """Length of the run of active days ending on `day` (0 if `day` is idle)."""
+        if not self.is_active(day):
+            return 0
+        width = (day - self.start).days + 1
+        # Highest idle day at or before `day`: the run starts right after it.
+        idle = ~self.bits & ((1 << width) - 1)
+        return width - idle.bit_length()
+
+    def current_streak(self) -> int:
+        """Run ending on the latest active day (what the summary and rewards show)."""
+        last = self.last_active()
+        return 0 if last is None else self.streak_ending(last)
+
+    def longest_streak(self) -> int:
+        # x & (x >> 1) shortens every run by one; the step count is the longest run.
+        bits = self.bits
+        longest = 0
+        while bits:
+            bits &= bits >> 1
+            longest += 1
+        return longest
+
+    def to_dict(self) -> dict:
+        return {"start": self.start.isoformat() if self.start else "", "bits": format(self.bits, "x")}
+
+    @classmethod
+    def from_dict(cls, payload: object) -> "ActiveDayBitmap":
+        if not isinstance(payload, dict) or not payload.get("start"):
+            return cls()
+        try:
+            return cls(date.fromisoformat(str(payload["start"])), int(str(payload.get("bits", "0")) or "0", 16))
+        except ValueError:
+            return cls()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+
+
+class BoundedOrderedSet:
+    """Insertion-ordered set of strings with O(1) membership and FIFO eviction.
+
+    Items are numbered as they arrive and grouped into fixed-size chunks by
+    that number, so a persisted copy only has to rewrite the chunks an add or
+    eviction touched (`drain_dirty_chunks`). Chunk numbers survive a
+    `from_chunks` round trip.
+    """
+
+    CHUNK_SIZE = 256
+
+    def __init__(self, maxlen: int, items: Iterable[str] = ()) -> None:
+        self.maxlen = max(1, int(maxlen))
+        self._seq: dict[str, int] = {}
+        self._chunks: dict[int, dict[str, None]] = {}
+        self._next_seq = 0
+        self._dirty: set[int] = set()
+        for item in items:
+            self.add(item)
+
+    @classmethod
+    def from_chunks(cls, maxlen: int, chunks: dict[int, list[str]]) -> "BoundedOrderedSet":
+        bounded = cls(maxlen)
+        numbers = sorted(int(n) for n in chunks)
+        for number in numbers:
+            items = [str(item) for item in chunks[number] if str(item).strip()]
+            # Head chunks lost their oldest items to eviction; only the last one is still filling.
+            offset = 0 if number == numbers[-1] else max(0, cls.CHUNK_SIZE - len(items))
+            for index, item in enumerate(items):
+                if item not in bounded._seq:
+                    bounded._place(item, number * cls.CHUNK_SIZE + offset + index)
+            bounded._next_seq = max(bounded._next_seq, number * cls.CHUNK_SIZE + offset + len(items))
+        bounded._dirty.clear()
+        bounded._evict()
+        return bounded
+
+    def add(self, item: str) -> bool:
+        """Append `item`; False if it is already present (its position is kept)."""
+        if item in self._seq:
+            return False
+        self._place(item, self._next_seq)
+        self._next_seq += 1
+        self._evict()
+        return True
+
+    def discard(self, item: str) -> None:
+        seq = self._seq.pop(item, None)
+        if seq is None:
+            return
+        number = seq // self.CHUNK_SIZE
+        members = self._chunks[number]
+        del members[item]
+        if not members:
+            del self._chunks[number]
+        self._dirty.add(number)
+
+    def chunk_range(self) -> tuple[int, int] | None:
+        if not self._chunks:
+            return None
+        return min(self._chunks), max(self._chunks)
+
+    def drain_dirty_chunks(self) -> dict[int, list[str]]:
+        """Current contents of every chunk changed since the last drain ([] = gone)."""
+        changed = {number: list(self._chunks.get(number, ())) for number in sorted(self._dirty)}
+        self._dirty.clear()
+        return changed
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._seq
+
+    def __len__(self) -> int:
+        return len(self._seq)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._seq)
+
+    def _place(self, item: str, seq: int) -> None:
+        self._seq[item] = seq
+        number = seq // self.CHUNK_SIZE
+        self._chunks.setdefault(number, {})[item] = None
+        self._dirty.add(number)
+
+    def _evict(self) -> None:
+        while len(self._seq) > self.maxlen:
+            self.discard(next(iter(self._seq)))
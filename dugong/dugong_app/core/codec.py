@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any
+
+# Pluggable JSON codec for journal lines, transport payloads, presence files and
+# the *_json storages. Decoding uses a native backend (orjson, then msgspec) when
+# one is importable, with stdlib json as the fallback.
+#
+# Encoding always goes through pre-built stdlib encoders: the native libraries
+# only emit compact/2-space layouts, write non-ASCII verbatim and format some
+# floats differently (1e16 vs 1e+16), so they cannot reproduce the existing
+# on-disk bytes without a post-check that costs more than it saves.
+
+try:  # pragma: no cover - depends on the environment
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    _orjson = None
+
+try:  # pragma: no cover - depends on the environment
+    import msgspec as _msgspec
+except ImportError:  # pragma: no cover - depends on the environment
+    _msgspec = None
+
+JSONDecodeError = json.JSONDecodeError
+
+BACKEND_JSON = "json"
+BACKEND_ORJSON = "orjson"
+BACKEND_MSGSPEC = "msgspec"
+
+# json.dumps() builds a fresh JSONEncoder for any non-default argument (indent,
+# separators); reusing instances skips that per-call setup.
+_STD_DEFAULT = json.JSONEncoder(ensure_ascii=True)
+_STD_COMPACT = json.JSONEncoder(ensure_ascii=True, separators=(",", ":"))
+_STD_INDENT = json.JSONEncoder(ensure_ascii=True, indent=2)
+
+
+def available_backends() -> list[str]:
+    names = [BACKEND_JSON]
+    if _orjson is not None:
+        names.append(BACKEND_ORJSON)
+    if _msgspec is not None:
+        names.append(BACKEND_MSGSPEC)
+    return names
+
+
+def _resolve_backend(requested: str) -> str:
+    name = str(requested or "").strip().lower()
+    if name in available_backends():
+        return name
+    if _orjson is not None:
+        return BACKEND_ORJSON
+    if _msgspec is not None:
+        return BACKEND_MSGSPEC
+    return BACKEND_JSON
+
+
+_backend = _resolve_backend(os.getenv("DUGONG_JSON_CODEC", "auto"))
+
+
+def backend_name() -> str:
+    return _backend
+
+
+def set_backend(name: str) -> str:
+    """Switch the process-wide backend; unknown/unavailable names pick the best available one."""
+    global _backend
+    _backend = _resolve_backend(name)
+    return _backend
+
+
+def dumps(obj: Any, *, indent: bool = False, compact: bool = False) -> str:
+    """Encode `obj` exactly as `json.dumps(obj, ensure_ascii=True, ...)` would.
+
+    `indent=True` matches `indent=2` (state files), `compact=True` matches
+    `separators=(",", ":")` (GitHub presence) and the default matches the
+    journal/transport line format.
+    """
+    if indent:
+        return _STD_INDENT.encode(obj)
+    if compact:
+        return _STD_COMPACT.encode(obj)
+    return _STD_DEFAULT.encode(obj)
+
+
+def loads(data: str | bytes) -> Any:
+    """Decode JSON text; raises `JSONDecodeError` like stdlib on malformed input."""
+    if _backend == BACKEND_ORJSON:
+        try:
+            return _orjson.loads(data)
+        except Exception:
+            pass
+    elif _backend == BACKEND_MSGSPEC:
+        try:
+            return _msgspec.json.decode(data)
+        except Exception:
+            pass
+    # Stdlib also covers what native parsers reject but json accepts (NaN,
+    # Infinity) and produces the canonical JSONDecodeError for bad input.
+    return json.loads(data)
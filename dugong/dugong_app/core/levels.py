@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from math import isqrt
+
+# Reaching level L+1 from L costs LEVEL_BASE_EXP + LEVEL_STEP_EXP * (L - 1).
+LEVEL_BASE_EXP = 50
+LEVEL_STEP_EXP = 20
+
+_TABLE: list[tuple[int, int, int]] = []
+
+
+def exp_required_for_level(level: int) -> int:
+    return LEVEL_BASE_EXP + (max(1, int(level)) - 1) * LEVEL_STEP_EXP
+
+
+def total_exp_for_level(level: int) -> int:
+    """Lifetime exp at which `level` is reached (0 for level 1)."""
+    n = max(1, int(level)) - 1
+    return LEVEL_BASE_EXP * n + LEVEL_STEP_EXP * n * (n - 1) // 2
+
+
+def level_for_exp(exp: int) -> tuple[int, int]:
+    """(level, exp into that level) for a lifetime exp total, in O(1).
+
+    total_exp_for_level(n + 1) <= exp is the quadratic
+    step*n^2 + (2*base - step)*n - 2*exp <= 0; n is its floored positive
+    root, nudged onto the exact boundary after the integer square root.
+    """
+    remaining = max(0, int(exp))
+    linear = 2 * LEVEL_BASE_EXP - LEVEL_STEP_EXP
+    root = isqrt(linear * linear + 8 * LEVEL_STEP_EXP * remaining)
+    n = max(0, (root - linear) // (2 * LEVEL_STEP_EXP))
+    while total_exp_for_level(n + 2) <= remaining:
+        n += 1
+    while n > 0 and total_exp_for_level(n + 1) > remaining:
+        n -= 1
+    return n + 1, remaining - total_exp_for_level(n + 1)
+
+
+def level_table(up_to: int) -> list[tuple[int, int, int]]:
+    """Rows (level, exp to the next level, total exp to reach it) for levels 1..up_to.
+
+    Built once and extended on demand, for shop and UI listings.
+    """
+    for level in range(len(_TABLE) + 1, max(1, int(up_to)) + 1):
+        _TABLE.append((level, exp_required_for_level(level), total_exp_for_level(level)))
+    return _TABLE[: max(1, int(up_to))]
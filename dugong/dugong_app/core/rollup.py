@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import Any
+
+# Per-day counters shared by the summary, the write-time rollup index and the
+# daily_rollup events produced by compaction.
+ROLLUP_FIELDS = ("focus_seconds", "ticks", "mode_changes", "clicks", "manual_pings")
+
+
+def empty_counts() -> dict[str, int]:
+    counts = {name: 0 for name in ROLLUP_FIELDS}
+    counts["event_count"] = 0
+    return counts
+
+
+def add_event(counts: dict[str, int], event_type: str, payload: Any) -> None:
+    """Fold one event into `counts` (the summarize_events rules)."""
+    payload = payload if isinstance(payload, dict) else {}
+    counts["event_count"] = counts.get("event_count", 0) + 1
+    if event_type == "daily_rollup":
+        for name in ROLLUP_FIELDS:
+            counts[name] += int(payload.get(name, 0))
+    elif event_type == "state_tick":
+        counts["ticks"] += 1
+        if payload.get("mode") == "study":
+            counts["focus_seconds"] += max(0, int(payload.get("tick_seconds", 60)))
+    elif event_type == "mode_change":
+        counts["mode_changes"] += 1
+    elif event_type == "click":
+        counts["clicks"] += 1
+    elif event_type == "manual_ping":
+        counts["manual_pings"] += 1
+
+
+def merge_counts(into: dict[str, int], other: dict[str, int]) -> None:
+    for name, value in other.items():
+        into[name] = into.get(name, 0) + int(value)
@@ -8,12 +8,20 @@ from pathlib import Path
 
 from dugong_app.config import DugongConfig
 from dugong_app.persistence.event_journal import EventJournal
+from dugong_app.persistence.event_journal_sqlite import (
+    JOURNAL_BACKEND_SQLITE,
+    SQLITE_JOURNAL_FILENAME,
+    SqliteEventJournal,
+    migrate_journal,
+)
 from dugong_app.persistence.pomodoro_state_json import PomodoroStateStorage
 from dugong_app.persistence.reward_state_json import RewardStateStorage
+from dugong_app.persistence.rollup_archive import ROLLUP_ARCHIVE_FILENAME, RollupArchive
 from dugong_app.persistence.runtime_health_json import RuntimeHealthStorage
+from dugong_app.persistence.state_store import STATE_STORE_FILENAME, StateStore
 from dugong_app.persistence.sync_cursor_json import SyncCursorStorage
-from dugong_app.services.daily_summary import summarize_events
-from dugong_app.services.journal_compaction import compact_daily_journal
+from dugong_app.services.daily_summary import summarize_days
+from dugong_app.services.journal_compaction import compact_daily_journal, compact_sqlite_journal
 
 
 def _default_repo_root() -> Path:
@@ -24,19 +32,34 @@ def _default_data_root() -> Path:
     return DugongConfig.from_env(_default_repo_root()).data_dir
 
 
+def _state_store(data_root: Path) -> StateStore | None:
+    # Read-only use: never create the database, fall back to the legacy files.
+    path = data_root / STATE_STORE_FILENAME
+    return StateStore(path) if path.exists() else None
+
+
+def _open_journal(data_root: Path) -> EventJournal | SqliteEventJournal:
+    # Configured backend, without the startup migration (debug only reads).
+    sqlite_path = data_root / SQLITE_JOURNAL_FILENAME
+    backend = DugongConfig.from_env(_default_repo_root()).journal_backend
+    if backend == JOURNAL_BACKEND_SQLITE and sqlite_path.exists():
+        return SqliteEventJournal(sqlite_path)
+    return EventJournal(data_root / "event_journal.jsonl")
+
+
 def _cmd_last_events(args: argparse.Namespace) -> int:
-    journal = EventJournal(_default_data_root() / "event_journal.jsonl")
-    events = journal.load_all()
-    for event in events[-args.n :]:
+    journal = _open_journal(_default_data_root())
+    events = journal.recent(args.n) if isinstance(journal, SqliteEventJournal) else journal.load_all()[-args.n :]
+    for event in events:
         print(f"{event.timestamp} | {event.event_type:12s} | {event.source:10s} | {event.event_id}")
     return 0
 
 
 def _cmd_summary(args: argparse.Namespace) -> int:
-    journal = EventJournal(_default_data_root() / "event_journal.jsonl")
-    events = journal.load_all()
+    data_root = _default_data_root()
+    journal = _open_journal(data_root)
+    summary = summarize_days(journal.day_totals(), RollupArchive(data_root / ROLLUP_ARCHIVE_FILENAME).records())
     bad_lines = journal.last_read_stats().get("bad_lines_skipped", 0)
-    summary = summarize_events(events)
 
     if args.today:
         today = datetime.now(tz=timezone.utc).date().isoformat()
@@ -53,7 +76,16 @@ def _cmd_summary(args: argparse.Namespace) -> int:
 
     print(f"generated_at={summary.get('generated_at', '')}")
     print(f"current_streak_days={summary.get('current_streak_days', 0)}")
+    print(f"longest_streak_days={summary.get('longest_streak_days', 0)}")
     print(f"bad_lines_skipped={bad_lines}")
+    totals = summary.get("totals", {})
+    print(f"total focus_seconds={totals.get('focus_seconds', 0)} ticks={totals.get('ticks', 0)}")
+    for tier in ("months", "weeks"):
+        for row in summary.get(tier, []):
+            print(
+                f"{row.get('start')}..{row.get('end')} focus_seconds={row.get('focus_seconds', 0)} "
+                f"ticks={row.get('ticks', 0)} active_days={row.get('active_days', 0)}"
+            )
     for day in summary.get("days", []):
         print(
             f"{day.get('date')} focus_seconds={day.get('focus_seconds', 0)} "
@@ -63,16 +95,35 @@ def _cmd_summary(args: argparse.Namespace) -> int:
 
 
 def _cmd_compact_journal(args: argparse.Namespace) -> int:
-    journal_dir = _default_data_root() / "event_journal"
-    result = compact_daily_journal(journal_dir=journal_dir, keep_days=args.keep_days, dry_run=args.dry_run)
+    data_root = _default_data_root()
+    journal = _open_journal(data_root)
+    if isinstance(journal, SqliteEventJournal):
+        result = compact_sqlite_journal(journal, keep_days=args.keep_days, dry_run=args.dry_run)
+    else:
+        journal_dir = data_root / "event_journal"
+        result = compact_daily_journal(
+            journal_dir=journal_dir, keep_days=args.keep_days, dry_run=args.dry_run, workers=args.workers
+        )
     mode = "dry-run" if args.dry_run else "apply"
     print(
         f"{mode}: scanned_days={result['scanned_days']} "
         f"compacted_days={result['compacted_days']} saved_lines={result['saved_lines']}"
+        + (" resumed=1" if result.get("resumed") else "")
     )
     return 0
 
 
+def _cmd_migrate_journal(args: argparse.Namespace) -> int:
+    data_root = _default_data_root()
+    jsonl = EventJournal(data_root / "event_journal.jsonl")
+    sqlite = SqliteEventJournal(data_root / SQLITE_JOURNAL_FILENAME)
+    src, dst = (jsonl, sqlite) if args.to == JOURNAL_BACKEND_SQLITE else (sqlite, jsonl)
+    imported = migrate_journal(src, dst)
+    sqlite.close()
+    print(f"migrated to {args.to}: imported={imported} (existing event_ids skipped)")
+    return 0
+
+
 def _cmd_config(_args: argparse.Namespace) -> int:
     cfg = DugongConfig.from_env(_default_repo_root())
     payload = {
@@ -83,6 +134,7 @@ def _cmd_config(_args: argparse.Namespace) -> int:
         "sync_idle_max_multiplier": cfg.sync_idle_max_multiplier,
         "journal_retention_days": cfg.journal_retention_days,
         "journal_fsync": cfg.journal_fsync,
+        "journal_backend": cfg.journal_backend,
         "derived_rebuild_seconds": cfg.derived_rebuild_seconds,
         "data_dir": str(cfg.data_dir),
         "file_transport_dir": str(cfg.file_transport_dir),
@@ -96,6 +148,13 @@ def _cmd_config(_args: argparse.Namespace) -> int:
         "reward_valid_ratio_percent": cfg.reward_valid_ratio_percent,
         "cofocus_milestone_seconds": cfg.cofocus_milestone_seconds,
         "cofocus_bonus_pearls": cfg.cofocus_bonus_pearls,
+        "presence_min_interval_seconds": cfg.presence_min_interval_seconds,
+        "state_flush_seconds": cfg.state_flush_seconds,
+        "auto_compact_keep_days": cfg.auto_compact_keep_days,
+        "auto_compact_max_mb": cfg.auto_compact_max_mb,
+        "auto_compact_max_lines": cfg.auto_compact_max_lines,
+        "auto_compact_throttle_ms": cfg.auto_compact_throttle_ms,
+        "state_snapshot_events": cfg.state_snapshot_events,
     }
     print(json.dumps(payload, ensure_ascii=False, indent=2))
     return 0
@@ -103,11 +162,13 @@ def _cmd_config(_args: argparse.Namespace) -> int:
 
 def _cmd_health(_args: argparse.Namespace) -> int:
     data_root = _default_data_root()
-    health = RuntimeHealthStorage(data_root / "sync_health.json").load()
-    cursor = SyncCursorStorage(data_root / "sync_cursor.json").load()
+    store = _state_store(data_root)
+    health = RuntimeHealthStorage(data_root / "sync_health.json", store=store).load()
+    cursor = SyncCursorStorage(data_root / "sync_cursor.json", store=store).load()
 
-    journal = EventJournal(data_root / "event_journal.jsonl")
-    journal.load_all()
+    journal = _open_journal(data_root)
+    if isinstance(journal, EventJournal):
+        journal.load_all()
     bad_lines = journal.last_read_stats().get("bad_lines_skipped", 0)
 
     payload = {
@@ -122,6 +183,15 @@ def _cmd_health(_args: argparse.Namespace) -> int:
         "last_pull_at": health.get("last_pull_at", ""),
         "last_pull_imported": health.get("last_pull_imported", 0),
         "last_pull_received": health.get("last_pull_received", 0),
+        "lanes": health.get("lanes", {}),
+        "batches": health.get("batches", {}),
+        "presence": health.get("presence", {}),
+        "render": health.get("render", {}),
+        "view": health.get("view", {}),
+        "scheduler": health.get("scheduler", {}),
+        "scheduler_failures": health.get("scheduler_failures", {}),
+        "state_store": health.get("state_store", {}),
+        "compaction": health.get("compaction", {}),
     }
     print(json.dumps(payload, ensure_ascii=False, indent=2))
     return 0
@@ -129,8 +199,9 @@ def _cmd_health(_args: argparse.Namespace) -> int:
 
 def _collect_pomo_payload() -> dict:
     data_root = _default_data_root()
-    pomo = PomodoroStateStorage(data_root / "pomodoro_state.json").load()
-    reward = RewardStateStorage(data_root / "reward_state.json").load()
+    store = _state_store(data_root)
+    pomo = PomodoroStateStorage(data_root / "pomodoro_state.json", store=store).load()
+    reward = RewardStateStorage(data_root / "reward_state.json", store=store).load()
     return {
         "pomodoro": {
             "state": pomo.get("state", "IDLE"),
@@ -157,6 +228,7 @@ def _collect_pomo_payload() -> dict:
             "focus_streak": int(reward.get("focus_streak", 0)),
             "day_streak": int(reward.get("day_streak", 0)),
             "last_focus_day": reward.get("last_focus_day", ""),
+            "longest_day_streak": int(reward.get("longest_day_streak", 0)),
             "cofocus_seconds_total": int(reward.get("cofocus_seconds_total", 0)),
             "equipped_skin_id": reward.get("equipped_skin_id", "default"),
             "equipped_bubble_style": reward.get("equipped_bubble_style", "default"),
@@ -209,8 +281,13 @@ def main() -> int:
     p_compact = subparsers.add_parser("compact-journal", help="Roll up old daily journal files")
     p_compact.add_argument("--keep-days", type=int, default=7)
     p_compact.add_argument("--dry-run", action="store_true")
+    p_compact.add_argument("--workers", type=int, default=1, help="Processes for JSONL compaction (0 = all cores)")
     p_compact.set_defaults(func=_cmd_compact_journal)
 
+    p_migrate = subparsers.add_parser("migrate-journal", help="Copy the event journal between jsonl and sqlite")
+    p_migrate.add_argument("--to", choices=["sqlite", "jsonl"], required=True)
+    p_migrate.set_defaults(func=_cmd_migrate_journal)
+
     p_config = subparsers.add_parser("config", help="Show effective config (token masked)")
     p_config.set_defaults(func=_cmd_config)
 
@@ -8,6 +8,10 @@ class TransportBase(ABC):
     def send(self, payload: dict) -> None:
         raise NotImplementedError
 
+    def send_many(self, payloads: list[dict]) -> None:
+        for payload in payloads:
+            self.send(payload)
+
     @abstractmethod
     def receive(self) -> list[dict]:
         raise NotImplementedError
@@ -1,8 +1,10 @@
 ﻿from __future__ import annotations
 
-import json
+import os
 from pathlib import Path
 
+from dugong_app.core import codec
+
 from .transport_base import TransportBase
 
 
@@ -15,10 +17,15 @@ class FileTransport(TransportBase):
         self.presence_file = self.presence_dir / f"{self.source_id}.json"
 
     def send(self, payload: dict) -> None:
+        self.send_many([payload])
+
+    def send_many(self, payloads: list[dict]) -> None:
+        if not payloads:
+            return
         self.shared_dir.mkdir(parents=True, exist_ok=True)
-        line = json.dumps(payload, ensure_ascii=True)
+        text = "".join(codec.dumps(payload) + "\n" for payload in payloads)
         with self.source_file.open("a", encoding="utf-8") as handle:
-            handle.write(line + "\n")
+            handle.write(text)
 
     def receive(self) -> list[dict]:
         payloads, _next = self.receive_incremental({})
@@ -43,15 +50,18 @@ class FileTransport(TransportBase):
                 if not line.strip():
                     continue
                 try:
-                    payloads.append(json.loads(line))
-                except json.JSONDecodeError:
+                    payloads.append(codec.loads(line))
+                except codec.JSONDecodeError:
                     continue
             next_cursors[file_key] = len(lines)
         return payloads, next_cursors
 
     def update_presence(self, presence: dict) -> None:
         self.presence_dir.mkdir(parents=True, exist_ok=True)
-        self.presence_file.write_text(json.dumps(presence, ensure_ascii=True), encoding="utf-8")
+        # Last-value-wins record: replace atomically so peers never read a torn file.
+        tmp_path = self.presence_file.with_suffix(".json.tmp")
+        tmp_path.write_text(codec.dumps(presence, compact=True), encoding="utf-8")
+        os.replace(tmp_path, self.presence_file)
 
     def receive_presence(self) -> list[dict]:
         if not self.presence_dir.exists():
@@ -61,8 +71,8 @@ class FileTransport(TransportBase):
             if file_path == self.presence_file:
                 continue
             try:
-                data = json.loads(file_path.read_text(encoding="utf-8"))
-            except (OSError, json.JSONDecodeError):
+                data = codec.loads(file_path.read_text(encoding="utf-8"))
+            except (OSError, codec.JSONDecodeError):
                 continue
             if isinstance(data, dict):
                 payloads.append(data)
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import base64
-import json
 from pathlib import PurePosixPath
 from urllib.error import HTTPError
 from urllib.parse import quote
 from urllib.request import Request, urlopen
 
+from dugong_app.core import codec
+
 from .transport_base import TransportBase
 
 
@@ -29,11 +30,19 @@ class GithubTransport(TransportBase):
         self.presence_file = f"{self.source_id}.json"
 
     def send(self, payload: dict) -> None:
-        line = json.dumps(payload, ensure_ascii=True)
+        self.send_many([payload])
+
+    def send_many(self, payloads: list[dict]) -> None:
+        # One GET + one PUT commit for the whole batch.
+        if not payloads:
+            return
+        lines = "\n".join(codec.dumps(payload) for payload in payloads)
         path = self._path(self.source_file)
         existing_text, sha = self._read_remote_file(path)
-        next_text = f"{existing_text}\n{line}" if existing_text else line
-        self._write_remote_file(path=path, text=next_text, sha=sha, message=f"sync({self.source_id}): append event")
+        next_text = f"{existing_text}\n{lines}" if existing_text else lines
+        count = len(payloads)
+        message = f"sync({self.source_id}): append event" if count == 1 else f"sync({self.source_id}): append {count} events"
+        self._write_remote_file(path=path, text=next_text, sha=sha, message=message)
 
     def receive(self) -> list[dict]:
         payloads, _next = self.receive_incremental({})
@@ -58,8 +67,8 @@ class GithubTransport(TransportBase):
                 if not line.strip():
                     continue
                 try:
-                    payloads.append(json.loads(line))
-                except json.JSONDecodeError:
+                    payloads.append(codec.loads(line))
+                except codec.JSONDecodeError:
                     continue
             next_cursors[name] = len(lines)
         return payloads, next_cursors
@@ -86,18 +95,18 @@ class GithubTransport(TransportBase):
         data = None
         headers = self._headers()
         if body is not None:
-            data = json.dumps(body).encode("utf-8")
+            data = codec.dumps(body, compact=True).encode("utf-8")
             headers["Content-Type"] = "application/json"
 
         req = Request(url=url, data=data, method=method, headers=headers)
         try:
             with urlopen(req, timeout=15) as resp:
                 raw = resp.read().decode("utf-8")
-                payload = json.loads(raw) if raw else {}
+                payload = codec.loads(raw) if raw else {}
                 return resp.status, payload, dict(resp.headers.items())
         except HTTPError as exc:
             raw = exc.read().decode("utf-8") if exc.fp else ""
-            payload = json.loads(raw) if raw else {}
+            payload = codec.loads(raw) if raw else {}
             return exc.code, payload, dict(exc.headers.items()) if exc.headers else {}
 
     def _list_remote_files(self) -> list[str]:
@@ -169,7 +178,7 @@ class GithubTransport(TransportBase):
         return f"{prefix}: status=429"
 
     def update_presence(self, presence: dict) -> None:
-        text = json.dumps(presence, ensure_ascii=True, separators=(",", ":"))
+        text = codec.dumps(presence, compact=True)
         path = self._presence_path(self.presence_file)
         _existing_text, sha = self._read_remote_file(path)
         self._write_remote_file(path=path, text=text, sha=sha, message=f"sync({self.source_id}): presence")
@@ -186,8 +195,8 @@ class GithubTransport(TransportBase):
             if not text.strip():
                 continue
             try:
-                data = json.loads(text)
-            except json.JSONDecodeError:
+                data = codec.loads(text)
+            except codec.JSONDecodeError:
                 continue
             if isinstance(data, dict):
                 payloads.append(data)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+from dugong_app.core import codec
+from dugong_app.core.rollup import add_event, empty_counts, merge_counts
+
+ROLLUP_SIDECAR = "day_rollups.json"
+
+
+class DayRollupIndex:
+    """Running per-day, per-source counters for each journal file, kept in a sidecar.
+
+    Layout: {"files": {name: {"bytes": n, "days": {day: {source: counts}}}}}.
+    `bytes` is the file size the counters cover; an entry whose file has a
+    different size (crash between append and sidecar write, or a rewrite by
+    another process) is stale and gets recounted from that one file.
+    """
+
+    def __init__(self, path: str | Path, fsync_writes: bool = False) -> None:
+        self.path = Path(path)
+        self.fsync_writes = fsync_writes
+        self._files: dict[str, dict] = {}
+        self.recounted_files = 0
+        if self.path.exists():
+            try:
+                raw = codec.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, codec.JSONDecodeError):
+                raw = {}
+            files = raw.get("files", {}) if isinstance(raw, dict) else {}
+            self._files = {str(k): v for k, v in files.items() if isinstance(v, dict)} if isinstance(files, dict) else {}
+
+    def entry(self, file_path: Path) -> dict[str, dict[str, dict[str, int]]] | None:
+        """Per-day, per-source counts for `file_path`, or None when stale/missing."""
+        record = self._files.get(file_path.name)
+        try:
+            size = file_path.stat().st_size
+        except OSError:
+            return None
+        if record is None or int(record.get("bytes", -1)) != size:
+            return None
+        days = record.get("days", {})
+        return days if isinstance(days, dict) else None
+
+    def reconcile(self, file_paths: Iterable[Path], day_of) -> bool:
+        """Recount stale files and forget deleted ones; returns True if anything changed."""
+        changed = False
+        present = set()
+        for file_path in file_paths:
+            present.add(file_path.name)
+            if self.entry(file_path) is None:
+                self.recount(file_path, day_of)
+                changed = True
+        for name in [name for name in self._files if name not in present]:
+            del self._files[name]
+            changed = True
+        return changed
+
+    def recount(self, file_path: Path, day_of) -> None:
+        days: dict[str, dict[str, dict[str, int]]] = {}
+        seen_ids: set[str] = set()
+        size = 0
+        try:
+            with file_path.open("rb") as handle:
+                for raw_line in handle:
+                    if not raw_line.endswith(b"\n"):
+                        break  # partial tail: not covered until it is complete
+                    size += len(raw_line)
+                    if not raw_line.strip():
+                        continue
+                    try:
+                        payload = codec.loads(raw_line)
+                    except codec.JSONDecodeError:
+                        continue
+                    if not isinstance(payload, dict):
+                        continue
+                    event_id = str(payload.get("event_id", "") or "")
+                    if event_id and event_id in seen_ids:
+                        continue
+                    if event_id:
+                        seen_ids.add(event_id)
+                    self._add(days, day_of(str(payload.get("timestamp", ""))), str(payload.get("source", "dugong_app")), payload)
+        except OSError:
+            self._files.pop(file_path.name, None)
+            return
+        self._files[file_path.name] = {"bytes": size, "days": days}
+        self.recounted_files += 1
+
+    def covers(self, file_name: str, size: int) -> bool:
+        record = self._files.get(file_name)
+        return record is not None and int(record.get("bytes", -1)) == int(size)
+
+    def add(self, file_name: str, size: int, rows: Iterable[tuple[str, str, str, object]]) -> None:
+        """Fold appended (day, source, event_type, payload) rows in; `size` is the new file size."""
+        record = self._files.setdefault(file_name, {"bytes": 0, "days": {}})
+        days = record.setdefault("days", {})
+        for day, source, event_type, payload in rows:
+            self._add(days, day, source, {"event_type": event_type, "payload": payload})
+        record["bytes"] = int(size)
+
+    def set_file(self, file_name: str, size: int, days: dict[str, dict[str, dict[str, int]]]) -> None:
+        self._files[file_name] = {"bytes": int(size), "days": days}
+
+    def drop(self, file_name: str) -> None:
+        self._files.pop(file_name, None)
+
+    def day_totals(self, since_day: str = "", before_day: str = "9999-12-31") -> list[dict]:
+        """Summary rows for since_day <= day < before_day, summed over files and sources."""
+        merged: dict[str, dict] = {}
+        for record in self._files.values():
+            for day, by_source in record.get("days", {}).items():
+                if not (since_day <= day < before_day):
+                    continue
+                bucket = merged.setdefault(day, {"counts": empty_counts(), "sources": set()})
+                for source, counts in by_source.items():
+                    merge_counts(bucket["counts"], counts)
+                    if source:
+                        bucket["sources"].add(source)
+        return [
+            {"date": day, **merged[day]["counts"], "sources": sorted(merged[day]["sources"])}
+            for day in sorted(merged)
+        ]
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = codec.dumps({"version": 1, "files": self._files}, compact=True)
+        with NamedTemporaryFile("w", delete=False, encoding="utf-8", dir=str(self.path.parent)) as handle:
+            handle.write(data)
+            handle.flush()
+            if self.fsync_writes:
+                os.fsync(handle.fileno())
+            tmp_path = Path(handle.name)
+        os.replace(tmp_path, self.path)
+
+    def _add(self, days: dict, day: str, source: str, payload: dict) -> None:
+        counts = days.setdefault(day, {}).setdefault(source, empty_counts())
+        add_event(counts, str(payload.get("event_type", "unknown")), payload.get("payload", {}))
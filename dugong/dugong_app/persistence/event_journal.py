@@ -1,18 +1,23 @@
 from __future__ import annotations
 
-import json
 import logging
 import os
 import threading
+import time
+from collections.abc import Iterable
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
+from dugong_app.core import codec
 from dugong_app.core.events import DugongEvent
+from dugong_app.persistence.day_rollups import ROLLUP_SIDECAR, DayRollupIndex
 
 LOGGER = logging.getLogger(__name__)
 
 
 class EventJournal:
+    ROLLUP_SAVE_SECONDS = 5.0
+
     def __init__(self, path: str | Path, retention_days: int = 30, fsync_writes: bool | None = None) -> None:
         raw_path = Path(path)
         self.retention_days = max(1, int(retention_days))
@@ -30,27 +35,70 @@ class EventJournal:
             self.dir_path = raw_path
 
         self._known_event_ids = self._scan_known_event_ids()
+        # Per-day/per-source counters kept current on every append, so
+        # summaries and compaction never re-scan raw lines.
+        # The sidecar is written at most every ROLLUP_SAVE_SECONDS: an entry
+        # that lags its file is detected by size and recounted on next open.
+        self._rollups = DayRollupIndex(self.dir_path / ROLLUP_SIDECAR, fsync_writes=self.fsync_writes)
+        self._rollups_saved_at = 0.0
+        if self._rollups.reconcile(self._journal_files(), self._day_of_timestamp) and self.dir_path.exists():
+            self._save_rollups()
 
     def append(self, event: DugongEvent) -> bool:
-        with self._lock:
-            if event.event_id and event.event_id in self._known_event_ids:
-                LOGGER.debug("journal dedupe hit event_id=%s", event.event_id)
-                return False
+        return self.append_many([event])[0]
 
-            self.dir_path.mkdir(parents=True, exist_ok=True)
-            day_file = self.dir_path / f"{self._event_day(event)}.jsonl"
-            line = json.dumps(event.to_dict(), ensure_ascii=True)
+    def append_many(self, events: list[DugongEvent]) -> list[bool]:
+        """Group write: one open/flush/fsync per day file for the whole batch.
 
-            with day_file.open("a", encoding="utf-8") as handle:
-                handle.write(line + "\n")
-                handle.flush()
-                if self.fsync_writes:
-                    os.fsync(handle.fileno())
+        Returns one flag per input event (False for dedupe hits, including
+        duplicates inside the batch itself).
+        """
+        with self._lock:
+            results: list[bool] = []
+            lines_by_day: dict[str, list[str]] = {}
+            rows_by_day: dict[str, list[tuple[str, str, str, object]]] = {}
+            batch_ids: set[str] = set()
+            for event in events:
+                if event.event_id and (event.event_id in self._known_event_ids or event.event_id in batch_ids):
+                    LOGGER.debug("journal dedupe hit event_id=%s", event.event_id)
+                    results.append(False)
+                    continue
+                day = self._event_day(event)
+                lines_by_day.setdefault(day, []).append(codec.dumps(event.to_dict()))
+                rows_by_day.setdefault(day, []).append((day, event.source, event.event_type, event.payload))
+                if event.event_id:
+                    batch_ids.add(event.event_id)
+                results.append(True)
+
+            if not lines_by_day:
+                return results
 
-            if event.event_id:
-                self._known_event_ids.add(event.event_id)
+            self.dir_path.mkdir(parents=True, exist_ok=True)
+            for day, lines in lines_by_day.items():
+                day_file = self.dir_path / f"{day}.jsonl"
+                previous_size = day_file.stat().st_size if day_file.exists() else 0
+                with day_file.open("a", encoding="utf-8") as handle:
+                    handle.write("\n".join(lines) + "\n")
+                    handle.flush()
+                    if self.fsync_writes:
+                        os.fsync(handle.fileno())
+                    size = os.fstat(handle.fileno()).st_size
+                if self._rollups.covers(day_file.name, previous_size):
+                    self._rollups.add(day_file.name, size, rows_by_day[day])
+                else:
+                    # Someone else touched the file since we counted it.
+                    self._rollups.recount(day_file, self._day_of_timestamp)
+
+            self._known_event_ids.update(batch_ids)
             self._prune_old_files()
-            return True
+            if time.monotonic() - self._rollups_saved_at >= self.ROLLUP_SAVE_SECONDS:
+                self._save_rollups()
+            return results
+
+    def day_totals(self, since_day: str = "", before_day: str = "9999-12-31") -> list[dict]:
+        """Per-day summary rows from the rollup index (O(days), no raw reads)."""
+        with self._lock:
+            return self._rollups.day_totals(since_day=since_day, before_day=before_day)
 
     def load_all(self) -> list[DugongEvent]:
         self._last_read_bad_lines = 0
@@ -67,6 +115,38 @@ class EventJournal:
             self._known_event_ids = seen_ids
         return events
 
+    def load_source_since(self, source: str, since_timestamp: str, event_types: Iterable[str]) -> list[DugongEvent]:
+        """`source`'s events of `event_types` at or after `since_timestamp`, in journal order.
+
+        Shards of earlier days are not read.
+        """
+        types = set(event_types)
+        since_day = self._day_of_timestamp(since_timestamp) if since_timestamp else ""
+        seen_ids: set[str] = set()
+        events: list[DugongEvent] = []
+        for file_path in self._journal_files():
+            if file_path != self.legacy_path and file_path.stem < since_day:
+                continue
+            for event in self._load_file(file_path, seen_ids):
+                if event.source == source and event.event_type in types and event.timestamp >= since_timestamp:
+                    events.append(event)
+        return events
+
+    def flush_rollups(self) -> None:
+        with self._lock:
+            self._save_rollups()
+
+    @property
+    def write_lock(self) -> threading.Lock:
+        """Held around every shard append; compaction takes it per shard it swaps."""
+        return self._lock
+
+    def refresh_rollups(self) -> None:
+        """Recount shards rewritten behind the journal's back (e.g. by compaction)."""
+        with self._lock:
+            if self._rollups.reconcile(self._journal_files(), self._day_of_timestamp):
+                self._save_rollups()
+
     def last_read_stats(self) -> dict[str, int]:
         return {"bad_lines_skipped": self._last_read_bad_lines}
 
@@ -87,8 +167,12 @@ class EventJournal:
                     if not line.strip():
                         continue
                     try:
-                        payload = json.loads(line)
-                    except json.JSONDecodeError as exc:
+                        payload = codec.loads(line)
+                    except codec.JSONDecodeError as exc:
+                        if not line.endswith("\n"):
+                            # Tail line still being appended by another lane; not corruption.
+                            LOGGER.debug("journal partial tail line skipped file=%s line=%s", file_path.name, line_no)
+                            continue
                         self._last_read_bad_lines += 1
                         LOGGER.warning("journal bad line file=%s line=%s error=%s", file_path.name, line_no, exc.msg)
                         continue
@@ -121,6 +205,13 @@ class EventJournal:
             LOGGER.warning("journal read failed file=%s error=%s", file_path, exc)
         return loaded
 
+    def _save_rollups(self) -> None:
+        try:
+            self._rollups.save()
+        except OSError as exc:
+            LOGGER.warning("journal rollup sidecar write failed error=%s", exc)
+        self._rollups_saved_at = time.monotonic()
+
     def _resolve_fsync_flag(self, explicit_value: bool | None) -> bool:
         if explicit_value is not None:
             return bool(explicit_value)
@@ -128,11 +219,20 @@ class EventJournal:
         return raw in {"1", "true", "yes", "on"}
 
     def _event_day(self, event: DugongEvent) -> str:
+        return self._day_of_timestamp(event.timestamp)
+
+    def _day_of_timestamp(self, timestamp: str) -> str:
         try:
-            return datetime.fromisoformat(event.timestamp).date().isoformat()
+            return datetime.fromisoformat(timestamp).date().isoformat()
         except ValueError:
             return datetime.now(tz=timezone.utc).date().isoformat()
 
+    def _journal_files(self) -> list[Path]:
+        files = sorted(self.dir_path.glob("*.jsonl")) if self.dir_path.exists() else []
+        if self.legacy_path is not None and self.legacy_path.exists():
+            files.append(self.legacy_path)
+        return files
+
     def _prune_old_files(self) -> None:
         cutoff = datetime.now(tz=timezone.utc).date() - timedelta(days=self.retention_days - 1)
         for file_path in self.dir_path.glob("*.jsonl"):
@@ -142,3 +242,4 @@ class EventJournal:
                 continue
             if day < cutoff:
                 file_path.unlink(missing_ok=True)
+                self._rollups.drop(file_path.name)
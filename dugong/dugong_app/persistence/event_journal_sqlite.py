@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from dugong_app.core import codec
+from dugong_app.core.events import DugongEvent
+from dugong_app.persistence.event_journal import EventJournal
+
+LOGGER = logging.getLogger(__name__)
+
+JOURNAL_BACKEND_JSONL = "jsonl"
+JOURNAL_BACKEND_SQLITE = "sqlite"
+SQLITE_JOURNAL_FILENAME = "event_journal.sqlite3"
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS events (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        event_id TEXT UNIQUE,
+        day TEXT NOT NULL,
+        event_type TEXT NOT NULL,
+        source TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        schema_version TEXT NOT NULL,
+        payload TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS events_day_type ON events(day, event_type)",
+    "CREATE INDEX IF NOT EXISTS events_source_ts ON events(source, timestamp)",
+)
+
+# Same rules as services.daily_summary.summarize_events, as one GROUP BY.
+_DAY_TOTALS_SQL = """
+    SELECT
+        day,
+        SUM(CASE
+            WHEN event_type = 'daily_rollup'
+                THEN CAST(COALESCE(json_extract(payload, '$.focus_seconds'), 0) AS INTEGER)
+            WHEN event_type = 'state_tick' AND json_extract(payload, '$.mode') = 'study'
+                THEN MAX(0, CAST(COALESCE(json_extract(payload, '$.tick_seconds'), 60) AS INTEGER))
+            ELSE 0 END),
+        SUM(CASE
+            WHEN event_type = 'daily_rollup' THEN CAST(COALESCE(json_extract(payload, '$.ticks'), 0) AS INTEGER)
+            WHEN event_type = 'state_tick' THEN 1
+            ELSE 0 END),
+        SUM(CASE
+            WHEN event_type = 'daily_rollup' THEN CAST(COALESCE(json_extract(payload, '$.mode_changes'), 0) AS INTEGER)
+            WHEN event_type = 'mode_change' THEN 1
+            ELSE 0 END),
+        SUM(CASE
+            WHEN event_type = 'daily_rollup' THEN CAST(COALESCE(json_extract(payload, '$.clicks'), 0) AS INTEGER)
+            WHEN event_type = 'click' THEN 1
+            ELSE 0 END),
+        SUM(CASE
+            WHEN event_type = 'daily_rollup' THEN CAST(COALESCE(json_extract(payload, '$.manual_pings'), 0) AS INTEGER)
+            WHEN event_type = 'manual_ping' THEN 1
+            ELSE 0 END),
+        COUNT(*),
+        GROUP_CONCAT(DISTINCT source)
+    FROM events
+    WHERE day >= ? AND day < ?
+    GROUP BY day
+    ORDER BY day
+"""
+
+_EVENT_COLUMNS = "event_type, timestamp, event_id, source, schema_version, payload"
+
+
+class SqliteEventJournal:
+    """EventJournal on stdlib sqlite3 (WAL), one row per event.
+
+    Drop-in for `EventJournal` (`append`, `append_many`, `load_all`,
+    `load_source_since`, `last_read_stats`); dedupe is the UNIQUE `event_id`
+    column instead of an in-memory set. It also answers the derived-data queries directly:
+    `day_totals()` for the summary, `load_by_type()` for focus sessions,
+    `recent()` for the debug CLI and `replace_day()` for compaction.
+    """
+
+    def __init__(self, path: str | Path, retention_days: int = 30, fsync_writes: bool | None = None) -> None:
+        self.path = Path(path)
+        self.retention_days = max(1, int(retention_days))
+        self.fsync_writes = self._resolve_fsync_flag(fsync_writes)
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # NORMAL survives an app crash; FULL also fsyncs each commit (DUGONG_JOURNAL_FSYNC).
+        self._conn.execute(f"PRAGMA synchronous={'FULL' if self.fsync_writes else 'NORMAL'}")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+
+    def append(self, event: DugongEvent) -> bool:
+        return self.append_many([event])[0]
+
+    def append_many(self, events: list[DugongEvent]) -> list[bool]:
+        """One transaction for the whole batch; False for dedupe hits."""
+        results: list[bool] = []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for event in events:
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO events (event_id, day, event_type, source, timestamp, schema_version, payload)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            event.event_id or None,
+                            self._event_day(event),
+                            event.event_type,
+                            event.source,
+                            event.timestamp,
+                            event.schema_version,
+                            codec.dumps(event.payload),
+                        ),
+                    )
+                    inserted = cursor.rowcount == 1
+                    if not inserted:
+                        LOGGER.debug("journal dedupe hit event_id=%s", event.event_id)
+                    results.append(inserted)
+                if any(results):
+                    self._conn.execute("DELETE FROM events WHERE day < ?", (self._retention_cutoff(),))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return results
+
+    def load_all(self) -> list[DugongEvent]:
+        return self._query(f"SELECT {_EVENT_COLUMNS} FROM events ORDER BY day, seq")
+
+    def load_by_type(self, event_types: Iterable[str]) -> list[DugongEvent]:
+        types = list(event_types)
+        if not types:
+            return []
+        marks = ", ".join("?" for _ in types)
+        return self._query(f"SELECT {_EVENT_COLUMNS} FROM events WHERE event_type IN ({marks}) ORDER BY day, seq", types)
+
+    def load_source_since(self, source: str, since_timestamp: str, event_types: Iterable[str]) -> list[DugongEvent]:
+        types = list(event_types)
+        if not types:
+            return []
+        marks = ", ".join("?" for _ in types)
+        return self._query(
+            f"SELECT {_EVENT_COLUMNS} FROM events WHERE source = ? AND timestamp >= ? AND event_type IN ({marks})"
+            " ORDER BY day, seq",
+            [source, since_timestamp, *types],
+        )
+
+    def recent(self, n: int) -> list[DugongEvent]:
+        rows = self._query(f"SELECT {_EVENT_COLUMNS} FROM events ORDER BY day DESC, seq DESC LIMIT ?", (max(0, int(n)),))
+        rows.reverse()
+        return rows
+
+    def day_totals(self, since_day: str = "", before_day: str = "9999-12-31") -> list[dict]:
+        """Per-day summary rows (the `days` list of `summarize_events`), since_day <= day < before_day."""
+        with self._lock:
+            rows = self._conn.execute(_DAY_TOTALS_SQL, (since_day, before_day)).fetchall()
+        return [
+            {
+                "date": day,
+                "focus_seconds": int(focus or 0),
+                "ticks": int(ticks or 0),
+                "mode_changes": int(mode_changes or 0),
+                "clicks": int(clicks or 0),
+                "manual_pings": int(pings or 0),
+                "event_count": int(count or 0),
+                "sources": sorted(name for name in str(sources or "").split(",") if name),
+            }
+            for day, focus, ticks, mode_changes, clicks, pings, count, sources in rows
+        ]
+
+    def day_is_rollup(self, day: str) -> bool:
+        with self._lock:
+            rows = self._conn.execute("SELECT event_type FROM events WHERE day = ? LIMIT 2", (day,)).fetchall()
+        return len(rows) == 1 and rows[0][0] == "daily_rollup"
+
+    def replace_day(self, day: str, event: DugongEvent) -> None:
+        # Atomic swap of a day's rows for one rollup event.
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM events WHERE day = ?", (day,))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO events (event_id, day, event_type, source, timestamp, schema_version, payload)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        event.event_id or None,
+                        day,
+                        event.event_type,
+                        event.source,
+                        event.timestamp,
+                        event.schema_version,
+                        codec.dumps(event.payload),
+                    ),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0])
+
+    def last_read_stats(self) -> dict[str, int]:
+        # Rows are decoded by SQLite; there are no partial or bad lines to skip.
+        return {"bad_lines_skipped": 0}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _query(self, sql: str, params: Iterable = ()) -> list[DugongEvent]:
+        with self._lock:
+            rows = self._conn.execute(sql, tuple(params)).fetchall()
+        events: list[DugongEvent] = []
+        for event_type, timestamp, event_id, source, schema_version, payload in rows:
+            try:
+                decoded = codec.loads(payload)
+            except codec.JSONDecodeError:
+                decoded = {}
+            events.append(
+                DugongEvent(
+                    event_type=event_type,
+                    timestamp=timestamp,
+                    event_id=event_id or "",
+                    source=source,
+                    schema_version=schema_version,
+                    payload=decoded,
+                )
+            )
+        return events
+
+    def _resolve_fsync_flag(self, explicit_value: bool | None) -> bool:
+        if explicit_value is not None:
+            return bool(explicit_value)
+        raw = os.getenv("DUGONG_JOURNAL_FSYNC", "0").strip().lower()
+        return raw in {"1", "true", "yes", "on"}
+
+    def _event_day(self, event: DugongEvent) -> str:
+        try:
+            return datetime.fromisoformat(event.timestamp).date().isoformat()
+        except ValueError:
+            return datetime.now(tz=timezone.utc).date().isoformat()
+
+    def _retention_cutoff(self) -> str:
+        return (datetime.now(tz=timezone.utc).date() - timedelta(days=self.retention_days - 1)).isoformat()
+
+
+def migrate_journal(
+    src: EventJournal | SqliteEventJournal, dst: EventJournal | SqliteEventJournal, batch_size: int = 2000
+) -> int:
+    """Copy every event from `src` into `dst` (either direction); returns how many were new."""
+    events = src.load_all()
+    imported = 0
+    for start in range(0, len(events), max(1, int(batch_size))):
+        imported += sum(dst.append_many(events[start : start + batch_size]))
+    return imported
+
+
+def retire_journal_store(path: Path) -> None:
+    """Rename a migrated-away journal file or shard dir to `*.migrated` (replacing an older one)."""
+    retired = path.with_name(path.name + ".migrated")
+    if retired.is_dir():
+        shutil.rmtree(retired)
+    elif retired.exists():
+        retired.unlink()
+    path.replace(retired)
+
+
+def open_event_journal(
+    data_dir: str | Path,
+    backend: str = JOURNAL_BACKEND_JSONL,
+    retention_days: int = 30,
+    fsync_writes: bool | None = None,
+) -> EventJournal | SqliteEventJournal:
+    """Open the configured journal backend, folding in whatever the other backend still holds.
+
+    The other store is merged (event_id dedupe) and then retired to `*.migrated`,
+    so it never shadows events written later and a switch back merges them too.
+    """
+    data_dir = Path(data_dir)
+    jsonl_dir = data_dir / "event_journal"
+    legacy_file = data_dir / "event_journal.jsonl"
+    sqlite_path = data_dir / SQLITE_JOURNAL_FILENAME
+    has_jsonl = legacy_file.exists() or (jsonl_dir.exists() and any(jsonl_dir.glob("*.jsonl")))
+
+    if str(backend).strip().lower() == JOURNAL_BACKEND_SQLITE:
+        journal = SqliteEventJournal(sqlite_path, retention_days=retention_days, fsync_writes=fsync_writes)
+        if has_jsonl:
+            imported = migrate_journal(EventJournal(legacy_file, retention_days=retention_days), journal)
+            LOGGER.info("journal migrated jsonl -> sqlite events=%s", imported)
+            for path in (jsonl_dir, legacy_file):
+                if path.exists():
+                    retire_journal_store(path)
+        return journal
+
+    journal = EventJournal(legacy_file, retention_days=retention_days, fsync_writes=fsync_writes)
+    if sqlite_path.exists():
+        source = SqliteEventJournal(sqlite_path, retention_days=retention_days)
+        try:
+            imported = migrate_journal(source, journal)
+        finally:
+            source.close()
+        LOGGER.info("journal migrated sqlite -> jsonl events=%s", imported)
+        # WAL sidecars go too, so a later sqlite switch never replays them into a fresh file.
+        for suffix in ("", "-wal", "-shm"):
+            path = sqlite_path.with_name(sqlite_path.name + suffix)
+            if path.exists():
+                retire_journal_store(path)
+    return journal
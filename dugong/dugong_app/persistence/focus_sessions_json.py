@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
+from dugong_app.core import codec
+
 
 class FocusSessionsStorage:
     def __init__(self, path: str | Path) -> None:
@@ -11,7 +12,7 @@ class FocusSessionsStorage:
 
     def save(self, sessions: list[dict]) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        payload = json.dumps({"sessions": sessions}, ensure_ascii=True, indent=2)
+        payload = codec.dumps({"sessions": sessions}, indent=True)
         with NamedTemporaryFile("w", delete=False, encoding="utf-8", dir=str(self.path.parent)) as handle:
             handle.write(payload)
             tmp_path = Path(handle.name)
@@ -1,27 +1,42 @@
 from __future__ import annotations
 
-import json
 import os
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
+from dugong_app.core import codec
+from dugong_app.persistence.state_store import PREVIOUS_GENERATION_KEY, StateStore
+
 
 class PomodoroStateStorage:
-    def __init__(self, path: str | Path) -> None:
+    SECTION = "pomodoro_state"
+
+    def __init__(self, path: str | Path, store: StateStore | None = None) -> None:
         self.path = Path(path)
+        self.store = store
 
     def load(self) -> dict:
+        if self.store is not None:
+            raw = self.store.load(self.SECTION, legacy_path=self.path)
+            if not isinstance(raw, dict):
+                raw = self.store.load_previous(self.SECTION)
+                if isinstance(raw, dict):
+                    raw[PREVIOUS_GENERATION_KEY] = True
+            return raw if isinstance(raw, dict) else {}
         if not self.path.exists():
             return {}
         try:
-            raw = json.loads(self.path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
+            raw = codec.loads(self.path.read_text(encoding="utf-8"))
+        except (codec.JSONDecodeError, OSError):
             return {}
         return raw if isinstance(raw, dict) else {}
 
     def save(self, payload: dict) -> None:
+        if self.store is not None:
+            self.store.stage(self.SECTION, payload, keep_previous=True)
+            return
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        encoded = json.dumps(payload, ensure_ascii=True, indent=2)
+        encoded = codec.dumps(payload, indent=True)
         with NamedTemporaryFile("w", delete=False, encoding="utf-8", dir=str(self.path.parent)) as handle:
             handle.write(encoded)
             handle.flush()
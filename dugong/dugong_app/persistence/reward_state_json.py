@@ -1,30 +1,85 @@
 from __future__ import annotations
 
-import json
 import os
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
+from dugong_app.core import codec
+from dugong_app.persistence.state_store import PREVIOUS_GENERATION_KEY, StateStore
+
 
 class RewardStateStorage:
-    def __init__(self, path: str | Path) -> None:
+    """Reward state; with a store, the dedupe ledgers live in chunk sections.
+
+    The main section lists each ledger's chunk range under "ledgers" and
+    every chunk is its own "reward_state.<ledger>.<n>" section, so saving
+    after a grant rewrites one small chunk instead of the whole history.
+    `load()` puts the chunks under "ledger_chunks" and also flattens them
+    back into the plain lists older payloads carried. The main section keeps
+    its previous generation for when the current one is unreadable.
+    """
+
+    SECTION = "reward_state"
+
+    def __init__(self, path: str | Path, store: StateStore | None = None) -> None:
         self.path = Path(path)
+        self.store = store
 
     def load(self) -> dict:
+        if self.store is not None:
+            raw = self.store.load(self.SECTION, legacy_path=self.path)
+            if not isinstance(raw, dict):
+                # Its ledger spans point at the current chunks, which may hold
+                # ids granted after it was taken (see PREVIOUS_GENERATION_KEY).
+                raw = self.store.load_previous(self.SECTION)
+                if isinstance(raw, dict):
+                    raw[PREVIOUS_GENERATION_KEY] = True
+            return self._with_ledgers(raw) if isinstance(raw, dict) else {}
         if not self.path.exists():
             return {}
         try:
-            raw = json.loads(self.path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
+            raw = codec.loads(self.path.read_text(encoding="utf-8"))
+        except (codec.JSONDecodeError, OSError):
             return {}
         return raw if isinstance(raw, dict) else {}
 
-    def save(self, payload: dict) -> None:
+    def save(self, payload: dict, ledger_chunks: dict[str, dict[int, list[str]]] | None = None) -> None:
+        # `ledger_chunks` (changed chunks only, [] = delete) needs a store; the
+        # plain-file layout expects the full lists inside `payload`.
+        if self.store is not None:
+            for name, chunks in (ledger_chunks or {}).items():
+                for number, items in chunks.items():
+                    if items:
+                        self.store.stage(self._chunk_section(name, number), items)
+                    else:
+                        self.store.discard(self._chunk_section(name, number))
+            self.store.stage(self.SECTION, payload, keep_previous=True)
+            return
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        encoded = json.dumps(payload, ensure_ascii=True, indent=2)
+        encoded = codec.dumps(payload, indent=True)
         with NamedTemporaryFile("w", delete=False, encoding="utf-8", dir=str(self.path.parent)) as handle:
             handle.write(encoded)
             handle.flush()
             os.fsync(handle.fileno())
             tmp_path = Path(handle.name)
         os.replace(tmp_path, self.path)
+
+    def _with_ledgers(self, payload: dict) -> dict:
+        ledgers = payload.get("ledgers")
+        if not isinstance(ledgers, dict) or self.store is None:
+            return payload
+        payload["ledger_chunks"] = {}
+        for name, span in ledgers.items():
+            if not isinstance(span, list) or len(span) != 2:
+                continue
+            chunks: dict[int, list[str]] = {}
+            for number in range(int(span[0]), int(span[1]) + 1):
+                items = self.store.load(self._chunk_section(name, number))
+                if isinstance(items, list):
+                    chunks[number] = [str(item) for item in items]
+            payload["ledger_chunks"][name] = chunks
+            payload[name] = [item for number in sorted(chunks) for item in chunks[number]]
+        return payload
+
+    def _chunk_section(self, name: str, number: int) -> str:
+        return f"{self.SECTION}.{name}.{int(number)}"
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import calendar
+import os
+from collections.abc import Iterable
+from datetime import date, timedelta
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+from dugong_app.core import codec
+from dugong_app.core.rollup import ROLLUP_FIELDS
+
+ROLLUP_ARCHIVE_FILENAME = "rollup_archive.json"
+TIER_DAY = "day"
+TIER_WEEK = "week"
+TIER_MONTH = "month"
+
+_COUNT_FIELDS = (*ROLLUP_FIELDS, "event_count")
+
+
+def week_span(day: date) -> tuple[date, date]:
+    """The ISO week holding `day`, clipped to its month (so weeks nest in months)."""
+    first, last = month_span(day)
+    start = max(day - timedelta(days=day.weekday()), first)
+    end = min(day + timedelta(days=6 - day.weekday()), last)
+    return start, end
+
+
+def month_span(day: date) -> tuple[date, date]:
+    return day.replace(day=1), day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+class RollupArchive:
+    """Long-range history kept outside journal retention: days -> weeks -> months.
+
+    Each record is {"tier", "start", "end", <counters>, "active_mask",
+    "rolled_up_from_dates"}. Bit i of `active_mask` is set when day start+i had
+    focus time, so streaks stay exact after folding. Closed days are ingested
+    as day records; once a day leaves journal retention its (complete) week is
+    folded, and weeks fold into their month MONTH_AFTER_DAYS later.
+    """
+
+    MONTH_AFTER_DAYS = 62
+
+    def __init__(self, path: str | Path, fsync_writes: bool = False) -> None:
+        self.path = Path(path)
+        self.fsync_writes = fsync_writes
+        self._records: dict[str, dict] = {}
+        if self.path.exists():
+            try:
+                raw = codec.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, codec.JSONDecodeError):
+                raw = {}
+            records = raw.get("records", []) if isinstance(raw, dict) else []
+            for record in records if isinstance(records, list) else []:
+                if isinstance(record, dict) and record.get("tier") in {TIER_DAY, TIER_WEEK, TIER_MONTH}:
+                    self._records[self._key(record["tier"], str(record.get("start", "")))] = record
+
+    def records(self, tier: str | None = None) -> list[dict]:
+        ordered = sorted(self._records.values(), key=lambda r: (r["start"], r["tier"]))
+        return [dict(record) for record in ordered if tier is None or record["tier"] == tier]
+
+    def ingest(self, day_rows: Iterable[dict], before_day: str) -> bool:
+        """Upsert per-day summary rows for closed days (date < before_day)."""
+        changed = False
+        for row in day_rows:
+            day = str(row.get("date", ""))
+            if not day or day >= before_day or self._covered(date.fromisoformat(day)):
+                continue
+            counts = {name: int(row.get(name, 0)) for name in _COUNT_FIELDS}
+            record = {
+                "tier": TIER_DAY,
+                "start": day,
+                "end": day,
+                **counts,
+                "active_mask": 1 if counts["focus_seconds"] > 0 else 0,
+                "rolled_up_from_dates": [day],
+            }
+            key = self._key(TIER_DAY, day)
+            if self._records.get(key) != record:
+                self._records[key] = record
+                changed = True
+        return changed
+
+    def fold(self, before_day: str) -> bool:
+        """Fold days of weeks ending before `before_day`, then weeks of old enough months."""
+        cutoff = date.fromisoformat(before_day)
+        changed = False
+        for record in self.records(TIER_DAY):
+            start, end = week_span(date.fromisoformat(record["start"]))
+            if end < cutoff:
+                self._fold_into(TIER_WEEK, start, end, record)
+                changed = True
+        month_cutoff = cutoff - timedelta(days=self.MONTH_AFTER_DAYS)
+        for record in self.records(TIER_WEEK):
+            start, end = month_span(date.fromisoformat(record["start"]))
+            if end < month_cutoff:
+                self._fold_into(TIER_MONTH, start, end, record)
+                changed = True
+        return changed
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = codec.dumps({"version": 1, "records": self.records()}, compact=True)
+        with NamedTemporaryFile("w", delete=False, encoding="utf-8", dir=str(self.path.parent)) as handle:
+            handle.write(data)
+            handle.flush()
+            if self.fsync_writes:
+                os.fsync(handle.fileno())
+            tmp_path = Path(handle.name)
+        os.replace(tmp_path, self.path)
+
+    def _fold_into(self, tier: str, start: date, end: date, record: dict) -> None:
+        target = self._records.setdefault(
+            self._key(tier, start.isoformat()),
+            {
+                "tier": tier,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                **{name: 0 for name in _COUNT_FIELDS},
+                "active_mask": 0,
+                "rolled_up_from_dates": [],
+            },
+        )
+        for name in _COUNT_FIELDS:
+            target[name] = int(target.get(name, 0)) + int(record.get(name, 0))
+        shift = (date.fromisoformat(record["start"]) - start).days
+        target["active_mask"] = int(target["active_mask"]) | (int(record.get("active_mask", 0)) << shift)
+        target["rolled_up_from_dates"] = sorted(
+            set(target["rolled_up_from_dates"]) | {str(d) for d in record.get("rolled_up_from_dates", [])}
+        )
+        del self._records[self._key(record["tier"], record["start"])]
+
+    def _covered(self, day: date) -> bool:
+        # Already folded: a late row for that day must not be counted twice.
+        return (
+            self._key(TIER_WEEK, week_span(day)[0].isoformat()) in self._records
+            or self._key(TIER_MONTH, month_span(day)[0].isoformat()) in self._records
+        )
+
+    @staticmethod
+    def _key(tier: str, start: str) -> str:
+        return f"{tier}:{start}"
@@ -1,27 +1,38 @@
 from __future__ import annotations
 
-import json
 import os
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
+from dugong_app.core import codec
+from dugong_app.persistence.state_store import StateStore
+
 
 class RuntimeHealthStorage:
-    def __init__(self, path: str | Path) -> None:
+    SECTION = "sync_health"
+
+    def __init__(self, path: str | Path, store: StateStore | None = None) -> None:
         self.path = Path(path)
+        self.store = store
 
     def load(self) -> dict:
+        if self.store is not None:
+            raw = self.store.load(self.SECTION, legacy_path=self.path)
+            return raw if isinstance(raw, dict) else {}
         if not self.path.exists():
             return {}
         try:
-            payload = json.loads(self.path.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
+            payload = codec.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, codec.JSONDecodeError):
             return {}
         return payload if isinstance(payload, dict) else {}
 
     def save(self, payload: dict) -> None:
+        if self.store is not None:
+            self.store.stage(self.SECTION, payload)
+            return
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        data = json.dumps(payload, ensure_ascii=True, indent=2)
+        data = codec.dumps(payload, indent=True)
         with NamedTemporaryFile("w", delete=False, encoding="utf-8", dir=str(self.path.parent)) as handle:
             handle.write(data)
             handle.flush()
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from dugong_app.core import codec
+
+STATE_STORE_FILENAME = "state.sqlite3"
+PREVIOUS_SUFFIX = ".prev"
+# Set on a payload that `load()` had to take from the previous generation.
+PREVIOUS_GENERATION_KEY = "previous_generation"
+
+
+class StateStore:
+    """Named JSON sections in one SQLite database (WAL), written behind.
+
+    `stage()` only encodes the payload and marks its section dirty; `commit()`
+    writes every dirty section in a single transaction, so one flush costs one
+    WAL fsync no matter how many sections changed. A section that is not in
+    the database yet is migrated from its legacy JSON file on first `load()`;
+    that file is renamed to `*.migrated` once the section has been committed.
+    Sections staged with `keep_previous` also keep the last committed payload
+    as `<section>.prev`, a fallback for when the current one will not decode.
+    Safe to stage from worker threads; commit from one thread.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._encoded: dict[str, str] = {}
+        self._dirty: set[str] = set()
+        self._deleted: set[str] = set()
+        self._legacy: dict[str, Path] = {}
+        self._committed: dict[str, str] = {}
+        self._keep_previous: set[str] = set()
+        self._counters = {"commits": 0, "sections_written": 0, "sections_deleted": 0, "bytes_written": 0, "migrated": 0, "errors": 0}
+        self._last_commit_ms = 0.0
+
+    def load(self, section: str, legacy_path: str | Path | None = None) -> object | None:
+        with self._lock:
+            if section in self._deleted:
+                return None
+            encoded = self._encoded.get(section)
+        if encoded is None:
+            encoded = self._read_section(section)
+            if encoded is not None:
+                with self._lock:
+                    self._committed.setdefault(section, encoded)
+            if encoded is None and legacy_path is not None:
+                encoded = self._migrate(section, Path(legacy_path))
+            if encoded is None:
+                return None
+            with self._lock:
+                # A concurrent stage() wins over what we just read.
+                encoded = self._encoded.setdefault(section, encoded)
+        try:
+            return codec.loads(encoded)
+        except codec.JSONDecodeError:
+            return None
+
+    def load_previous(self, section: str) -> object | None:
+        return self.load(section + PREVIOUS_SUFFIX)
+
+    def stage(self, section: str, payload: object, keep_previous: bool = False) -> None:
+        encoded = codec.dumps(payload, compact=True)
+        with self._lock:
+            if keep_previous:
+                self._keep_previous.add(section)
+            if self._encoded.get(section) == encoded and section not in self._dirty:
+                return
+            self._encoded[section] = encoded
+            self._dirty.add(section)
+            self._deleted.discard(section)
+
+    def discard(self, section: str) -> None:
+        """Delete `section` with the next commit."""
+        with self._lock:
+            self._encoded.pop(section, None)
+            self._dirty.discard(section)
+            self._deleted.add(section)
+
+    @property
+    def dirty(self) -> bool:
+        with self._lock:
+            return bool(self._dirty or self._deleted)
+
+    def commit(self) -> int:
+        """Write all dirty sections (and deletes) atomically; returns how many changed."""
+        with self._lock:
+            if not self._dirty and not self._deleted:
+                return 0
+            rows = [(name, self._encoded[name], time.time()) for name in sorted(self._dirty)]
+            previous = self._previous_rows(rows)
+            deleted = sorted(self._deleted)
+            self._dirty.clear()
+            self._deleted.clear()
+        started = time.perf_counter()
+        try:
+            with self._io_lock:
+                conn = self._connect()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO sections(name, payload, updated_at) VALUES (?, ?, ?)", rows + previous
+                    )
+                    conn.executemany("DELETE FROM sections WHERE name = ?", [(name,) for name in deleted])
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+        except (sqlite3.Error, OSError):
+            with self._lock:
+                # Newer stages already hold the latest payload; just re-mark.
+                self._dirty.update(name for name, _payload, _ts in rows)
+                self._deleted.update(name for name in deleted if name not in self._encoded)
+                self._counters["errors"] += 1
+            raise
+        self._last_commit_ms = (time.perf_counter() - started) * 1000.0
+        with self._lock:
+            self._counters["commits"] += 1
+            self._counters["sections_written"] += len(rows)
+            self._counters["sections_deleted"] += len(deleted)
+            self._counters["bytes_written"] += sum(len(payload) for _name, payload, _ts in rows)
+            self._committed.update((name, payload) for name, payload, _ts in rows + previous)
+            for name, _payload, _ts in previous:
+                self._encoded.pop(name, None)  # written behind the cache; re-read on load
+            retired = [self._legacy.pop(name) for name, _payload, _ts in rows if name in self._legacy]
+        for legacy_path in retired:
+            try:
+                legacy_path.replace(legacy_path.with_name(legacy_path.name + ".migrated"))
+            except OSError:
+                pass
+        return len(rows) + len(deleted)
+
+    def close(self) -> None:
+        self.commit()
+        with self._io_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def metrics(self) -> dict:
+        with self._lock:
+            payload = dict(self._counters)
+            payload["dirty_sections"] = len(self._dirty)
+        payload["last_commit_ms"] = round(self._last_commit_ms, 2)
+        return payload
+
+    def _previous_rows(self, rows: list[tuple[str, str, float]]) -> list[tuple[str, str, float]]:
+        # Only a payload that still decodes becomes the fallback: a corrupted
+        # current section must not overwrite the good previous one.
+        previous = []
+        for name, payload, ts in rows:
+            old = self._committed.get(name)
+            if name not in self._keep_previous or old is None or old == payload:
+                continue
+            try:
+                codec.loads(old)
+            except codec.JSONDecodeError:
+                continue
+            previous.append((name + PREVIOUS_SUFFIX, old, ts))
+        return previous
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # FULL: every commit fsyncs the WAL, like the per-file fsync it replaces.
+            conn.execute("PRAGMA synchronous=FULL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sections (name TEXT PRIMARY KEY, payload TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _read_section(self, section: str) -> str | None:
+        try:
+            with self._io_lock:
+                row = self._connect().execute("SELECT payload FROM sections WHERE name = ?", (section,)).fetchone()
+        except sqlite3.Error:
+            return None
+        return str(row[0]) if row is not None else None
+
+    def _migrate(self, section: str, legacy_path: Path) -> str | None:
+        if not legacy_path.exists():
+            return None
+        try:
+            payload = codec.loads(legacy_path.read_text(encoding="utf-8"))
+        except (OSError, codec.JSONDecodeError):
+            return None
+        encoded = codec.dumps(payload, compact=True)
+        with self._lock:
+            if section in self._encoded:
+                return self._encoded[section]
+            self._encoded[section] = encoded
+            self._dirty.add(section)
+            self._legacy[section] = legacy_path
+            self._counters["migrated"] += 1
+        return encoded
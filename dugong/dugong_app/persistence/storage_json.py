@@ -1,29 +1,39 @@
 ﻿from __future__ import annotations
 
-import json
 import os
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
+from dugong_app.core import codec
 from dugong_app.core.state import DugongState
+from dugong_app.persistence.state_store import StateStore
 
 
 class JsonStorage:
-    def __init__(self, path: str | Path) -> None:
+    SECTION = "dugong_state"
+
+    def __init__(self, path: str | Path, store: StateStore | None = None) -> None:
         self.path = Path(path)
+        self.store = store
 
     def load(self) -> DugongState:
+        if self.store is not None:
+            data = self.store.load(self.SECTION, legacy_path=self.path)
+            return DugongState.from_dict(data) if isinstance(data, dict) else DugongState()
         if not self.path.exists():
             return DugongState()
         try:
-            data = json.loads(self.path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
+            data = codec.loads(self.path.read_text(encoding="utf-8"))
+        except (codec.JSONDecodeError, OSError):
             return DugongState()
         return DugongState.from_dict(data)
 
     def save(self, state: DugongState) -> None:
+        if self.store is not None:
+            self.store.stage(self.SECTION, state.to_dict())
+            return
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        payload = json.dumps(state.to_dict(), ensure_ascii=True, indent=2)
+        payload = codec.dumps(state.to_dict(), indent=True)
         with NamedTemporaryFile("w", delete=False, encoding="utf-8", dir=str(self.path.parent)) as handle:
             handle.write(payload)
             handle.flush()
@@ -1,25 +1,31 @@
 from __future__ import annotations
 
-import json
 import os
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
+from dugong_app.core import codec
+from dugong_app.persistence.state_store import StateStore
+
 
 class SyncCursorStorage:
-    def __init__(self, path: str | Path) -> None:
+    SECTION = "sync_cursor"
+
+    def __init__(self, path: str | Path, store: StateStore | None = None) -> None:
         self.path = Path(path)
+        self.store = store
 
     def load(self) -> dict:
-        if not self.path.exists():
-            return {
-                "file_cursors": {},
-                "last_seen_event_id_by_source": {},
-                "last_seen_timestamp_by_source": {},
-            }
-        try:
-            payload = json.loads(self.path.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
+        if self.store is not None:
+            payload = self.store.load(self.SECTION, legacy_path=self.path)
+        elif not self.path.exists():
+            payload = None
+        else:
+            try:
+                payload = codec.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, codec.JSONDecodeError):
+                payload = None
+        if payload is None:
             return {
                 "file_cursors": {},
                 "last_seen_event_id_by_source": {},
@@ -47,14 +53,17 @@ class SyncCursorStorage:
         }
 
     def save(self, state: dict) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
         payload = {
             "version": "v2",
             "file_cursors": self._coerce_int_map(state.get("file_cursors", {})),
             "last_seen_event_id_by_source": self._coerce_str_map(state.get("last_seen_event_id_by_source", {})),
             "last_seen_timestamp_by_source": self._coerce_str_map(state.get("last_seen_timestamp_by_source", {})),
         }
-        data = json.dumps(payload, ensure_ascii=True, indent=2)
+        if self.store is not None:
+            self.store.stage(self.SECTION, payload)
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = codec.dumps(payload, indent=True)
         with NamedTemporaryFile("w", delete=False, encoding="utf-8", dir=str(self.path.parent)) as handle:
             handle.write(data)
             handle.flush()
@@ -1,9 +1,14 @@
 ﻿from __future__ import annotations
 
 from collections import defaultdict
-from datetime import date, datetime, timedelta, timezone
+from datetime import date, datetime, timezone
 
+from dugong_app.core.active_days import ActiveDayBitmap
 from dugong_app.core.events import DugongEvent
+from dugong_app.core.rollup import ROLLUP_FIELDS, add_event, empty_counts
+
+
+_DAY_FIELDS = ("date", *ROLLUP_FIELDS)
 
 
 def _safe_date(ts: str) -> str:
@@ -13,68 +18,62 @@ def _safe_date(ts: str) -> str:
         return datetime.now(tz=timezone.utc).date().isoformat()
 
 
-def _current_streak(active_days: set[str]) -> int:
-    if not active_days:
-        return 0
-    day = max(date.fromisoformat(d) for d in active_days)
-    streak = 0
-    while day.isoformat() in active_days:
-        streak += 1
-        day -= timedelta(days=1)
-    return streak
-
+def _active_bitmap(active_days: set[str], history: list[dict] | None = None) -> ActiveDayBitmap:
+    # Archived week/month records already carry a per-day mask: OR them in whole.
+    bitmap = ActiveDayBitmap()
+    for record in history or []:
+        bitmap.mark_run(date.fromisoformat(record["start"]), int(record.get("active_mask", 0)))
+    for day in active_days:
+        bitmap.mark(date.fromisoformat(day))
+    return bitmap
 
-def summarize_events(events: list[DugongEvent]) -> dict:
-    by_day: dict[str, dict] = defaultdict(
-        lambda: {
-            "focus_seconds": 0,
-            "ticks": 0,
-            "mode_changes": 0,
-            "clicks": 0,
-            "manual_pings": 0,
-        }
-    )
 
+def summarize_events(events: list[DugongEvent], history: list[dict] | None = None) -> dict:
+    by_day: dict[str, dict] = defaultdict(empty_counts)
     for event in events:
-        day = _safe_date(event.timestamp)
-        bucket = by_day[day]
-
-        if event.event_type == "daily_rollup":
-            bucket["focus_seconds"] += int(event.payload.get("focus_seconds", 0))
-            bucket["ticks"] += int(event.payload.get("ticks", 0))
-            bucket["mode_changes"] += int(event.payload.get("mode_changes", 0))
-            bucket["clicks"] += int(event.payload.get("clicks", 0))
-            bucket["manual_pings"] += int(event.payload.get("manual_pings", 0))
-        elif event.event_type == "state_tick":
-            bucket["ticks"] += 1
-            mode = event.payload.get("mode")
-            tick_seconds = int(event.payload.get("tick_seconds", 60))
-            if mode == "study":
-                bucket["focus_seconds"] += max(0, tick_seconds)
-        elif event.event_type == "mode_change":
-            bucket["mode_changes"] += 1
-        elif event.event_type == "click":
-            bucket["clicks"] += 1
-        elif event.event_type == "manual_ping":
-            bucket["manual_pings"] += 1
+        add_event(by_day[_safe_date(event.timestamp)], event.event_type, event.payload)
 
     days: list[dict] = []
     for day_key in sorted(by_day.keys()):
-        payload = by_day[day_key]
-        days.append(
-            {
-                "date": day_key,
-                "focus_seconds": payload["focus_seconds"],
-                "ticks": payload["ticks"],
-                "mode_changes": payload["mode_changes"],
-                "clicks": payload["clicks"],
-                "manual_pings": payload["manual_pings"],
-            }
-        )
+        days.append({"date": day_key, **by_day[day_key]})
+    return summarize_days(days, history)
+
 
-    active_days = {item["date"] for item in days if item["focus_seconds"] > 0}
+def summarize_days(days: list[dict], history: list[dict] | None = None) -> dict:
+    # Shared tail for per-day totals kept elsewhere (rollup sidecar, SQL GROUP BY).
+    # `history` is RollupArchive.records(): day/week/month tiers past retention.
+    history = history or []
+    tiers = [record for record in history if record.get("tier") != "day"]
+    # The archive is authoritative for anything up to its last folded day; a
+    # journal row that old is only waiting for retention to prune it.
+    folded_until = max((record["end"] for record in tiers), default="")
+    days = [{key: item[key] for key in _DAY_FIELDS} for item in days if item["date"] > folded_until]
+    live = {item["date"] for item in days}
+    days += [
+        {"date": record["start"], **{key: record[key] for key in ROLLUP_FIELDS}}
+        for record in history
+        if record.get("tier") == "day" and record["start"] not in live and record["start"] > folded_until
+    ]
+    days.sort(key=lambda item: item["date"])
+    weeks = [_tier_row(record) for record in tiers if record["tier"] == "week"]
+    months = [_tier_row(record) for record in tiers if record["tier"] == "month"]
+    totals = {key: sum(int(row[key]) for row in (*days, *weeks, *months)) for key in ROLLUP_FIELDS}
+    active = _active_bitmap({item["date"] for item in days if item["focus_seconds"] > 0}, tiers)
     return {
         "generated_at": datetime.now(tz=timezone.utc).isoformat(),
         "days": days,
-        "current_streak_days": _current_streak(active_days),
+        "weeks": weeks,
+        "months": months,
+        "totals": totals,
+        "current_streak_days": active.current_streak(),
+        "longest_streak_days": active.longest_streak(),
+    }
+
+
+def _tier_row(record: dict) -> dict:
+    return {
+        "start": record["start"],
+        "end": record["end"],
+        **{key: int(record.get(key, 0)) for key in ROLLUP_FIELDS},
+        "active_days": bin(int(record.get("active_mask", 0))).count("1"),
     }
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+
+
+class JobLane:
+    """Single worker thread over a bounded FIFO, with backpressure metrics.
+
+    Lanes isolate job kinds from each other: a network call stuck on a 15s
+    timeout only delays its own lane. When the queue is full, `block` lanes make
+    the submitter wait (used for data that must not be lost) and `drop_oldest`
+    lanes discard the oldest pending job (used for work that can be redone).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[dict], None],
+        maxsize: int = 256,
+        overflow: str = OVERFLOW_BLOCK,
+        on_error: Callable[[str, Exception], None] | None = None,
+        on_drop: Callable[[dict], None] | None = None,
+        on_idle: Callable[[], None] | None = None,
+        idle_seconds: float = 1.0,
+    ) -> None:
+        self.name = name
+        self.maxsize = max(1, int(maxsize))
+        self.overflow = overflow if overflow in {OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST} else OVERFLOW_BLOCK
+        self._handler = handler
+        self._on_error = on_error
+        self._on_drop = on_drop
+        self._on_idle = on_idle
+        self._idle_seconds = max(0.05, float(idle_seconds))
+
+        self._cond = threading.Condition()
+        self._pending: deque[tuple[float, dict]] = deque()
+        self._stopped = False
+        self._busy = False
+
+        self._submitted = 0
+        self._completed = 0
+        self._dropped = 0
+        self._blocked_submits = 0
+        self._errors = 0
+        self._max_depth = 0
+        self._last_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+        self._last_run_ms = 0.0
+        self._max_run_ms = 0.0
+
+        self._thread = threading.Thread(target=self._loop, name=f"dugong-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, job: dict) -> bool:
+        dropped: dict | None = None
+        with self._cond:
+            if self._stopped:
+                return False
+            if len(self._pending) >= self.maxsize:
+                if self.overflow == OVERFLOW_DROP_OLDEST:
+                    _queued_at, dropped = self._pending.popleft()
+                    self._dropped += 1
+                else:
+                    self._blocked_submits += 1
+                    while len(self._pending) >= self.maxsize and not self._stopped:
+                        self._cond.wait()
+                    if self._stopped:
+                        return False
+            self._pending.append((time.monotonic(), job))
+            self._submitted += 1
+            self._max_depth = max(self._max_depth, len(self._pending))
+            self._cond.notify_all()
+        if dropped is not None and self._on_drop is not None:
+            self._on_drop(dropped)
+        return True
+
+    def drain_pending(self, predicate: Callable[[dict], bool] | None = None) -> list[dict]:
+        """Take every queued job (or every job matching `predicate`) in FIFO order.
+
+        Called from inside a handler to coalesce a burst into one batch; taken
+        jobs count as completed and non-matching jobs keep their position.
+        """
+        with self._cond:
+            taken: list[dict] = []
+            kept: deque[tuple[float, dict]] = deque()
+            for queued_at, job in self._pending:
+                if predicate is None or predicate(job):
+                    taken.append(job)
+                else:
+                    kept.append((queued_at, job))
+            self._pending = kept
+            self._completed += len(taken)
+            self._cond.notify_all()
+            return taken
+
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def metrics(self) -> dict:
+        with self._cond:
+            return {
+                "depth": len(self._pending),
+                "maxsize": self.maxsize,
+                "overflow": self.overflow,
+                "busy": bool(self._busy),
+                "submitted": int(self._submitted),
+                "completed": int(self._completed),
+                "dropped": int(self._dropped),
+                "blocked_submits": int(self._blocked_submits),
+                "errors": int(self._errors),
+                "max_depth": int(self._max_depth),
+                "last_wait_ms": round(self._last_wait_ms, 3),
+                "max_wait_ms": round(self._max_wait_ms, 3),
+                "last_run_ms": round(self._last_run_ms, 3),
+                "max_run_ms": round(self._max_run_ms, 3),
+            }
+
+    def stop(self, timeout: float | None = 2.0) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout)
+
+    def _next_job(self) -> tuple[float, dict] | None:
+        with self._cond:
+            if not self._pending and not self._stopped:
+                self._cond.wait(timeout=self._idle_seconds)
+            if not self._pending:
+                return None
+            item = self._pending.popleft()
+            self._busy = True
+            self._cond.notify_all()
+            return item
+
+    def _loop(self) -> None:
+        while True:
+            item = self._next_job()
+            if item is None:
+                if self._stopped:
+                    return
+                self._run_guarded(self._on_idle, None)
+                continue
+
+            queued_at, job = item
+            started = time.monotonic()
+            self._run_guarded(self._handler, job)
+            finished = time.monotonic()
+            with self._cond:
+                self._busy = False
+                self._completed += 1
+                self._last_wait_ms = (started - queued_at) * 1000.0
+                self._max_wait_ms = max(self._max_wait_ms, self._last_wait_ms)
+                self._last_run_ms = (finished - started) * 1000.0
+                self._max_run_ms = max(self._max_run_ms, self._last_run_ms)
+
+    def _run_guarded(self, fn: Callable | None, job: dict | None) -> None:
+        if fn is None:
+            return
+        try:
+            if job is None:
+                fn()
+            else:
+                fn(job)
+        except Exception as exc:
+            with self._cond:
+                self._errors += 1
+            if self._on_error is not None:
+                self._on_error(self.name, exc)
@@ -1,66 +1,92 @@
 from __future__ import annotations
 
-import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import date, datetime, timedelta, timezone
+from contextlib import AbstractContextManager, nullcontext
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
+from dugong_app.core import codec
 from dugong_app.core.events import DugongEvent
-from dugong_app.services.daily_summary import summarize_events
+from dugong_app.core.rollup import add_event, empty_counts, merge_counts
+from dugong_app.persistence.day_rollups import ROLLUP_SIDECAR, DayRollupIndex
+from dugong_app.persistence.event_journal import EventJournal
+from dugong_app.persistence.event_journal_sqlite import SqliteEventJournal
 
+# Append-only run log: a header line with the planned files, then one line per
+# finished file. Present on start = the previous run crashed; it is resumed.
+COMPACTION_MANIFEST = "compaction_manifest.jsonl"
+_TMP_PREFIX = ".compact-"
+_TMP_SUFFIX = ".tmp"
 
-def _safe_event_from_payload(payload: dict) -> DugongEvent:
-    return DugongEvent(
-        event_type=payload.get("event_type", "unknown"),
-        timestamp=payload.get("timestamp", ""),
-        event_id=payload.get("event_id", ""),
-        source=payload.get("source", "dugong_app"),
-        schema_version=payload.get("schema_version", "v1.1"),
-        payload=payload.get("payload", {}) if isinstance(payload.get("payload", {}), dict) else {},
-    )
+
+def _safe_date(ts: str) -> str:
+    try:
+        return datetime.fromisoformat(ts).date().isoformat()
+    except ValueError:
+        return datetime.now(tz=timezone.utc).date().isoformat()
 
 
-def _read_events(file_path: Path) -> list[DugongEvent]:
-    events: list[DugongEvent] = []
+def _fold_day_file(file_path: Path, day: str) -> tuple[dict[str, int], int, set[str], bool] | None:
+    """Stream one shard into (day totals, event count, sources, already compacted).
+
+    Lines are folded as they are read, so memory does not grow with the file.
+    Returns None when the shard cannot be read.
+    """
+    totals = empty_counts()
+    event_count = 0
+    sources: set[str] = set()
+    first: dict | None = None
     try:
         with file_path.open("r", encoding="utf-8") as handle:
             for line in handle:
                 if not line.strip():
                     continue
                 try:
-                    payload = json.loads(line)
-                except json.JSONDecodeError:
+                    payload = codec.loads(line)
+                except codec.JSONDecodeError:
+                    continue
+                if not isinstance(payload, dict):
                     continue
-                if isinstance(payload, dict):
-                    events.append(_safe_event_from_payload(payload))
+                event_count += 1
+                if first is None:
+                    first = payload
+                source = str(payload.get("source", "dugong_app") or "")
+                if source:
+                    sources.add(source)
+                if _safe_date(str(payload.get("timestamp", ""))) == day:
+                    add_event(totals, str(payload.get("event_type", "unknown")), payload.get("payload", {}))
     except OSError:
-        return []
-    return events
-
-
-def _rollup_event_for_day(day: str, events: list[DugongEvent]) -> DugongEvent:
-    summary = summarize_events(events)
-    day_payload = next((d for d in summary.get("days", []) if d.get("date") == day), None)
-    if day_payload is None:
-        day_payload = {
-            "focus_seconds": 0,
-            "ticks": 0,
-            "mode_changes": 0,
-            "clicks": 0,
-            "manual_pings": 0,
-        }
-
-    source_candidates = {e.source for e in events if e.source}
-    rolled_up_source = source_candidates.pop() if len(source_candidates) == 1 else "mixed"
+        return None
+    return totals, event_count, sources, event_count == 1 and _is_already_compacted(day, first or {})
+
+
+def _compact_day_file(path: str, day: str, dry_run: bool) -> dict | None:
+    # Module-level so a process pool can run it; returns None when nothing to do.
+    file_path = Path(path)
+    folded = _fold_day_file(file_path, day)
+    if folded is None:
+        return None
+    totals, event_count, sources, compacted = folded
+    if event_count == 0 or compacted:
+        return None
+    rollup = _rollup_event(day, totals, event_count, sources)
+    size = 0 if dry_run else _write_single_event(file_path, rollup)
+    return {"file": file_path.name, "day": day, "event_count": event_count, "size": size, "rollup": rollup}
+
+
+def _rollup_event(day: str, totals: dict, event_count: int, sources: set[str]) -> DugongEvent:
+    rolled_up_source = next(iter(sources)) if len(sources) == 1 else "mixed"
     payload = {
         "date": day,
-        "focus_seconds": int(day_payload.get("focus_seconds", 0)),
-        "ticks": int(day_payload.get("ticks", 0)),
-        "mode_changes": int(day_payload.get("mode_changes", 0)),
-        "clicks": int(day_payload.get("clicks", 0)),
-        "manual_pings": int(day_payload.get("manual_pings", 0)),
-        "rolled_up_event_count": len(events),
+        "focus_seconds": int(totals.get("focus_seconds", 0)),
+        "ticks": int(totals.get("ticks", 0)),
+        "mode_changes": int(totals.get("mode_changes", 0)),
+        "clicks": int(totals.get("clicks", 0)),
+        "manual_pings": int(totals.get("manual_pings", 0)),
+        "rolled_up_event_count": int(event_count),
         "rolled_up_from_dates": [day],
         "rolled_up_source": rolled_up_source,
         "rollup_version": "v1",
@@ -76,27 +102,87 @@ def _rollup_event_for_day(day: str, events: list[DugongEvent]) -> DugongEvent:
     )
 
 
-def _write_single_event(file_path: Path, event: DugongEvent) -> None:
-    line = json.dumps(event.to_dict(), ensure_ascii=True) + "\n"
-    with NamedTemporaryFile("w", delete=False, encoding="utf-8", dir=str(file_path.parent)) as handle:
+def _promoted_rollup(day: str, counted: dict[str, dict[str, dict[str, int]]]) -> DugongEvent | None:
+    # Build the rollup from write-time counters; None if empty or already a rollup.
+    sources = {source for by_source in counted.values() for source in by_source if source}
+    event_count = sum(int(c.get("event_count", 0)) for by_source in counted.values() for c in by_source.values())
+    if event_count == 0 or (event_count == 1 and sources == {"dugong_rollup"}):
+        return None
+    totals = empty_counts()
+    for counts in counted.get(day, {}).values():
+        merge_counts(totals, counts)
+    return _rollup_event(day, totals, event_count, sources)
+
+
+def _write_single_event(file_path: Path, event: DugongEvent) -> int:
+    line = codec.dumps(event.to_dict()) + "\n"
+    with NamedTemporaryFile(
+        "w", delete=False, encoding="utf-8", dir=str(file_path.parent), prefix=_TMP_PREFIX, suffix=_TMP_SUFFIX
+    ) as handle:
         handle.write(line)
         handle.flush()
         os.fsync(handle.fileno())
         tmp_path = Path(handle.name)
     os.replace(tmp_path, file_path)
+    return len(line.encode("utf-8"))
 
 
-def compact_daily_journal(journal_dir: Path, keep_days: int = 7, dry_run: bool = False) -> dict[str, int]:
+def _recover_interrupted_run(journal_dir: Path) -> set[str] | None:
+    """Clean up after a crashed run; returns the files it had finished, None if none crashed."""
+    manifest_path = journal_dir / COMPACTION_MANIFEST
+    for leftover in journal_dir.glob(f"{_TMP_PREFIX}*{_TMP_SUFFIX}"):
+        leftover.unlink(missing_ok=True)
+    if not manifest_path.exists():
+        return None
+    done: set[str] = set()
+    try:
+        with manifest_path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = codec.loads(line)
+                except codec.JSONDecodeError:
+                    continue  # torn last line
+                if isinstance(record, dict) and record.get("done"):
+                    done.add(str(record["done"]))
+    except OSError:
+        pass
+    return done
+
+
+def compact_daily_journal(
+    journal_dir: Path,
+    keep_days: int = 7,
+    dry_run: bool = False,
+    workers: int = 1,
+    shard_lock: AbstractContextManager | None = None,
+    throttle_seconds: float = 0.0,
+) -> dict[str, int]:
+    """Roll up shards older than `keep_days` into one daily_rollup line each.
+
+    Days whose write-time counters are current are promoted without reading
+    the shard; the rest are streamed (in `workers` processes when > 1; 0 means
+    one per CPU). Every shard swap is an atomic replace and progress is logged
+    to COMPACTION_MANIFEST, so a crashed run is picked up where it stopped.
+
+    A live journal passes its write lock as `shard_lock`: each shard is then
+    read and swapped while holding it (and the run stays serial), and
+    `throttle_seconds` of sleep between shards keeps the disk free for it.
+    """
     keep_days = max(1, int(keep_days))
     journal_dir = Path(journal_dir)
     if not journal_dir.exists():
-        return {"scanned_days": 0, "compacted_days": 0, "saved_lines": 0}
+        return {"scanned_days": 0, "compacted_days": 0, "saved_lines": 0, "resumed": 0}
 
     cutoff = datetime.now(tz=timezone.utc).date() - timedelta(days=keep_days - 1)
+    interrupted = None if dry_run else _recover_interrupted_run(journal_dir)
+    finished = interrupted or set()
+    rollups = DayRollupIndex(journal_dir / ROLLUP_SIDECAR)
     scanned_days = 0
     compacted_days = 0
     saved_lines = 0
 
+    promoted: list[tuple[Path, str, DugongEvent]] = []
+    to_stream: list[tuple[Path, str]] = []
     for file_path in sorted(journal_dir.glob("*.jsonl")):
         try:
             day = date.fromisoformat(file_path.stem)
@@ -104,36 +190,141 @@ def compact_daily_journal(journal_dir: Path, keep_days: int = 7, dry_run: bool =
             continue
         if day >= cutoff:
             continue
-
         scanned_days += 1
-        events = _read_events(file_path)
-        if not events:
+        if file_path.name in finished:
             continue
-        if _is_already_compacted(day.isoformat(), events):
+        counted = rollups.entry(file_path)
+        if counted is None:
+            to_stream.append((file_path, day.isoformat()))
             continue
+        # The journal kept this day's counters current: promote them as-is.
+        rollup = _promoted_rollup(day.isoformat(), counted)
+        if rollup is not None:
+            promoted.append((file_path, day.isoformat(), rollup))
 
-        rollup = _rollup_event_for_day(day.isoformat(), events)
-        if not dry_run:
-            _write_single_event(file_path, rollup)
+    manifest = None
+    if not dry_run and (promoted or to_stream):
+        manifest = (journal_dir / COMPACTION_MANIFEST).open("a", encoding="utf-8")
+        planned = [p.name for p, _d, _r in promoted] + [p.name for p, _d in to_stream]
+        manifest.write(codec.dumps({"started_at": datetime.now(tz=timezone.utc).isoformat(), "planned": planned}) + "\n")
+        manifest.flush()
+        os.fsync(manifest.fileno())
 
+    def _finish(result: dict) -> None:
+        nonlocal compacted_days, saved_lines
         compacted_days += 1
-        saved_lines += max(0, len(events) - 1)
+        saved_lines += max(0, int(result["event_count"]) - 1)
+        if manifest is None:
+            return
+        rollup: DugongEvent = result["rollup"]
+        rollup_counts = empty_counts()
+        add_event(rollup_counts, rollup.event_type, rollup.payload)
+        rollups.set_file(result["file"], result["size"], {result["day"]: {rollup.source: rollup_counts}})
+        manifest.write(codec.dumps({"done": result["file"]}) + "\n")
+        manifest.flush()
+
+    guard = shard_lock if shard_lock is not None else nullcontext()
+    try:
+        for file_path, day_key, rollup in promoted:
+            with guard:
+                if rollups.entry(file_path) is None:
+                    # Appended to since it was planned: the counters are stale.
+                    result = _compact_day_file(str(file_path), day_key, dry_run)
+                else:
+                    size = 0 if dry_run else _write_single_event(file_path, rollup)
+                    event_count = int(rollup.payload["rolled_up_event_count"])
+                    result = {"file": file_path.name, "day": day_key, "event_count": event_count, "size": size, "rollup": rollup}
+            if result is not None:
+                _finish(result)
+            if throttle_seconds > 0:
+                time.sleep(throttle_seconds)
+
+        pool_size = (os.cpu_count() or 1) if int(workers) == 0 else max(1, int(workers))
+        if shard_lock is None and pool_size > 1 and len(to_stream) > 1:
+            with ProcessPoolExecutor(max_workers=min(pool_size, len(to_stream))) as pool:
+                futures = [pool.submit(_compact_day_file, str(p), d, dry_run) for p, d in to_stream]
+                for future in as_completed(futures):
+                    result = future.result()
+                    if result is not None:
+                        _finish(result)
+        else:
+            for file_path, day_key in to_stream:
+                with guard:
+                    result = _compact_day_file(str(file_path), day_key, dry_run)
+                if result is not None:
+                    _finish(result)
+                if throttle_seconds > 0:
+                    time.sleep(throttle_seconds)
+    finally:
+        if manifest is not None:
+            rollups.save()
+            manifest.close()
+    if manifest is not None:
+        # Clean finish: no manifest means nothing to resume.
+        (journal_dir / COMPACTION_MANIFEST).unlink(missing_ok=True)
 
     return {
         "scanned_days": scanned_days,
         "compacted_days": compacted_days,
         "saved_lines": saved_lines,
+        "resumed": int(interrupted is not None),
     }
 
 
-def _is_already_compacted(day: str, events: list[DugongEvent]) -> bool:
-    if len(events) != 1:
-        return False
-    event = events[0]
-    if event.event_type != "daily_rollup":
+def compact_sqlite_journal(journal: SqliteEventJournal, keep_days: int = 7, dry_run: bool = False) -> dict[str, int]:
+    """`compact_daily_journal` for the SQLite backend: totals come from one GROUP BY."""
+    keep_days = max(1, int(keep_days))
+    cutoff = datetime.now(tz=timezone.utc).date() - timedelta(days=keep_days - 1)
+    scanned_days = 0
+    compacted_days = 0
+    saved_lines = 0
+    for totals in journal.day_totals(before_day=cutoff.isoformat()):
+        scanned_days += 1
+        day = str(totals["date"])
+        if journal.day_is_rollup(day):
+            continue
+        rollup = _rollup_event(day, totals, totals["event_count"], set(totals["sources"]))
+        if not dry_run:
+            journal.replace_day(day, rollup)
+        compacted_days += 1
+        saved_lines += max(0, int(totals["event_count"]) - 1)
+    return {
+        "scanned_days": scanned_days,
+        "compacted_days": compacted_days,
+        "saved_lines": saved_lines,
+    }
+
+
+def compaction_backlog(journal: EventJournal | SqliteEventJournal, keep_days: int = 7) -> dict[str, int]:
+    """What a compaction run would work on: days, raw lines and (JSONL) bytes past `keep_days`.
+
+    `lines` counts the lines compaction would drop, so a fully compacted
+    journal reports 0. Read from the per-day counters; no raw reads.
+    """
+    keep_days = max(1, int(keep_days))
+    cutoff = (datetime.now(tz=timezone.utc).date() - timedelta(days=keep_days - 1)).isoformat()
+    rows = journal.day_totals(before_day=cutoff)
+    backlog = {
+        "days": len(rows),
+        "lines": sum(max(0, int(row.get("event_count", 0)) - 1) for row in rows),
+        "bytes": 0,
+    }
+    if isinstance(journal, EventJournal) and journal.dir_path.exists():
+        for file_path in journal.dir_path.glob("*.jsonl"):
+            if file_path.stem < cutoff:
+                try:
+                    backlog["bytes"] += file_path.stat().st_size
+                except OSError:
+                    continue
+    return backlog
+
+
+def _is_already_compacted(day: str, payload: dict) -> bool:
+    if payload.get("event_type") != "daily_rollup":
         return False
-    payload = event.payload if isinstance(event.payload, dict) else {}
-    dates = payload.get("rolled_up_from_dates", [])
+    inner = payload.get("payload", {})
+    inner = inner if isinstance(inner, dict) else {}
+    dates = inner.get("rolled_up_from_dates", [])
     if not isinstance(dates, list):
         return False
-    return payload.get("compaction_version") == "v1" and day in {str(d) for d in dates}
+    return inner.get("compaction_version") == "v1" and day in {str(d) for d in dates}
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import time
+from collections.abc import Iterable
 from dataclasses import dataclass
 from typing import Callable
 from uuid import uuid4
@@ -22,6 +23,51 @@ class PomodoroView:
     break_minutes: int
 
 
+_IDLE_SNAPSHOT = {
+    "state": POMO_IDLE,
+    "phase": "",
+    "session_id": "",
+    "phase_duration_s": 0,
+    "remaining_s": 0,
+    "ends_at_wall": 0.0,
+}
+
+
+def fold_pomo_event(snapshot: dict, event_type: str, payload: dict, at_wall: float) -> dict:
+    """Apply one journaled pomo_* event (emitted at wall time `at_wall`) to a snapshot dict."""
+    session_id = str(payload.get("session_id", ""))
+    if event_type == "pomo_start":
+        phase = str(payload.get("phase", "")).lower()
+        if phase not in {"focus", "break"}:
+            return snapshot
+        duration_s = max(1, int(payload.get("duration_s", 0) or 1))
+        return {
+            **snapshot,
+            "state": POMO_FOCUS if phase == "focus" else POMO_BREAK,
+            "phase": phase,
+            "session_id": session_id,
+            "phase_duration_s": duration_s,
+            "remaining_s": 0,
+            "ends_at_wall": at_wall + duration_s,
+        }
+    if not session_id or session_id != snapshot.get("session_id"):
+        return snapshot
+    if event_type == "pomo_pause":
+        remaining_s = int(payload.get("remaining_s", 0))
+        return {**snapshot, "state": POMO_PAUSED, "remaining_s": remaining_s, "ends_at_wall": 0.0}
+    if event_type == "pomo_resume":
+        phase = str(snapshot.get("phase", ""))
+        return {
+            **snapshot,
+            "state": POMO_FOCUS if phase == "focus" else POMO_BREAK,
+            "remaining_s": 0,
+            "ends_at_wall": at_wall + max(1, int(payload.get("remaining_s", 0))),
+        }
+    if event_type in {"pomo_complete", "pomo_skip"}:
+        return {**snapshot, **_IDLE_SNAPSHOT}
+    return snapshot
+
+
 class PomodoroService:
     def __init__(
         self,
@@ -113,6 +159,16 @@ class PomodoroService:
         self._ends_at_mono = 0.0
         self._ends_at_wall = 0.0
 
+    def replay(self, events: Iterable[tuple[str, dict, float]]) -> None:
+        """Fold (event_type, payload, wall time) records journaled after the restored snapshot.
+
+        Ends in `restore`, so a phase still running at the last event comes back paused.
+        """
+        payload = self.snapshot()
+        for event_type, event_payload, at_wall in events:
+            payload = fold_pomo_event(payload, event_type, event_payload, at_wall)
+        self.restore(payload)
+
     def _start_phase(self, phase: str, duration_s: int) -> dict:
         now_mono = self._mono_now()
         now_wall = self._wall_now()
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections.abc import Callable
+
+from dugong_app.core import codec
+
+# Fields that change on every snapshot without changing what peers render.
+VOLATILE_PRESENCE_FIELDS = frozenset({"last_heartbeat", "last_event_id", "reason"})
+
+
+def presence_digest(snapshot: dict) -> str:
+    stable = {key: value for key, value in snapshot.items() if key not in VOLATILE_PRESENCE_FIELDS}
+    return hashlib.sha1(codec.dumps(stable, compact=True).encode("utf-8")).hexdigest()
+
+
+class PresencePublisher:
+    """Debounce + content-hash guard in front of `transport.update_presence`.
+
+    A snapshot is written when it is forced (presence_bye), when its stable
+    content changed and `min_interval_seconds` has passed since the last write,
+    or when `keepalive_seconds` passed so peers keep seeing a fresh heartbeat.
+    Changed snapshots suppressed by the interval stay pending until `flush()`.
+    """
+
+    def __init__(
+        self,
+        min_interval_seconds: float = 10.0,
+        keepalive_seconds: float = 30.0,
+        monotonic_now: Callable[[], float] | None = None,
+    ) -> None:
+        self.min_interval_seconds = max(0.0, float(min_interval_seconds))
+        self.keepalive_seconds = max(self.min_interval_seconds, float(keepalive_seconds))
+        self._mono_now = monotonic_now or time.monotonic
+        self._lock = threading.Lock()
+        self._last_digest = ""
+        self._last_publish_monotonic: float | None = None
+        self._pending = False
+        self._counters = {
+            "published": 0,
+            "forced": 0,
+            "suppressed_unchanged": 0,
+            "suppressed_interval": 0,
+            "failed": 0,
+        }
+
+    def publish(self, snapshot: dict, send: Callable[[dict], None], force: bool = False) -> bool:
+        digest = presence_digest(snapshot)
+        now = self._mono_now()
+        with self._lock:
+            if not force and self._last_publish_monotonic is not None:
+                elapsed = now - self._last_publish_monotonic
+                if digest == self._last_digest and elapsed < self.keepalive_seconds:
+                    self._counters["suppressed_unchanged"] += 1
+                    return False
+                if elapsed < self.min_interval_seconds:
+                    self._counters["suppressed_interval"] += 1
+                    self._pending = True
+                    return False
+
+        try:
+            send(snapshot)
+        except Exception:
+            with self._lock:
+                self._counters["failed"] += 1
+                self._pending = True
+            return False
+
+        with self._lock:
+            self._last_digest = digest
+            self._last_publish_monotonic = now
+            self._pending = False
+            self._counters["published"] += 1
+            if force:
+                self._counters["forced"] += 1
+        return True
+
+    def has_pending(self) -> bool:
+        with self._lock:
+            return self._pending
+
+    def due_for_keepalive(self) -> bool:
+        with self._lock:
+            if self._last_publish_monotonic is None:
+                return True
+            return (self._mono_now() - self._last_publish_monotonic) >= self.keepalive_seconds
+
+    def metrics(self) -> dict:
+        with self._lock:
+            payload = dict(self._counters)
+            payload["pending"] = bool(self._pending)
+            payload["min_interval_seconds"] = self.min_interval_seconds
+            payload["keepalive_seconds"] = self.keepalive_seconds
+            return payload
+
+
+def _default_presence_entry(source: str) -> dict:
+    return {
+        "source": source,
+        "mode": "unknown",
+        "last_seen": 0.0,
+        "event_type": "",
+        "event_id": "",
+        "pomo_phase": "",
+        "pomo_session_id": "",
+        "pearls": 0,
+        "today_pearls": 0,
+        "lifetime_pearls": 0,
+        "focus_streak": 0,
+        "day_streak": 0,
+        "exp": 0,
+        "today_exp": 0,
+        "lifetime_exp": 0,
+        "level": 1,
+        "exp_in_level": 0,
+        "exp_to_next": 50,
+        "title_id": "drifter",
+        "skin_id": "default",
+        "bubble_style": "default",
+        "online": 1.0,
+        "heartbeat_at": 0.0,
+        "instance_id": "",
+    }
+
+
+class PresenceTable:
+    """In-memory last-value-wins presence per remote source, with TTL expiry.
+
+    Presence is ephemeral: nothing here is journaled. A source counts as online
+    while its latest heartbeat/activity is younger than `ttl_seconds` and it has
+    not said bye; entries older than `expire_after_seconds` are dropped.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 90.0,
+        expire_after_seconds: float | None = None,
+        wall_now: Callable[[], float] | None = None,
+    ) -> None:
+        self.ttl_seconds = max(1.0, float(ttl_seconds))
+        self.expire_after_seconds = max(
+            self.ttl_seconds, float(expire_after_seconds) if expire_after_seconds is not None else self.ttl_seconds * 10
+        )
+        self._wall_now = wall_now or time.time
+        self._entries: dict[str, dict] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, source: object) -> bool:
+        return source in self._entries
+
+    def get(self, source: str, default: dict | None = None) -> dict | None:
+        return self._entries.get(source, default)
+
+    def entry(self, source: str) -> dict:
+        """Mutable entry for `source`, created with defaults on first sight."""
+        entry = self._entries.get(source)
+        if entry is None:
+            entry = _default_presence_entry(source)
+            self._entries[source] = entry
+        return entry
+
+    def items(self) -> list[tuple[str, dict]]:
+        return list(self._entries.items())
+
+    def values(self) -> list[dict]:
+        return list(self._entries.values())
+
+    def last_activity(self, source: str) -> float:
+        entry = self._entries.get(source)
+        if entry is None:
+            return 0.0
+        return max(float(entry.get("heartbeat_at", 0.0)), float(entry.get("last_seen", 0.0)))
+
+    def is_online(self, entry: dict, now: float | None = None) -> bool:
+        if float(entry.get("online", 1.0)) <= 0.0:
+            return False
+        ts = max(float(entry.get("heartbeat_at", 0.0)), float(entry.get("last_seen", 0.0)))
+        if ts <= 0:
+            return True
+        now_ts = now if now is not None else self._wall_now()
+        return (now_ts - ts) <= self.ttl_seconds
+
+    def online_items(self, now: float | None = None) -> list[tuple[str, dict]]:
+        now_ts = now if now is not None else self._wall_now()
+        return [(src, entry) for src, entry in self._entries.items() if self.is_online(entry, now_ts)]
+
+    def expire(self, now: float | None = None) -> int:
+        now_ts = now if now is not None else self._wall_now()
+        stale = [
+            src
+            for src in self._entries
+            if 0.0 < self.last_activity(src) and (now_ts - self.last_activity(src)) > self.expire_after_seconds
+        ]
+        for src in stale:
+            del self._entries[src]
+        return len(stale)
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
+
+from dugong_app.core.active_days import ActiveDayBitmap
+from dugong_app.core.bounded_set import BoundedOrderedSet
+from dugong_app.core.levels import exp_required_for_level, level_for_exp, total_exp_for_level
 
 
 @dataclass
@@ -18,6 +22,11 @@ class RewardGrant:
 
 
 class RewardService:
+    # Progress entries only live while their session runs; this caps leftovers
+    # from sessions that ended without a completion or skip.
+    MAX_PROGRESS_SESSIONS = 32
+    LEDGERS = ("granted_sessions", "granted_cofocus_milestones")
+
     def __init__(
         self,
         base_pearls: int = 10,
@@ -44,9 +53,11 @@ class RewardService:
         self.focus_streak = 0
         self.day_streak = 0
         self.last_focus_day = ""
-        self.granted_sessions: list[str] = []
+        # Days with a granted focus session; day_streak is read off it.
+        self.focus_days = ActiveDayBitmap()
+        self.granted_sessions = BoundedOrderedSet(self.max_granted_sessions)
         self.focus_progress_awarded_steps: dict[str, int] = {}
-        self.granted_cofocus_milestones: list[str] = []
+        self.granted_cofocus_milestones = BoundedOrderedSet(self.max_granted_sessions)
         self.cofocus_seconds_total = 0
         self.shop_owned_skins: list[str] = ["default"]
         self.shop_owned_bubbles: list[str] = ["default"]
@@ -55,21 +66,24 @@ class RewardService:
         self.equipped_bubble_style = "default"
         self.equipped_title_id = "drifter"
 
-    def _ensure_today_bucket(self) -> None:
+    def _ensure_today_bucket(self, day: str = "") -> bool:
+        """Roll the today_* counters over; True if a gain on `day` (default now) counts for today."""
         today = datetime.now(tz=timezone.utc).date().isoformat()
         if self.today_date != today:
             self.today_date = today
             self.today_pearls = 0
             self.today_exp = 0
+        return not day or day == self.today_date
 
-    def _add_pearls(self, amount: int) -> None:
+    def _add_pearls(self, amount: int, day: str = "") -> None:
         gain = max(0, int(amount))
         if gain <= 0:
             return
-        self._ensure_today_bucket()
+        in_today = self._ensure_today_bucket(day)
         self.pearls += gain
         self.lifetime_pearls += gain
-        self.today_pearls += gain
+        if in_today:
+            self.today_pearls += gain
 
     def _tiered_focus_reward(self) -> tuple[int, int]:
         # Non-linear reward tiers for stronger psychological feedback:
@@ -94,38 +108,37 @@ class RewardService:
         return self.base_focus_exp + bonus
 
     def _exp_required_for_level(self, level: int) -> int:
-        lvl = max(1, int(level))
-        return 50 + ((lvl - 1) * 20)
+        return exp_required_for_level(level)
 
     def _recompute_level(self) -> None:
-        remaining = max(0, int(self.exp))
-        level = 1
-        while True:
-            need = self._exp_required_for_level(level)
-            if remaining < need:
-                break
-            remaining -= need
-            level += 1
-        self.level = level
-        self.exp_in_level = remaining
+        # Closed form: runs on every exp gain, including per-minute focus progress.
+        self.level, self.exp_in_level = level_for_exp(self.exp)
 
     def exp_to_next_level(self) -> int:
         return self._exp_required_for_level(self.level)
 
-    def _add_exp(self, amount: int) -> tuple[int, int]:
+    def progress_to_level(self, level: int) -> tuple[int, int]:
+        """(exp earned, exp needed) from the start of the current level to `level`; (0, 0) once reached."""
+        needed = max(0, total_exp_for_level(level) - total_exp_for_level(self.level))
+        return min(self.exp_in_level, needed), needed
+
+    def _add_exp(self, amount: int, day: str = "") -> tuple[int, int]:
         gain = max(0, int(amount))
         if gain <= 0:
             return 0, 0
-        self._ensure_today_bucket()
+        in_today = self._ensure_today_bucket(day)
         prev_level = self.level
         self.exp += gain
         self.lifetime_exp += gain
-        self.today_exp += gain
+        if in_today:
+            self.today_exp += gain
         self._recompute_level()
         return gain, max(0, int(self.level - prev_level))
 
-    def snapshot(self) -> dict:
-        return {
+    def snapshot(self, include_ledgers: bool = True) -> dict:
+        """Full state; with include_ledgers=False the dedupe sets are left to
+        `drain_ledger_chunks` and only their chunk ranges are included."""
+        payload = {
             "pearls": int(self.pearls),
             "lifetime_pearls": int(self.lifetime_pearls),
             "today_pearls": int(self.today_pearls),
@@ -139,9 +152,9 @@ class RewardService:
             "focus_streak": int(self.focus_streak),
             "day_streak": int(self.day_streak),
             "last_focus_day": self.last_focus_day,
-            "granted_sessions": list(self.granted_sessions),
+            "longest_day_streak": int(self.focus_days.longest_streak()),
+            "focus_days": self.focus_days.to_dict(),
             "focus_progress_awarded_steps": dict(self.focus_progress_awarded_steps),
-            "granted_cofocus_milestones": list(self.granted_cofocus_milestones),
             "cofocus_seconds_total": int(self.cofocus_seconds_total),
             "shop_owned_skins": list(self.shop_owned_skins),
             "shop_owned_bubbles": list(self.shop_owned_bubbles),
@@ -154,6 +167,17 @@ class RewardService:
             "cofocus_exp": int(self.cofocus_exp),
             "valid_ratio": float(self.valid_ratio),
         }
+        if include_ledgers:
+            for name in self.LEDGERS:
+                payload[name] = list(getattr(self, name))
+        else:
+            ranges = {name: getattr(self, name).chunk_range() for name in self.LEDGERS}
+            payload["ledgers"] = {name: list(span) for name, span in ranges.items() if span is not None}
+        return payload
+
+    def drain_ledger_chunks(self) -> dict[str, dict[int, list[str]]]:
+        """Dedupe-set chunks changed since the last call, for incremental saves."""
+        return {name: getattr(self, name).drain_dirty_chunks() for name in self.LEDGERS}
 
     def restore(self, payload: dict) -> None:
         if not isinstance(payload, dict):
@@ -169,10 +193,28 @@ class RewardService:
         self.focus_streak = max(0, int(payload.get("focus_streak", self.focus_streak)))
         self.day_streak = max(0, int(payload.get("day_streak", self.day_streak)))
         self.last_focus_day = str(payload.get("last_focus_day", self.last_focus_day))
-        sessions = payload.get("granted_sessions", [])
-        if isinstance(sessions, list):
-            self.granted_sessions = [str(s) for s in sessions if str(s).strip()]
-        self.granted_sessions = self.granted_sessions[-self.max_granted_sessions :]
+        self.focus_days = ActiveDayBitmap.from_dict(payload.get("focus_days"))
+        if self.focus_days.start is None and self.last_focus_day and self.day_streak > 0:
+            # State from before the bitmap: the streak is the only history there is.
+            try:
+                last = date.fromisoformat(self.last_focus_day)
+                self.focus_days.mark_run(last - timedelta(days=self.day_streak - 1), (1 << self.day_streak) - 1)
+            except ValueError:
+                pass
+        ledger_chunks = payload.get("ledger_chunks", {})
+        ledger_chunks = ledger_chunks if isinstance(ledger_chunks, dict) else {}
+        for name in self.LEDGERS:
+            chunks = ledger_chunks.get(name)
+            if isinstance(chunks, dict):
+                setattr(self, name, BoundedOrderedSet.from_chunks(self.max_granted_sessions, chunks))
+                continue
+            items = payload.get(name, [])
+            if isinstance(items, list):
+                setattr(
+                    self,
+                    name,
+                    BoundedOrderedSet(self.max_granted_sessions, (str(s) for s in items if str(s).strip())),
+                )
         progress_steps_raw = payload.get("focus_progress_awarded_steps", {})
         if isinstance(progress_steps_raw, dict):
             clean: dict[str, int] = {}
@@ -181,14 +223,8 @@ class RewardService:
                 if not sid:
                     continue
                 clean[sid] = max(0, int(value))
-            if len(clean) > self.max_granted_sessions:
-                items = list(clean.items())[-self.max_granted_sessions :]
-                clean = dict(items)
             self.focus_progress_awarded_steps = clean
-        milestones = payload.get("granted_cofocus_milestones", [])
-        if isinstance(milestones, list):
-            self.granted_cofocus_milestones = [str(s) for s in milestones if str(s).strip()]
-        self.granted_cofocus_milestones = self.granted_cofocus_milestones[-self.max_granted_sessions :]
+            self._trim_progress()
         self.cofocus_seconds_total = max(0, int(payload.get("cofocus_seconds_total", self.cofocus_seconds_total)))
         skins = payload.get("shop_owned_skins", [])
         bubbles = payload.get("shop_owned_bubbles", [])
@@ -215,23 +251,13 @@ class RewardService:
         self._recompute_level()
 
     def _mark_day_streak(self, today: str) -> None:
-        if not self.last_focus_day:
-            self.day_streak = 1
-            self.last_focus_day = today
-            return
-        if self.last_focus_day == today:
-            return
         try:
-            prev_day = datetime.fromisoformat(self.last_focus_day).date()
-            cur_day = datetime.fromisoformat(today).date()
-            if cur_day == (prev_day + timedelta(days=1)):
-                self.day_streak += 1
-            else:
-                self.day_streak = 1
-            self.last_focus_day = today
+            day = date.fromisoformat(today)
         except ValueError:
-            self.day_streak = 1
-            self.last_focus_day = today
+            return
+        self.focus_days.mark(day)
+        self.day_streak = self.focus_days.current_streak()
+        self.last_focus_day = today
 
     def on_skip(self, from_phase: str, session_id: str = "") -> None:
         if from_phase == "focus":
@@ -247,6 +273,7 @@ class RewardService:
         start_after_s: int = 60,
         step_s: int = 60,
         exp_per_step: int = 1,
+        day: str = "",
     ) -> tuple[int, int]:
         sid = str(session_id).strip()
         if not sid:
@@ -265,14 +292,17 @@ class RewardService:
         if delta_steps <= 0:
             return 0, 0
         gain_raw = delta_steps * per_step
-        gain, levels_gained = self._add_exp(gain_raw)
+        gain, levels_gained = self._add_exp(gain_raw, day)
         self.focus_progress_awarded_steps[sid] = awarded_steps + delta_steps
-        if len(self.focus_progress_awarded_steps) > self.max_granted_sessions:
-            items = list(self.focus_progress_awarded_steps.items())[-self.max_granted_sessions :]
-            self.focus_progress_awarded_steps = dict(items)
+        self._trim_progress()
         return gain, levels_gained
 
-    def grant_for_completion(self, payload: dict) -> RewardGrant | None:
+    def _trim_progress(self) -> None:
+        progress = self.focus_progress_awarded_steps
+        while len(progress) > self.MAX_PROGRESS_SESSIONS:
+            del progress[next(iter(progress))]
+
+    def grant_for_completion(self, payload: dict, day: str = "") -> RewardGrant | None:
         phase = str(payload.get("phase", "")).lower()
         if phase != "focus":
             return None
@@ -293,15 +323,12 @@ class RewardService:
         self.focus_streak += 1
         pearls, streak_bonus = self._tiered_focus_reward()
         exp_gain_raw = self._tiered_focus_exp()
-        self._add_pearls(pearls)
-        exp_gain, levels_gained = self._add_exp(exp_gain_raw)
+        self._add_pearls(pearls, day)
+        exp_gain, levels_gained = self._add_exp(exp_gain_raw, day)
 
-        today = datetime.now(tz=timezone.utc).date().isoformat()
-        self._mark_day_streak(today)
+        self._mark_day_streak(day or datetime.now(tz=timezone.utc).date().isoformat())
 
-        self.granted_sessions.append(session_id)
-        if len(self.granted_sessions) > self.max_granted_sessions:
-            self.granted_sessions = self.granted_sessions[-self.max_granted_sessions :]
+        self.granted_sessions.add(session_id)
 
         return RewardGrant(
             pearls=pearls,
@@ -315,18 +342,16 @@ class RewardService:
             levels_gained=levels_gained,
         )
 
-    def grant_for_cofocus(self, milestone_id: str, pearls: int = 5) -> RewardGrant | None:
+    def grant_for_cofocus(self, milestone_id: str, pearls: int = 5, day: str = "") -> RewardGrant | None:
         mid = str(milestone_id).strip()
         if not mid:
             return None
         if mid in self.granted_cofocus_milestones:
             return None
         gain = max(1, int(pearls))
-        self._add_pearls(gain)
-        exp_gain, levels_gained = self._add_exp(self.cofocus_exp)
-        self.granted_cofocus_milestones.append(mid)
-        if len(self.granted_cofocus_milestones) > self.max_granted_sessions:
-            self.granted_cofocus_milestones = self.granted_cofocus_milestones[-self.max_granted_sessions :]
+        self._add_pearls(gain, day)
+        exp_gain, levels_gained = self._add_exp(self.cofocus_exp, day)
+        self.granted_cofocus_milestones.add(mid)
         return RewardGrant(
             pearls=gain,
             exp=exp_gain,
@@ -339,6 +364,40 @@ class RewardService:
             levels_gained=levels_gained,
         )
 
+    def apply_event(self, event_type: str, payload: dict, day: str, cofocus_pearls: int = 5) -> None:
+        """Re-apply one journaled own-source event on top of a restored snapshot.
+
+        Grants are recomputed through the live methods rather than read back
+        from reward_grant events, which are journaled ahead of their cause.
+        """
+        session_id = str(payload.get("session_id", "")).strip()
+        if event_type == "pomo_complete":
+            if str(payload.get("phase", "")).lower() != "focus" or session_id in self.granted_sessions:
+                return
+            # Per-minute progress exp is not journaled; completed_s re-derives it.
+            self.grant_focus_progress(session_id, int(payload.get("completed_s", 0)), day=day)
+            self.grant_for_completion(payload, day=day)
+        elif event_type == "pomo_skip":
+            from_phase = str(payload.get("from_phase", ""))
+            if from_phase == "focus":
+                self.grant_focus_progress(session_id, int(payload.get("completed_s", 0)), day=day)
+            self.on_skip(from_phase, session_id=session_id)
+        elif event_type == "co_focus_milestone":
+            total = max(0, int(payload.get("total_cofocus_seconds", 0)))
+            self.cofocus_seconds_total = max(self.cofocus_seconds_total, total)
+            self.grant_for_cofocus(str(payload.get("milestone_id", "")), pearls=cofocus_pearls, day=day)
+
+    def forget_event(self, event_type: str, payload: dict) -> None:
+        """Drop the dedupe mark `apply_event` would check, so the event can be re-applied.
+
+        For a snapshot older than its ledgers (a previous generation restored
+        over the current chunks).
+        """
+        if event_type == "pomo_complete":
+            self.granted_sessions.discard(str(payload.get("session_id", "")).strip())
+        elif event_type == "co_focus_milestone":
+            self.granted_cofocus_milestones.discard(str(payload.get("milestone_id", "")).strip())
+
     def buy_shop_item(self, item_kind: str, item_id: str, price: int) -> tuple[bool, str]:
         kind = str(item_kind).strip().lower()
         iid = str(item_id).strip().lower()
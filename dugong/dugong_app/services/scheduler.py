@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import heapq
+import random
+import time
+from collections.abc import Callable
+
+
+class _Job:
+    __slots__ = ("name", "interval", "callback", "jitter", "due", "runs", "errors", "skipped", "max_late_ms")
+
+    def __init__(self, name: str, interval: float, callback: Callable[[], None], jitter: float, due: float) -> None:
+        self.name = name
+        self.interval = interval
+        self.callback = callback
+        self.jitter = jitter
+        self.due = due
+        self.runs = 0
+        self.errors = 0
+        self.skipped = 0
+        self.max_late_ms = 0.0
+
+
+class DeadlineScheduler:
+    """Periodic jobs on one deadline heap, driven by a single host timer.
+
+    The host (the Qt shell) calls `run_due()` and then sleeps `next_delay()`
+    seconds. Jobs that come due within `coalesce_window_seconds` of each other
+    run in the same wakeup, so 1 s jobs share one wakeup with whatever else is
+    due around then. A job that fell behind (long GC pause, suspended laptop)
+    runs once and skips the missed periods instead of firing in a burst.
+    `jitter_seconds` adds up to that much random delay to each period, which
+    keeps several peers from syncing in lockstep.
+    """
+
+    def __init__(
+        self,
+        coalesce_window_seconds: float = 0.25,
+        monotonic_now: Callable[[], float] | None = None,
+        rng: random.Random | None = None,
+        on_error: Callable[[str, Exception], None] | None = None,
+    ) -> None:
+        self.coalesce_window_seconds = max(0.0, float(coalesce_window_seconds))
+        self._mono_now = monotonic_now or time.monotonic
+        self._rng = rng or random.Random()
+        self._on_error = on_error
+        self._jobs: dict[str, _Job] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._seq = 0
+        self._wakeups = 0
+        self._started_at = self._mono_now()
+
+    def every(
+        self,
+        name: str,
+        interval_seconds: float,
+        callback: Callable[[], None],
+        *,
+        jitter_seconds: float = 0.0,
+        first_delay_seconds: float | None = None,
+    ) -> None:
+        interval = max(0.01, float(interval_seconds))
+        jitter = max(0.0, float(jitter_seconds))
+        delay = interval if first_delay_seconds is None else max(0.0, float(first_delay_seconds))
+        job = _Job(name, interval, callback, jitter, self._mono_now() + delay + self._jitter(jitter))
+        self._jobs[name] = job
+        self._push(job)
+
+    def cancel(self, name: str) -> bool:
+        # Heap entries for a cancelled job are dropped lazily when popped.
+        return self._jobs.pop(name, None) is not None
+
+    def reschedule(self, name: str, delay_seconds: float = 0.0) -> None:
+        """Pull (or push back) a job's next run, e.g. after a manual trigger."""
+        job = self._jobs.get(name)
+        if job is None:
+            return
+        job.due = self._mono_now() + max(0.0, float(delay_seconds))
+        self._push(job)
+
+    def next_delay(self, now: float | None = None) -> float | None:
+        """Seconds until the next deadline, or None when nothing is scheduled."""
+        self._drop_stale()
+        if not self._heap:
+            return None
+        now_ts = self._mono_now() if now is None else now
+        return max(0.0, self._heap[0][0] - now_ts)
+
+    def run_due(self, now: float | None = None) -> int:
+        now_ts = self._mono_now() if now is None else now
+        horizon = now_ts + self.coalesce_window_seconds
+        due: list[_Job] = []
+        while self._heap and self._heap[0][0] <= horizon:
+            when, _seq, name = heapq.heappop(self._heap)
+            job = self._jobs.get(name)
+            if job is None or job.due != when:
+                continue  # cancelled or superseded by reschedule()
+            due.append(job)
+        if not due:
+            return 0
+        self._wakeups += 1
+        for job in due:
+            late_ms = max(0.0, (now_ts - job.due) * 1000.0)
+            job.max_late_ms = max(job.max_late_ms, late_ms)
+            # Coalesce missed periods into this one run.
+            next_due = job.due + job.interval
+            if next_due <= now_ts:
+                missed = int((now_ts - job.due) // job.interval)
+                job.skipped += missed
+                next_due = job.due + (missed + 1) * job.interval
+            job.due = next_due + self._jitter(job.jitter)
+            self._push(job)
+        for job in due:
+            if self._jobs.get(job.name) is not job:
+                continue  # cancelled by an earlier job in this batch
+            job.runs += 1
+            try:
+                job.callback()
+            except Exception as exc:
+                job.errors += 1
+                if self._on_error is not None:
+                    self._on_error(job.name, exc)
+        return len(due)
+
+    def metrics(self) -> dict:
+        elapsed = max(1e-6, self._mono_now() - self._started_at)
+        return {
+            "jobs": len(self._jobs),
+            "wakeups": int(self._wakeups),
+            "wakeups_per_second": round(self._wakeups / elapsed, 3),
+            "by_job": {
+                name: {
+                    "interval_s": job.interval,
+                    "runs": int(job.runs),
+                    "skipped": int(job.skipped),
+                    "errors": int(job.errors),
+                    "max_late_ms": round(job.max_late_ms, 1),
+                }
+                for name, job in self._jobs.items()
+            },
+        }
+
+    def _jitter(self, jitter: float) -> float:
+        return self._rng.uniform(0.0, jitter) if jitter > 0 else 0.0
+
+    def _push(self, job: _Job) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (job.due, self._seq, job.name))
+
+    def _drop_stale(self) -> None:
+        while self._heap:
+            when, _seq, name = self._heap[0]
+            job = self._jobs.get(name)
+            if job is not None and job.due == when:
+                return
+            heapq.heappop(self._heap)
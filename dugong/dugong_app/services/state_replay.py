@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from dugong_app.core.events import DugongEvent
+
+# Own-source events that change pomodoro/reward state. The journal is the
+# per-change log for both services; their snapshots only record how far into
+# it they have folded (the "journal_cursor").
+REPLAY_EVENT_TYPES = (
+    "pomo_start",
+    "pomo_pause",
+    "pomo_resume",
+    "pomo_complete",
+    "pomo_skip",
+    "co_focus_milestone",
+)
+CURSOR_KEY = "journal_cursor"
+
+
+def snapshot_cursor(payload: dict) -> dict | None:
+    """Cursor saved with a snapshot.
+
+    {} (replay everything) when there is no usable snapshot, None when the
+    snapshot predates replay and already holds every change.
+    """
+    if not payload:
+        return {}
+    cursor = payload.get(CURSOR_KEY)
+    if not isinstance(cursor, dict):
+        return None
+    ids = cursor.get("event_ids", [])
+    return {
+        "timestamp": str(cursor.get("timestamp", "")),
+        "event_ids": [str(i) for i in ids] if isinstance(ids, list) else [],
+    }
+
+
+def is_after(event: DugongEvent, cursor: dict) -> bool:
+    timestamp = str(cursor.get("timestamp", ""))
+    if event.timestamp != timestamp:
+        return event.timestamp > timestamp
+    return event.event_id not in cursor.get("event_ids", [])
+
+
+def advance(cursor: dict, event: DugongEvent) -> dict:
+    # Ids are kept for the last timestamp only: that is all is_after needs.
+    if event.timestamp == cursor.get("timestamp"):
+        return {"timestamp": event.timestamp, "event_ids": [*cursor.get("event_ids", []), event.event_id]}
+    return {"timestamp": event.timestamp, "event_ids": [event.event_id]}
+
+
+def event_time(event: DugongEvent) -> tuple[float, str] | None:
+    """(wall seconds, UTC day) of an event, or None for an unparsable timestamp."""
+    try:
+        moment = datetime.fromisoformat(event.timestamp)
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp(), moment.astimezone(timezone.utc).date().isoformat()
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
 from datetime import datetime
+from types import MappingProxyType
 
 from dugong_app.core.events import DugongEvent
 from dugong_app.interaction.protocol import decode_event, encode_event
@@ -10,6 +12,26 @@ from dugong_app.interaction.transport_base import TransportBase
 from dugong_app.persistence.event_journal import EventJournal
 from dugong_app.persistence.sync_cursor_json import SyncCursorStorage
 
+# Ephemeral presence events from peers that predate the presence channel: they
+# are handed to the caller for the presence table but never journaled.
+PRESENCE_EVENT_TYPES = frozenset({"presence_hello", "presence_heartbeat", "presence_bye"})
+
+_EMPTY: Mapping[str, object] = MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class CursorSnapshot:
+    """Read-only view of the sync cursors, replaced (never mutated) on change.
+
+    Readers on other threads just grab `SyncEngine.cursor_snapshot`; `version`
+    only moves when the content does, so they can skip work on equal versions.
+    """
+
+    version: int = 0
+    file_cursors: Mapping[str, int] = field(default_factory=lambda: _EMPTY)
+    last_seen_event_id_by_source: Mapping[str, str] = field(default_factory=lambda: _EMPTY)
+    last_seen_timestamp_by_source: Mapping[str, str] = field(default_factory=lambda: _EMPTY)
+
 
 class SyncEngine:
     def __init__(
@@ -39,6 +61,8 @@ class SyncEngine:
         self._remote_cursors: dict[str, int] = dict(cursor_state.get("file_cursors", {}))
         self._last_seen_event_id_by_source: dict[str, str] = dict(cursor_state.get("last_seen_event_id_by_source", {}))
         self._last_seen_timestamp_by_source: dict[str, str] = dict(cursor_state.get("last_seen_timestamp_by_source", {}))
+        self.cursor_snapshot = CursorSnapshot()
+        self._publish_cursor_snapshot()
 
         self.last_status = "disabled" if self.transport is None else "idle"
         self._retry_count = 0
@@ -46,19 +70,39 @@ class SyncEngine:
         self._paused = False
 
     def publish_local_event(self, event: DugongEvent) -> bool:
+        return self.publish_local_events([event]) > 0
+
+    def publish_local_events(self, events: list[DugongEvent]) -> int:
         if self.transport is None:
-            return False
-        if not event.event_id or event.event_id in self._published_event_ids:
-            return False
+            return 0
+        pending: list[DugongEvent] = []
+        batch_ids: set[str] = set()
+        for event in events:
+            if not event.event_id or event.event_id in self._published_event_ids or event.event_id in batch_ids:
+                continue
+            batch_ids.add(event.event_id)
+            pending.append(event)
+        if not pending:
+            return 0
 
-        payload = encode_event(sender=self.source_id, receiver="*", event=event)
-        self.transport.send(payload)
-        self._published_event_ids.add(event.event_id)
-        self._known_event_ids.add(event.event_id)
+        payloads = [encode_event(sender=self.source_id, receiver="*", event=event) for event in pending]
+        send_many = getattr(self.transport, "send_many", None)
+        if callable(send_many):
+            send_many(payloads)
+            self._mark_published(pending)
+        else:
+            for event, payload in zip(pending, payloads):
+                self.transport.send(payload)
+                self._mark_published([event])
         self.last_status = "ok"
         self._retry_count = 0
         self._next_retry_monotonic = 0.0
-        return True
+        return len(pending)
+
+    def _mark_published(self, events: list[DugongEvent]) -> None:
+        for event in events:
+            self._published_event_ids.add(event.event_id)
+            self._known_event_ids.add(event.event_id)
 
     def sync_once(self, force: bool = False) -> dict:
         if self.transport is None:
@@ -83,6 +127,7 @@ class SyncEngine:
                 next_cursors = dict(self._remote_cursors)
 
             imported: list[DugongEvent] = []
+            presence_events: list[DugongEvent] = []
             for payload in payloads:
                 event = decode_event(payload)
                 if not event.event_id:
@@ -92,6 +137,10 @@ class SyncEngine:
                 if event.source == self.source_id:
                     self._known_event_ids.add(event.event_id)
                     continue
+                if event.event_type in PRESENCE_EVENT_TYPES:
+                    self._known_event_ids.add(event.event_id)
+                    presence_events.append(event)
+                    continue
                 if self._should_skip_rollup(event):
                     self._known_event_ids.add(event.event_id)
                     self._remember_seen(event)
@@ -112,7 +161,12 @@ class SyncEngine:
             self._paused = False
             self._retry_count = 0
             self._next_retry_monotonic = 0.0
-            return {"status": "ok", "imported": len(imported), "events": imported}
+            return {
+                "status": "ok",
+                "imported": len(imported),
+                "events": imported,
+                "presence_events": presence_events,
+            }
         except Exception as exc:
             self._retry_count += 1
             self.last_status = self._classify_failure(exc)
@@ -138,7 +192,7 @@ class SyncEngine:
             }
 
     def _persist_cursor_state(self) -> None:
-        if self.cursor_storage is None:
+        if not self._publish_cursor_snapshot() or self.cursor_storage is None:
             return
         self.cursor_storage.save(
             {
@@ -148,6 +202,24 @@ class SyncEngine:
             }
         )
 
+    def _publish_cursor_snapshot(self) -> bool:
+        current = self.cursor_snapshot
+        if (
+            current.version > 0
+            and current.file_cursors == self._remote_cursors
+            and current.last_seen_event_id_by_source == self._last_seen_event_id_by_source
+            and current.last_seen_timestamp_by_source == self._last_seen_timestamp_by_source
+        ):
+            return False
+        # Copy-on-write: the live dicts keep mutating on the sync thread.
+        self.cursor_snapshot = CursorSnapshot(
+            version=current.version + 1,
+            file_cursors=MappingProxyType(dict(self._remote_cursors)),
+            last_seen_event_id_by_source=MappingProxyType(dict(self._last_seen_event_id_by_source)),
+            last_seen_timestamp_by_source=MappingProxyType(dict(self._last_seen_timestamp_by_source)),
+        )
+        return True
+
     def _remember_seen(self, event: DugongEvent) -> None:
         if event.event_id:
             self._last_seen_event_id_by_source[event.source] = event.event_id
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import queue
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from dugong_app.services.job_lanes import OVERFLOW_BLOCK, JobLane
+
+
+class AssetLoader:
+    """Decode assets on a worker lane and hand results back to the GUI thread.
+
+    `decode` callables run off the GUI thread, so they must only touch
+    thread-safe types (QImage, bytes, paths) - never QPixmap or widgets. The GUI
+    thread polls `drain()` and does the QPixmap conversion / apply step there.
+    A key that is already queued is not decoded twice.
+    """
+
+    def __init__(self, name: str = "assets", maxsize: int = 64) -> None:
+        self._results: queue.Queue[tuple[Hashable, Any, Exception | None]] = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending: set[Hashable] = set()
+        self._lane = JobLane(name, self._run, maxsize=maxsize, overflow=OVERFLOW_BLOCK)
+
+    def submit(self, key: Hashable, decode: Callable[[], Any]) -> bool:
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+        if not self._lane.submit({"key": key, "decode": decode}):
+            with self._lock:
+                self._pending.discard(key)
+            return False
+        return True
+
+    def is_pending(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._pending
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def drain(self, max_items: int | None = None) -> list[tuple[Hashable, Any, Exception | None]]:
+        """Finished (key, value, error) tuples in completion order."""
+        out: list[tuple[Hashable, Any, Exception | None]] = []
+        while max_items is None or len(out) < max_items:
+            try:
+                item = self._results.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._pending.discard(item[0])
+            out.append(item)
+        return out
+
+    def metrics(self) -> dict:
+        payload = self._lane.metrics()
+        payload["pending_keys"] = self.pending_count()
+        return payload
+
+    def stop(self, timeout: float | None = 2.0) -> None:
+        self._lane.stop(timeout=timeout)
+
+    def _run(self, job: dict) -> None:
+        key = job["key"]
+        try:
+            value = job["decode"]()
+        except Exception as exc:
+            self._results.put((key, None, exc))
+            return
+        self._results.put((key, value, None))
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+PACE_ACTIVE = "active"
+PACE_IDLE = "idle"
+PACE_OCCLUDED = "occluded"
+PACE_PAUSED = "paused"
+
+
+class FramePacer:
+    """Fixed-timestep pacing for the shell's single animation loop.
+
+    The world simulation always advances in `step_ms` steps and the sprite
+    animation in `anim_ms` steps, however often frames are actually produced, so
+    motion speed does not change when the loop throttles down. `interval_ms`
+    picks how often to wake: every step while something is happening, a few
+    times per second when only the local dugong is drifting, a slow poll while
+    the window is covered, and not at all (0) while it is hidden.
+    """
+
+    def __init__(
+        self,
+        step_ms: int = 28,
+        anim_ms: int = 130,
+        idle_interval_ms: int = 100,
+        occluded_interval_ms: int = 500,
+        max_catchup_steps: int = 6,
+        monotonic_now: Callable[[], float] | None = None,
+    ) -> None:
+        self.step_ms = max(1, int(step_ms))
+        self.anim_ms = max(1, int(anim_ms))
+        self.idle_interval_ms = max(self.step_ms, int(idle_interval_ms))
+        self.occluded_interval_ms = max(self.idle_interval_ms, int(occluded_interval_ms))
+        self.max_catchup_steps = max(1, int(max_catchup_steps))
+        self._mono_now = monotonic_now or time.monotonic
+        self._last_advance: float | None = None
+        self._world_acc_ms = 0.0
+        self._anim_acc_ms = 0.0
+        self._mode = PACE_ACTIVE
+        self._frames = 0
+        self._partial_frames = 0
+        self._fps = 0.0
+        self._fps_window_start: float | None = None
+        self._fps_window_frames = 0
+        self._paints = 0
+        self._paint_ms_avg = 0.0
+        self._paint_ms_max = 0.0
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    def interval_ms(self, *, visible: bool, exposed: bool = True, busy: bool = True) -> int:
+        if not visible:
+            self._mode = PACE_PAUSED
+            return 0
+        if not exposed:
+            self._mode = PACE_OCCLUDED
+            return self.occluded_interval_ms
+        self._mode = PACE_ACTIVE if busy else PACE_IDLE
+        return self.step_ms if busy else self.idle_interval_ms
+
+    def reset(self) -> None:
+        # After a pause: resume from "now" instead of replaying the gap.
+        self._last_advance = None
+        self._world_acc_ms = 0.0
+        self._anim_acc_ms = 0.0
+        self._fps_window_start = None
+        self._fps_window_frames = 0
+
+    def advance(self, now: float | None = None) -> tuple[int, int]:
+        """(world_steps, anim_steps) owed since the previous call."""
+        now_ts = self._mono_now() if now is None else now
+        if self._last_advance is None:
+            self._last_advance = now_ts
+            return 1, 1
+        elapsed_ms = max(0.0, (now_ts - self._last_advance) * 1000.0)
+        self._last_advance = now_ts
+        # Cap the backlog so a stalled event loop never fast-forwards the scene.
+        cap_ms = self.max_catchup_steps * self.step_ms
+        self._world_acc_ms = min(self._world_acc_ms + elapsed_ms, cap_ms)
+        self._anim_acc_ms = min(self._anim_acc_ms + elapsed_ms, cap_ms + self.anim_ms)
+        # Tolerate timer jitter: a tick that lands a hair early still counts.
+        slack = self.step_ms * 0.1
+        world_steps = int((self._world_acc_ms + slack) // self.step_ms)
+        self._world_acc_ms = max(0.0, self._world_acc_ms - world_steps * self.step_ms)
+        anim_steps = int((self._anim_acc_ms + slack) // self.anim_ms)
+        self._anim_acc_ms = max(0.0, self._anim_acc_ms - anim_steps * self.anim_ms)
+        return world_steps, anim_steps
+
+    def record_frame(self, now: float | None = None, partial: bool = False) -> None:
+        now_ts = self._mono_now() if now is None else now
+        self._frames += 1
+        if partial:
+            self._partial_frames += 1
+        if self._fps_window_start is None:
+            self._fps_window_start = now_ts
+            self._fps_window_frames = 0
+            return
+        self._fps_window_frames += 1
+        span = now_ts - self._fps_window_start
+        if span >= 1.0:
+            self._fps = self._fps_window_frames / span
+            self._fps_window_start = now_ts
+            self._fps_window_frames = 0
+
+    def record_paint(self, paint_ms: float) -> None:
+        ms = max(0.0, float(paint_ms))
+        self._paints += 1
+        self._paint_ms_avg = ms if self._paints == 1 else (self._paint_ms_avg * 0.9 + ms * 0.1)
+        self._paint_ms_max = max(self._paint_ms_max, ms)
+
+    def metrics(self) -> dict:
+        return {
+            "mode": self._mode,
+            "fps": round(self._fps, 1),
+            "frames": int(self._frames),
+            "partial_frames": int(self._partial_frames),
+            "paints": int(self._paints),
+            "paint_ms_avg": round(self._paint_ms_avg, 2),
+            "paint_ms_max": round(self._paint_ms_max, 2),
+            "step_ms": self.step_ms,
+            "idle_interval_ms": self.idle_interval_ms,
+        }
+
+
+class BackgroundScroll:
+    """Background scroll position that moves in whole `step_px` steps.
+
+    Speed is kept per world step, with the fractional remainder carried over,
+    so the painted offset only changes once a whole step has accumulated. At
+    the default 0.65 px per world step a third of the frames leave the
+    background where it was and can repaint just the sprites.
+    """
+
+    def __init__(self, speed_px: float = 0.65, step_px: int = 1) -> None:
+        self.speed_px = max(0.0, float(speed_px))
+        self.step_px = max(1, int(step_px))
+        self._pending_px = 0.0
+        self._offset = 0
+
+    @property
+    def offset(self) -> int:
+        return self._offset
+
+    def advance(self, steps: int, wrap: int) -> int:
+        """Pixels the painted offset moved over `steps` world steps (0 if it held still)."""
+        if wrap <= 0 or steps <= 0:
+            return 0
+        self._pending_px += self.speed_px * steps
+        moved = int(self._pending_px // self.step_px) * self.step_px
+        self._pending_px -= moved
+        # Wrap even when it held still: the strip may just have been rescaled narrower.
+        self._offset = (self._offset + moved) % wrap
+        return moved
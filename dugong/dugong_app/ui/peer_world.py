@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import math
+import random
+from collections.abc import Callable
+
+# Per-peer motion state, one flat list of floats per field (structure of arrays).
+KINEMATIC_FIELDS = (
+    "x",
+    "y",
+    "target_x",
+    "target_y",
+    "vx",
+    "vy",
+    "speed",
+    "float_phase",
+    "react_until",
+    "facing",  # +1.0 right, -1.0 left
+    "turning",  # 1.0 on the step the swim direction flipped
+)
+
+
+class PeerKinematics:
+    """Structure-of-arrays store for peer motion, stepped in one pass.
+
+    Rows are addressed by source id; removal swaps the last row into the hole so
+    the columns stay dense. `step` walks all rows with local column bindings
+    instead of per-peer dict lookups and float() conversions. Columns are plain
+    lists: array('d') boxes a new float on every read, which made the step no
+    faster than the dict path it replaced (scripts/bench_peers.py).
+    """
+
+    def __init__(self) -> None:
+        self._cols: dict[str, list[float]] = {name: [] for name in KINEMATIC_FIELDS}
+        self._sources: list[str] = []
+        self._index: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def __contains__(self, source: object) -> bool:
+        return source in self._index
+
+    def sources(self) -> list[str]:
+        return list(self._sources)
+
+    def add(
+        self,
+        source: str,
+        *,
+        x: float,
+        y: float,
+        target_x: float,
+        target_y: float,
+        vx: float,
+        speed: float,
+        float_phase: float,
+    ) -> None:
+        if source in self._index:
+            self.remove(source)
+        row = {
+            "x": x,
+            "y": y,
+            "target_x": target_x,
+            "target_y": target_y,
+            "vx": vx,
+            "vy": 0.0,
+            "speed": speed,
+            "float_phase": float_phase,
+            "react_until": 0.0,
+            "facing": 1.0,
+            "turning": 0.0,
+        }
+        for name, col in self._cols.items():
+            col.append(float(row[name]))
+        self._index[source] = len(self._sources)
+        self._sources.append(source)
+
+    def remove(self, source: str) -> bool:
+        i = self._index.pop(source, None)
+        if i is None:
+            return False
+        last = len(self._sources) - 1
+        if i != last:
+            moved = self._sources[last]
+            for col in self._cols.values():
+                col[i] = col[last]
+            self._sources[i] = moved
+            self._index[moved] = i
+        for col in self._cols.values():
+            col.pop()
+        self._sources.pop()
+        return True
+
+    def get(self, source: str, field: str, default: float = 0.0) -> float:
+        i = self._index.get(source)
+        if i is None:
+            return default
+        return self._cols[field][i]
+
+    def set(self, source: str, field: str, value: float) -> None:
+        i = self._index.get(source)
+        if i is not None:
+            self._cols[field][i] = float(value)
+
+    def position(self, source: str) -> tuple[int, int]:
+        i = self._index.get(source)
+        if i is None:
+            return (0, 0)
+        return (int(self._cols["x"][i]), int(self._cols["y"][i]))
+
+    def facing(self, source: str) -> str:
+        return "left" if self.get(source, "facing", 1.0) < 0 else "right"
+
+    def step(
+        self,
+        min_x: float,
+        max_x: float,
+        min_y: float,
+        max_y: float,
+        now: float,
+        uniform: Callable[[float, float], float] = random.uniform,
+    ) -> None:
+        """Advance every peer one world tick; peers mid-react hold still."""
+        cols = self._cols
+        xs, ys = cols["x"], cols["y"]
+        txs, tys = cols["target_x"], cols["target_y"]
+        vxs, vys = cols["vx"], cols["vy"]
+        speeds, phases = cols["speed"], cols["float_phase"]
+        reacts, facings, turnings = cols["react_until"], cols["facing"], cols["turning"]
+        hypot, sin = math.hypot, math.sin
+
+        for i in range(len(self._sources)):
+            if reacts[i] > now:
+                continue
+            x = xs[i]
+            y = ys[i]
+            tx = txs[i]
+            ty = tys[i]
+            old_sign = 1 if vxs[i] >= 0 else -1
+
+            if not (min_x <= tx <= max_x and min_y <= ty <= max_y):
+                tx = uniform(min_x, max_x)
+                ty = uniform(min_y, max_y)
+
+            dx = tx - x
+            dy = ty - y
+            dist = hypot(dx, dy)
+            if dist < 14:
+                tx = uniform(min_x, max_x)
+                ty = uniform(min_y, max_y)
+                dx = tx - x
+                dy = ty - y
+                dist = max(0.1, hypot(dx, dy))
+
+            speed = speeds[i]
+            vx = (dx / dist) * speed
+            vy = (dy / dist) * speed
+            if abs(vx) < 0.05:
+                vx = 0.05 if dx >= 0 else -0.05
+
+            x += vx
+            y += vy
+
+            if x < min_x or x > max_x:
+                x = min_x if x < min_x else max_x
+                tx = uniform(min_x, max_x)
+                ty = uniform(min_y, max_y)
+            if y < min_y or y > max_y:
+                y = min_y if y < min_y else max_y
+                tx = uniform(min_x, max_x)
+                ty = uniform(min_y, max_y)
+
+            phase = phases[i] + 0.12
+            y += sin(phase) * 0.2
+
+            xs[i] = x
+            ys[i] = y
+            txs[i] = tx
+            tys[i] = ty
+            vxs[i] = vx
+            vys[i] = vy
+            phases[i] = phase
+            if vx > 0.28:
+                facings[i] = 1.0
+            elif vx < -0.28:
+                facings[i] = -1.0
+            turnings[i] = 1.0 if (1 if vx >= 0 else -1) != old_sign else 0.0
+
+
+class PeerRecord:
+    """Display metadata for one peer (everything the world tick never touches)."""
+
+    __slots__ = (
+        "source",
+        "mode",
+        "last_seen",
+        "react_kind",
+        "skin_id",
+        "last_event_id",
+        "last_event_type",
+        "pomo_phase",
+        "pearls",
+        "today_pearls",
+        "lifetime_pearls",
+        "exp",
+        "today_exp",
+        "lifetime_exp",
+        "level",
+        "exp_in_level",
+        "exp_to_next",
+        "focus_streak",
+        "day_streak",
+        "title_id",
+        "bubble_style",
+        "online",
+        "frames_scaled",
+        "react_scaled",
+        "sprite_keys",
+    )
+
+    _INT_FIELDS = (
+        "pearls",
+        "today_pearls",
+        "lifetime_pearls",
+        "exp",
+        "today_exp",
+        "lifetime_exp",
+        "level",
+        "exp_in_level",
+        "exp_to_next",
+        "focus_streak",
+        "day_streak",
+    )
+    _STR_FIELDS = ("mode", "pomo_phase", "last_event_type", "last_event_id", "title_id", "bubble_style")
+
+    def __init__(self, source: str, last_seen: float = 0.0) -> None:
+        self.source = source
+        self.mode = "unknown"
+        self.last_seen = float(last_seen)
+        self.react_kind = "chill"
+        self.skin_id = "default"
+        self.last_event_id = ""
+        self.last_event_type = ""
+        self.pomo_phase = ""
+        self.pearls = 0
+        self.today_pearls = 0
+        self.lifetime_pearls = 0
+        self.exp = 0
+        self.today_exp = 0
+        self.lifetime_exp = 0
+        self.level = 1
+        self.exp_in_level = 0
+        self.exp_to_next = 50
+        self.focus_streak = 0
+        self.day_streak = 0
+        self.title_id = "drifter"
+        self.bubble_style = "default"
+        self.online = 1.0
+        self.frames_scaled: dict = {}
+        self.react_scaled: dict = {}
+        self.sprite_keys: tuple = ()
+
+    def apply_entity(self, entity: dict, now: float) -> None:
+        """Copy a controller entity dict in; missing keys keep their current value."""
+        for name in self._STR_FIELDS:
+            if name in entity:
+                setattr(self, name, str(entity[name]))
+        for name in self._INT_FIELDS:
+            if name in entity:
+                setattr(self, name, int(entity[name]))
+        self.last_seen = float(entity.get("last_seen", now))
+        if "online" in entity:
+            self.online = float(entity["online"])
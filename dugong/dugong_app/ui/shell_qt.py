@@ -1,5 +1,6 @@
 ﻿from __future__ import annotations
 
+import itertools
 import json
 
 import math
@@ -13,6 +14,15 @@ from collections.abc import Callable
 from pathlib import Path
 
 from PySide6 import QtCore, QtGui, QtWidgets
+
+from dugong_app.services.scheduler import DeadlineScheduler
+from dugong_app.ui.asset_loader import AssetLoader
+from dugong_app.ui.frame_pacer import PACE_OCCLUDED, BackgroundScroll, FramePacer
+from dugong_app.ui.peer_world import PeerKinematics, PeerRecord
+from dugong_app.ui.sprite_atlas import ATLAS_TEXTURE
+from dugong_app.ui.sprite_atlas import load_manifest as load_atlas_manifest
+from dugong_app.ui.sprite_cache import SpriteCache, shared_decode_cache, shared_sprite_cache
+
 try:
     from PySide6 import QtMultimedia
 except Exception:
@@ -56,10 +66,28 @@ class DugongShell:
         timer.start()
         self._win._timers.append(timer)
 
+    def attach_scheduler(self, scheduler: DeadlineScheduler) -> None:
+        """Drive `scheduler` from one single-shot timer re-armed to its next deadline."""
+        timer = QtCore.QTimer(self._win)
+        timer.setSingleShot(True)
+        timer.setTimerType(QtCore.Qt.PreciseTimer)
+
+        def fire() -> None:
+            scheduler.run_due()
+            delay = scheduler.next_delay()
+            if delay is not None:
+                timer.start(max(0, int(delay * 1000)))
+
+        timer.timeout.connect(fire)
+        self._win._timers.append(timer)
+        delay = scheduler.next_delay()
+        if delay is not None:
+            timer.start(max(0, int(delay * 1000)))
+
     def update_view(
         self,
-        sprite: str,
-        state_text: str,
+        sprite: str | None = None,
+        state_text: str | None = None,
         pomo_text: str | None = None,
         pomo_state: str | None = None,
         reward_stats: dict[str, int | str] | None = None,
@@ -67,8 +95,12 @@ class DugongShell:
         bubble: str | None = None,
         entities: list[dict[str, str | float]] | None = None,
         local_source: str | None = None,
+        removed_entities: list[str] | None = None,
     ) -> None:
-        self._win.set_state_text(state_text)
+        # Every argument is optional: the controller sends only what changed.
+        # `removed_entities` switches `entities` from "the full set" to upserts.
+        if state_text is not None:
+            self._win.set_state_text(state_text)
         if pomo_text is not None:
             self._win.set_pomo_text(pomo_text)
         if pomo_state is not None:
@@ -77,9 +109,10 @@ class DugongShell:
             self._win.set_reward_stats(reward_stats)
         if local_profile is not None:
             self._win.set_local_profile(local_profile)
-        self._win.apply_sprite_hint(sprite)
-        if entities is not None:
-            self._win.set_shared_entities(entities, local_source=local_source)
+        if sprite is not None:
+            self._win.apply_sprite_hint(sprite)
+        if entities is not None or removed_entities:
+            self._win.set_shared_entities(entities or [], local_source=local_source, removed=removed_entities)
         if bubble is not None:
             self._win.show_bubble(bubble)
 
@@ -88,6 +121,10 @@ class DugongShell:
         self._win.raise_()
         self._win.activateWindow()
         self._app.exec()
+        self._win._asset_loader.stop(timeout=0.5)
+
+    def render_metrics(self) -> dict:
+        return self._win.render_metrics()
 
     def trigger_focus_complete_fx(self) -> None:
         self._win.trigger_focus_complete_fx()
@@ -97,6 +134,17 @@ class DugongShell:
 
 
 class _DugongWindow(QtWidgets.QWidget):
+    # (skin_id, price, label) shown on the shop shelf; also prefetched after startup.
+    SHOP_SKIN_ITEMS = (
+        ("king", 160, "King"),
+        ("horse", 120, "Horse"),
+    )
+    # (title_id, price, label) for the badge seats; badge art is prefetched with the skins.
+    SHOP_BADGE_ITEMS = (
+        ("drifter", 0, "Wanderer"),
+        ("explorer", 60, "Explorer"),
+    )
+
     def __init__(
         self,
         on_mode_change: Callable[[str], None],
@@ -123,9 +171,20 @@ class _DugongWindow(QtWidgets.QWidget):
         self._on_quit = on_quit
         self._timers: list[QtCore.QTimer] = []
         self._local_source = source_id or "local"
-        self._peer_entities: dict[str, dict[str, float | str]] = {}
+        # Peer motion lives in a structure-of-arrays store; the records only
+        # carry display metadata and sprite handles.
+        self._peer_entities: dict[str, PeerRecord] = {}
+        self._peer_kin = PeerKinematics()
         self._peer_anim_index: dict[str, int] = {}
         self._peer_current_frame: dict[str, QtGui.QPixmap] = {}
+        # Decoded and scaled skins are shared process-wide; peers wearing the same
+        # skin at the same height hold references to one frame set.
+        self._sprite_cache = shared_sprite_cache()
+        self._decode_cache = shared_decode_cache()
+        # Pre-rendered name tags, pearl drops and reward texts; keys carry every
+        # input (text, size, dpr, source icon) so stale entries are never hit.
+        self._glyph_cache = SpriteCache(max_idle=160)
+        self._local_sprite_keys: tuple = ()
 
         self.setWindowFlags(
             QtCore.Qt.FramelessWindowHint
@@ -147,26 +206,30 @@ class _DugongWindow(QtWidgets.QWidget):
 
         self._assets_root = Path(__file__).resolve().parent / "assets"
         self._skin_root = self._assets_root / "dugong_skin"
-        self._pearl_icon_src = self._load_asset_image_candidates(
+        # Decoding happens on a worker lane (QImage only); results are turned
+        # into QPixmaps here on the GUI thread as they arrive. Until then the
+        # window paints placeholders.
+        self._asset_loader = AssetLoader()
+        self._asset_handlers: dict[tuple, list[Callable[[object, Exception | None], None]]] = {}
+        self._asset_timer = QtCore.QTimer(self)
+        self._asset_timer.setInterval(16)
+        self._asset_timer.timeout.connect(self._drain_asset_results)
+        self._placeholder_dir = Path("<placeholder>")
+        self._local_skin_request = ""
+        self._pearl_icon_src = QtGui.QPixmap()
+        self._ready_banner_src = QtGui.QPixmap()
+        self._finish_banner_src = QtGui.QPixmap()
+        self._request_icon(
+            "pearl_icon_src",
             [
                 self._assets_root / "pearl_icon.png",
                 self._assets_root / "pearls_icon.png",
                 self._assets_root / "pearls.png",
                 self._assets_root / "pearl.png",
-            ]
-        )
-        self._ready_banner_src = self._load_asset_image_candidates(
-            [
-                self._assets_root / "ready.png",
-                self._assets_root / "READY.png",
-            ]
-        )
-        self._finish_banner_src = self._load_asset_image_candidates(
-            [
-                self._assets_root / "finish.png",
-                self._assets_root / "FINISH.png",
-            ]
+            ],
         )
+        self._request_icon("ready_banner_src", [self._assets_root / "ready.png", self._assets_root / "READY.png"])
+        self._request_icon("finish_banner_src", [self._assets_root / "finish.png", self._assets_root / "FINISH.png"])
         self._is_muted = False
         self._mode_sound_players: dict[str, object] = {}
         self._mode_audio_outputs: dict[str, object] = {}
@@ -175,12 +238,21 @@ class _DugongWindow(QtWidgets.QWidget):
         self._effect_sound_players: dict[str, object] = {}
         self._effect_audio_outputs: dict[str, object] = {}
         self._effect_sound_files: dict[str, Path] = {}
+        # Only the files are looked up here; media players are built on first play.
         self._init_mode_sounds()
         self._skin_id = self._resolve_skin_id(self._local_source, skin_id)
         self._local_skin_assets_dir = self._resolve_skin_assets_dir(self._skin_root, self._skin_id)
         self._peer_skin_assets_dir = self._resolve_skin_assets_dir(self._skin_root, "default")
-        self._bg_src = self._load_background(self._local_skin_assets_dir)
-        self._local_frames_raw, self._local_react_raw = self._load_character_assets(self._local_skin_assets_dir)
+        self._bg_src = self._fallback_background()
+        self._request_asset(
+            ("bg", str(self._local_skin_assets_dir)),
+            lambda assets_dir=self._local_skin_assets_dir: self._load_background_image(assets_dir),
+            self._on_background_decoded,
+        )
+        self._local_sprite_dir = self._placeholder_dir
+        self._local_frames_raw, self._local_react_raw = self._decode_cache.acquire(
+            str(self._placeholder_dir), self._placeholder_character_assets
+        )
 
         self._anim_mode = "swim"  # swim | idle | turn | react
         self._react_kind = "chill"  # study | chill | rest (with legacy aliases)
@@ -215,9 +287,13 @@ class _DugongWindow(QtWidgets.QWidget):
         self._shop_dialog: QtWidgets.QDialog | None = None
         self._shop_hint_label: QtWidgets.QLabel | None = None
         self._shop_scale = 0.5
-        self._shop_bg_src = QtGui.QPixmap(str(self._assets_root / "dugong_shop.png"))
+        self._shop_bg_src = QtGui.QPixmap()
+        self._shop_bg_label: QtWidgets.QLabel | None = None
+        self._request_shop_bg()
         self._shop_skin_preview_cache: dict[tuple[str, int, int], QtGui.QPixmap] = {}
         self._shop_badge_preview_cache: dict[tuple[str, int, int], QtGui.QPixmap] = {}
+        # Decoded badge art by title id; a null pixmap means "no PNG, draw the letter".
+        self._badge_src: dict[str, QtGui.QPixmap] = {}
         self._shop_manual_pos: QtCore.QPoint | None = None
         self._shop_edge_hold_ms = 220
         self._shop_edge_pressing = False
@@ -251,9 +327,8 @@ class _DugongWindow(QtWidgets.QWidget):
 
         self._dugong_anim_ms = 130
         self._world_tick_ms = 28
-        self._bg_tick_ms = 30
-        self._bg_speed_px = 0.7
-        self._bg_offset = 0.0
+        # 0.65 px per world step (0.7 px per 30 ms before the timers merged).
+        self._bg_scroll = BackgroundScroll(speed_px=0.65)
 
         self._bg_scaled: QtGui.QPixmap | None = None
         self._local_frames_scaled: dict[str, dict[str, list[QtGui.QPixmap]]] = {"right": {}, "left": {}}
@@ -531,25 +606,27 @@ class _DugongWindow(QtWidgets.QWidget):
         dlay.addWidget(self._drawer_tabs, 1)
         self._update_pomo_toggle_label(self._pomo_state)
 
-        self._dugong_timer = QtCore.QTimer(self)
-        self._dugong_timer.setInterval(self._dugong_anim_ms)
-        self._dugong_timer.timeout.connect(self._tick_dugong)
-        self._dugong_timer.start()
-
-        self._world_timer = QtCore.QTimer(self)
-        self._world_timer.setInterval(self._world_tick_ms)
-        self._world_timer.timeout.connect(self._tick_world)
-        self._world_timer.start()
-
-        self._bg_timer = QtCore.QTimer(self)
-        self._bg_timer.setInterval(self._bg_tick_ms)
-        self._bg_timer.timeout.connect(self._tick_bg)
-        self._bg_timer.start()
+        # One loop drives sprite animation, world motion and background scroll,
+        # and throttles itself when the window is idle, covered or hidden.
+        self._frame_pacer = FramePacer(step_ms=self._world_tick_ms, anim_ms=self._dugong_anim_ms)
+        self._frame_timer = QtCore.QTimer(self)
+        self._frame_timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self._frame_timer.setInterval(self._world_tick_ms)
+        self._frame_timer.timeout.connect(self._on_frame)
+        self._frame_timer.start()
+        # Dirty-rect bookkeeping: where each drawable was last painted (anchor +
+        # bounds) so a frame only repaints what moved.
+        self._painted_bounds: dict[object, tuple[int, int, QtCore.QRect]] = {}
+        self._painted_bg_offset = -1
+        self._paint_ids = itertools.count(1)
+        self._bg_strip: QtGui.QPixmap | None = None
+        self._bg_strip_key: tuple[int, int] = (0, 0)
         self._init_joke_broadcast()
 
         self._layout_overlay()
         self._reset_dugong_position()
         self._update_frame(force=True)
+        self._apply_local_skin(self._skin_id, progressive=True)
 
     # -------- assets ----------
     def _init_joke_broadcast(self) -> None:
@@ -603,19 +680,6 @@ class _DugongWindow(QtWidgets.QWidget):
             if not path.exists():
                 continue
             self._mode_sound_files[mode] = path
-            if QtMultimedia is None:
-                continue
-            try:
-                audio = QtMultimedia.QAudioOutput(self)
-                audio.setVolume(0.85)
-                audio.setMuted(self._is_muted)
-                player = QtMultimedia.QMediaPlayer(self)
-                player.setAudioOutput(audio)
-                player.setSource(QtCore.QUrl.fromLocalFile(str(path)))
-                self._mode_audio_outputs[mode] = audio
-                self._mode_sound_players[mode] = player
-            except Exception:
-                continue
         self._init_effect_sounds()
 
     def _init_effect_sounds(self) -> None:
@@ -629,24 +693,35 @@ class _DugongWindow(QtWidgets.QWidget):
             if not path.exists():
                 continue
             self._effect_sound_files[key] = path
-            if QtMultimedia is None:
-                continue
-            try:
-                audio = QtMultimedia.QAudioOutput(self)
-                audio.setVolume(0.95)
-                audio.setMuted(self._is_muted)
-                player = QtMultimedia.QMediaPlayer(self)
-                player.setAudioOutput(audio)
-                player.setSource(QtCore.QUrl.fromLocalFile(str(path)))
-                self._effect_audio_outputs[key] = audio
-                self._effect_sound_players[key] = player
-            except Exception:
-                continue
+
+    def _sound_player(
+        self, players: dict[str, object], outputs: dict[str, object], key: str, path: Path, volume: float
+    ) -> object | None:
+        # Created on first play: building QMediaPlayer/QAudioOutput and loading the
+        # source is backend setup the GUI thread should not pay for at startup.
+        player = players.get(key)
+        if player is not None or QtMultimedia is None:
+            return player
+        try:
+            audio = QtMultimedia.QAudioOutput(self)
+            audio.setVolume(volume)
+            audio.setMuted(self._is_muted)
+            player = QtMultimedia.QMediaPlayer(self)
+            player.setAudioOutput(audio)
+            player.setSource(QtCore.QUrl.fromLocalFile(str(path)))
+        except Exception:
+            return None
+        outputs[key] = audio
+        players[key] = player
+        return player
 
     def _play_mode_sound(self, mode: str) -> None:
         if self._is_muted:
             return
-        player = self._mode_sound_players.get(mode)
+        sound_path = self._mode_sound_files.get(mode)
+        if sound_path is None:
+            return
+        player = self._sound_player(self._mode_sound_players, self._mode_audio_outputs, mode, sound_path, 0.85)
         if player is not None:
             try:
                 player.setPosition(0)
@@ -654,23 +729,21 @@ class _DugongWindow(QtWidgets.QWidget):
                 return
             except Exception:
                 pass
-        sound_path = self._mode_sound_files.get(mode)
-        if sound_path is not None:
-            self._play_mode_sound_fallback(sound_path)
+        self._play_mode_sound_fallback(sound_path)
 
     def _play_effect_sound(self, key: str) -> None:
         if self._is_muted:
             return
-        player = self._effect_sound_players.get(key)
-        if player is not None:
-            try:
-                player.setPosition(0)
-                player.play()
-                return
-            except Exception:
-                pass
         sound_path = self._effect_sound_files.get(key)
         if sound_path is not None:
+            player = self._sound_player(self._effect_sound_players, self._effect_audio_outputs, key, sound_path, 0.95)
+            if player is not None:
+                try:
+                    player.setPosition(0)
+                    player.play()
+                    return
+                except Exception:
+                    pass
             self._play_mode_sound_fallback(sound_path)
             return
         if key == "focus_complete":
@@ -797,13 +870,45 @@ class _DugongWindow(QtWidgets.QWidget):
             return legacy_default
         return self._assets_root
 
-    def _load_background(self, assets_dir: Path) -> QtGui.QPixmap:
-        bg = QtGui.QPixmap(str(assets_dir / "bg_ocean.png"))
+    def _load_background_image(self, assets_dir: Path) -> QtGui.QImage:
+        # Worker thread.
+        bg = QtGui.QImage(str(assets_dir / "bg_ocean.png"))
         if bg.isNull() and assets_dir != self._assets_root:
-            bg = QtGui.QPixmap(str(self._assets_root / "bg_ocean.png"))
-        if not bg.isNull():
-            return bg
+            bg = QtGui.QImage(str(self._assets_root / "bg_ocean.png"))
+        return bg
+
+    def _on_background_decoded(self, image: object, error: Exception | None) -> None:
+        if error is not None or not isinstance(image, QtGui.QImage) or image.isNull():
+            return
+        self._bg_src = QtGui.QPixmap.fromImage(image)
+        self._bg_scaled = self._bg_src.scaledToHeight(max(1, self.height()), QtCore.Qt.SmoothTransformation)
+        self.update()
+
+    def _request_shop_bg(self) -> None:
+        if self._asset_loader.is_pending(("shop_bg",)):
+            return
+        self._request_asset(
+            ("shop_bg",),
+            lambda: QtGui.QImage(str(self._assets_root / "dugong_shop.png")),
+            self._on_shop_bg_decoded,
+        )
+
+    def _on_shop_bg_decoded(self, image: object, error: Exception | None) -> None:
+        if error is None and isinstance(image, QtGui.QImage) and not image.isNull() and self._shop_bg_src.isNull():
+            self._shop_bg_src = QtGui.QPixmap.fromImage(image)
+        label = self._shop_bg_label
+        if label is None or self._shop_bg_src.isNull():
+            return
+        # A shop opened before the decode shows a placeholder panel; fill it in.
+        try:
+            label.setPixmap(
+                self._shop_bg_src.scaled(label.size(), QtCore.Qt.IgnoreAspectRatio, QtCore.Qt.SmoothTransformation)
+            )
+        except RuntimeError:
+            pass  # dialog closed before the decode finished
+        self._shop_bg_label = None
 
+    def _fallback_background(self) -> QtGui.QPixmap:
         fallback = QtGui.QPixmap(1920, self._target_height)
         fallback.fill(QtCore.Qt.transparent)
         painter = QtGui.QPainter(fallback)
@@ -814,22 +919,31 @@ class _DugongWindow(QtWidgets.QWidget):
         painter.end()
         return fallback
 
-    def _load_asset_image_candidates(self, candidates: list[Path]) -> QtGui.QPixmap:
+    def _load_asset_image_candidates(self, candidates: list[Path]) -> QtGui.QImage:
+        # Worker thread: the per-pixel cleanup below is the slow part of startup.
         for path in candidates:
             try:
-                pm = QtGui.QPixmap(str(path))
-                if not pm.isNull():
-                    cleaned = self._strip_light_background(pm)
+                img = QtGui.QImage(str(path))
+                if not img.isNull():
+                    cleaned = self._strip_light_background(img)
                     trimmed = self._trim_transparent_bounds(cleaned)
                     return trimmed if not trimmed.isNull() else cleaned
             except Exception:
                 continue
-        return QtGui.QPixmap()
+        return QtGui.QImage()
 
-    def _trim_transparent_bounds(self, pixmap: QtGui.QPixmap) -> QtGui.QPixmap:
-        if pixmap.isNull():
-            return pixmap
-        img = pixmap.toImage().convertToFormat(QtGui.QImage.Format_ARGB32)
+    def _request_icon(self, attr: str, candidates: list[Path]) -> None:
+        def apply(image: object, error: Exception | None) -> None:
+            if error is None and isinstance(image, QtGui.QImage) and not image.isNull():
+                setattr(self, f"_{attr}", QtGui.QPixmap.fromImage(image))
+                self.update()
+
+        self._request_asset(("icon", attr), lambda: self._load_asset_image_candidates(candidates), apply)
+
+    def _trim_transparent_bounds(self, image: QtGui.QImage) -> QtGui.QImage:
+        if image.isNull():
+            return image
+        img = image.convertToFormat(QtGui.QImage.Format_ARGB32)
         w = img.width()
         h = img.height()
         min_x = w
@@ -848,14 +962,40 @@ class _DugongWindow(QtWidgets.QWidget):
                     if y > max_y:
                         max_y = y
         if max_x < min_x or max_y < min_y:
-            return pixmap
-        cropped = img.copy(min_x, min_y, (max_x - min_x + 1), (max_y - min_y + 1))
-        return QtGui.QPixmap.fromImage(cropped)
+            return image
+        return img.copy(min_x, min_y, (max_x - min_x + 1), (max_y - min_y + 1))
 
     def _compose_pearl_icon(self, size: int) -> QtGui.QPixmap:
         if self._pearl_icon_src.isNull():
             return QtGui.QPixmap()
         s = max(8, int(size))
+        key = ("pearl", s, int(self._pearl_icon_src.cacheKey()))
+        return self._glyph_cache.get_or_build(key, lambda: self._render_pearl_icon(s))
+
+    def _render_reward_text(self, text: str, dpr: float) -> tuple[QtGui.QPixmap, int, int, int, int]:
+        """Shadowed reward text; (pixmap, baseline origin x/y, logical w/h)."""
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(QtGui.QFont.DemiBold)
+        br = QtGui.QFontMetrics(font).boundingRect(text)
+        w = br.width() + 3
+        h = br.height() + 3
+        ox = 1 - br.x()
+        oy = 1 - br.y()
+        pm = QtGui.QPixmap(max(1, math.ceil(w * dpr)), max(1, math.ceil(h * dpr)))
+        pm.setDevicePixelRatio(dpr)
+        pm.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(pm)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        painter.setFont(font)
+        painter.setPen(QtGui.QColor(12, 26, 38))
+        painter.drawText(ox + 1, oy + 1, text)
+        painter.setPen(QtGui.QColor(170, 255, 225))
+        painter.drawText(ox, oy, text)
+        painter.end()
+        return pm, ox, oy, w, h
+
+    def _render_pearl_icon(self, s: int) -> QtGui.QPixmap:
         base = self._pearl_icon_src.scaled(
             s,
             s,
@@ -879,10 +1019,10 @@ class _DugongWindow(QtWidgets.QWidget):
         painter.end()
         return out
 
-    def _strip_light_background(self, pixmap: QtGui.QPixmap) -> QtGui.QPixmap:
-        if pixmap.isNull():
-            return pixmap
-        img = pixmap.toImage().convertToFormat(QtGui.QImage.Format_ARGB32)
+    def _strip_light_background(self, image: QtGui.QImage) -> QtGui.QImage:
+        if image.isNull():
+            return image
+        img = image.convertToFormat(QtGui.QImage.Format_ARGB32)
         w = img.width()
         h = img.height()
         for y in range(h):
@@ -900,7 +1040,7 @@ class _DugongWindow(QtWidgets.QWidget):
                 ):
                     c.setAlpha(0)
                     img.setPixelColor(x, y, c)
-        return QtGui.QPixmap.fromImage(img)
+        return img
 
     def _list_pngs(self, assets_dir: Path) -> list[Path]:
         if not assets_dir.exists():
@@ -908,7 +1048,7 @@ class _DugongWindow(QtWidgets.QWidget):
         files = [
             path
             for path in assets_dir.iterdir()
-            if path.is_file() and path.suffix.lower() == ".png"
+            if path.is_file() and path.suffix.lower() == ".png" and path.name != ATLAS_TEXTURE
         ]
         if files:
             return files
@@ -930,28 +1070,83 @@ class _DugongWindow(QtWidgets.QWidget):
 
         return sorted(paths, key=key_fn)
 
-    def _load_pixmaps(self, paths: list[Path]) -> list[QtGui.QPixmap]:
-        pixmaps: list[QtGui.QPixmap] = []
+    def _load_pixmaps(self, paths: list[Path], as_image: bool = False) -> list:
+        # as_image=True decodes QImages (safe on the asset worker thread).
+        image_cls = QtGui.QImage if as_image else QtGui.QPixmap
+        pixmaps: list = []
         for path in paths:
-            pm = QtGui.QPixmap(str(path))
+            pm = image_cls(str(path))
             if not pm.isNull():
                 pixmaps.append(pm)
         return pixmaps
 
-    def _load_by_prefix(self, assets_dir: Path, prefix: str) -> list[QtGui.QPixmap]:
+    def _load_sprite_atlas(self, assets_dir: Path, as_image: bool = False) -> dict[str, list] | None:
+        # One decode for the whole skin; frames are sliced out and padded back to
+        # their source canvas so scaling matches the loose-PNG path exactly.
+        manifest = load_atlas_manifest(assets_dir)
+        if manifest is None:
+            return None
+        texture = (QtGui.QImage if as_image else QtGui.QPixmap)(str(assets_dir / ATLAS_TEXTURE))
+        if texture.isNull():
+            return None
+        sliced: dict[str, object] = {}
+        groups: dict[str, list] = {}
+        for prefix, frames in manifest["groups"].items():
+            out: list = []
+            for frame in frames:
+                name = str(frame.get("name", ""))
+                pm = sliced.get(name)
+                if pm is None:
+                    x, y, w, h = frame["rect"]
+                    ox, oy = frame["offset"]
+                    sw, sh = frame["source_size"]
+                    pm = texture.copy(x, y, w, h)
+                    if (ox, oy, w, h) != (0, 0, sw, sh):
+                        if as_image:
+                            canvas = QtGui.QImage(sw, sh, QtGui.QImage.Format_ARGB32_Premultiplied)
+                        else:
+                            canvas = QtGui.QPixmap(sw, sh)
+                        canvas.fill(QtCore.Qt.transparent)
+                        painter = QtGui.QPainter(canvas)
+                        if as_image:
+                            painter.drawImage(ox, oy, pm)
+                        else:
+                            painter.drawPixmap(ox, oy, pm)
+                        painter.end()
+                        pm = canvas
+                    sliced[name] = pm
+                out.append(pm)
+            groups[str(prefix).lower()] = out
+        return groups
+
+    def _load_by_prefix(
+        self, assets_dir: Path, prefix: str, atlas: dict[str, list] | None = None, as_image: bool = False
+    ) -> list:
         prefix_l = prefix.lower()
+        if atlas is not None:
+            return list(atlas.get(prefix_l, []))
         files = [p for p in self._list_pngs(assets_dir) if p.stem.lower().startswith(prefix_l)]
-        return self._load_pixmaps(self._sort_with_trailing_number(files))
+        return self._load_pixmaps(self._sort_with_trailing_number(files), as_image=as_image)
 
     def _load_character_assets(
-        self, assets_dir: Path
-    ) -> tuple[dict[str, list[QtGui.QPixmap]], dict[str, list[QtGui.QPixmap]]]:
-        swim = self._load_by_prefix(assets_dir, "Swim_loop")
-        idle = self._load_by_prefix(assets_dir, "Idle_loop")
-        turn = self._load_by_prefix(assets_dir, "Turn")
+        self, assets_dir: Path, as_image: bool = False, swim_only: bool = False
+    ) -> tuple[dict[str, list], dict[str, list]]:
+        atlas = self._load_sprite_atlas(assets_dir, as_image=as_image)
+        if atlas is not None:
+            # The atlas already holds every set; a swim-only pass would save nothing.
+            swim_only = False
+
+        def load(prefix: str) -> list:
+            if swim_only and prefix not in {"Swim_loop", "seal_"}:
+                return []
+            return self._load_by_prefix(assets_dir, prefix, atlas, as_image=as_image)
+
+        swim = load("Swim_loop")
+        idle = load("Idle_loop")
+        turn = load("Turn")
 
         if not swim:
-            swim = self._load_by_prefix(assets_dir, "seal_")
+            swim = load("seal_")
 
         if not idle:
             idle = list(swim)
@@ -961,14 +1156,14 @@ class _DugongWindow(QtWidgets.QWidget):
         if not swim:
             raise RuntimeError("No character frames found in ui/assets (Swim_loop* or seal_*).")
 
-        react_study = self._load_by_prefix(assets_dir, "React_study")
-        react_chill = self._load_by_prefix(assets_dir, "React_chill")
-        react_rest = self._load_by_prefix(assets_dir, "React_rest")
+        react_study = load("React_study")
+        react_chill = load("React_chill")
+        react_rest = load("React_rest")
 
         # Legacy aliases (older naming)
-        react_happy = self._load_by_prefix(assets_dir, "React_happy")
-        react_dumb = self._load_by_prefix(assets_dir, "React_dumb")
-        react_shock = self._load_by_prefix(assets_dir, "React_shock")
+        react_happy = load("React_happy")
+        react_dumb = load("React_dumb")
+        react_shock = load("React_shock")
 
         default_react = [idle[0] if idle else swim[0]]
         react = {
@@ -989,6 +1184,73 @@ class _DugongWindow(QtWidgets.QWidget):
         }
         return frames, react
 
+    def _placeholder_character_assets(self) -> tuple[dict[str, list[QtGui.QPixmap]], dict[str, list[QtGui.QPixmap]]]:
+        # Soft silhouette painted while the real skin decodes.
+        pm = QtGui.QPixmap(240, 150)
+        pm.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(pm)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(QtGui.QColor(170, 205, 225, 110))
+        painter.drawEllipse(QtCore.QRectF(20, 40, 170, 80))
+        painter.drawEllipse(QtCore.QRectF(170, 62, 50, 36))
+        painter.end()
+        frames = [pm]
+        return (
+            {"swim": frames, "idle": frames, "turn": frames},
+            {key: frames for key in ("study", "chill", "rest", "happy", "dumb", "shock")},
+        )
+
+    def _images_to_pixmaps(self, bundle: tuple[dict[str, list], dict[str, list]]) -> tuple[dict[str, list], dict[str, list]]:
+        # GUI thread: convert each decoded QImage once, keeping shared frames shared.
+        converted: dict[int, QtGui.QPixmap] = {}
+
+        def convert(images: list) -> list[QtGui.QPixmap]:
+            out: list[QtGui.QPixmap] = []
+            for img in images:
+                pm = converted.get(id(img))
+                if pm is None:
+                    pm = QtGui.QPixmap.fromImage(img)
+                    converted[id(img)] = pm
+                out.append(pm)
+            return out
+
+        frames, react = bundle
+        return {k: convert(v) for k, v in frames.items()}, {k: convert(v) for k, v in react.items()}
+
+    def _request_asset(
+        self, key: tuple, decode: Callable[[], object], on_ready: Callable[[object, Exception | None], None]
+    ) -> None:
+        self._asset_handlers.setdefault(key, []).append(on_ready)
+        self._asset_loader.submit(key, decode)
+        if not self._asset_timer.isActive():
+            self._asset_timer.start()
+
+    def _drain_asset_results(self) -> None:
+        for key, value, error in self._asset_loader.drain(max_items=4):
+            for handler in self._asset_handlers.pop(key, []):
+                handler(value, error)
+        if self._asset_loader.pending_count() == 0 and not self._asset_handlers:
+            self._asset_timer.stop()
+
+    def _request_skin_frames(self, assets_dir: Path, on_ready: Callable[[bool], None]) -> None:
+        key = str(assets_dir)
+        if key in self._decode_cache:
+            on_ready(True)
+            return
+
+        def done(images: object, error: Exception | None) -> None:
+            if error is None and isinstance(images, tuple) and key not in self._decode_cache:
+                pixmaps = self._images_to_pixmaps(images)
+                self._decode_cache.get_or_build(key, lambda: pixmaps)
+            on_ready(key in self._decode_cache)
+
+        self._request_asset(
+            ("skin", key),
+            lambda: self._load_character_assets(assets_dir, as_image=True),
+            done,
+        )
+
     # -------- geometry / layout ----------
     def _apply_screen_width(self) -> None:
         screen = QtGui.QGuiApplication.primaryScreen()
@@ -1037,41 +1299,72 @@ class _DugongWindow(QtWidgets.QWidget):
         transform = QtGui.QTransform().scale(-1.0, 1.0)
         return [pm.transformed(transform) for pm in frames]
 
-    def _build_scaled_bundle(
-        self,
-        frames_raw: dict[str, list[QtGui.QPixmap]],
-        react_raw: dict[str, list[QtGui.QPixmap]],
-        target_h: int,
-    ) -> tuple[dict[str, dict[str, list[QtGui.QPixmap]]], dict[str, dict[str, list[QtGui.QPixmap]]]]:
-        right_frames = {
-            key: self._scale_and_pad(frames, target_h)
-            for key, frames in frames_raw.items()
-        }
-        right_reacts = {
-            key: self._scale_and_pad(frames, target_h)
-            for key, frames in react_raw.items()
-        }
-        frames_scaled = {
-            "right": right_frames,
-            "left": {key: self._mirror_frames(frames) for key, frames in right_frames.items()},
-        }
-        reacts_scaled = {
-            "right": right_reacts,
-            "left": {key: self._mirror_frames(frames) for key, frames in right_reacts.items()},
-        }
-        return frames_scaled, reacts_scaled
+    def _skin_raw_assets(
+        self, assets_dir: Path
+    ) -> tuple[dict[str, list[QtGui.QPixmap]], dict[str, list[QtGui.QPixmap]]]:
+        if assets_dir == self._placeholder_dir:
+            return self._decode_cache.get_or_build(str(assets_dir), self._placeholder_character_assets)
+        return self._decode_cache.get_or_build(str(assets_dir), lambda: self._load_character_assets(assets_dir))
+
+    def _acquire_scaled_bundle(
+        self, assets_dir: Path, target_h: int
+    ) -> tuple[dict[str, dict[str, list[QtGui.QPixmap]]], dict[str, dict[str, list[QtGui.QPixmap]]], tuple]:
+        # Cache key: (skin, target_h, direction). Skins that resolve to the same
+        # assets dir (e.g. unknown ids falling back to default) share one entry.
+        skin_key = str(assets_dir)
+        h = max(1, int(target_h))
+        right_key = (skin_key, h, "right")
+        left_key = (skin_key, h, "left")
+
+        def build_right() -> tuple[dict[str, list[QtGui.QPixmap]], dict[str, list[QtGui.QPixmap]]]:
+            frames_raw, react_raw = self._skin_raw_assets(assets_dir)
+            return (
+                {key: self._scale_and_pad(frames, h) for key, frames in frames_raw.items()},
+                {key: self._scale_and_pad(frames, h) for key, frames in react_raw.items()},
+            )
+
+        right_frames, right_reacts = self._sprite_cache.acquire(right_key, build_right)
+        left_frames, left_reacts = self._sprite_cache.acquire(
+            left_key,
+            lambda: (
+                {key: self._mirror_frames(frames) for key, frames in right_frames.items()},
+                {key: self._mirror_frames(frames) for key, frames in right_reacts.items()},
+            ),
+        )
+        frames_scaled = {"right": right_frames, "left": left_frames}
+        reacts_scaled = {"right": right_reacts, "left": left_reacts}
+        return frames_scaled, reacts_scaled, (right_key, left_key)
 
-    def _peer_set_skin(self, peer: dict[str, float | str], skin_id: str, target_h: int) -> None:
+    def _release_sprite_keys(self, keys: object) -> None:
+        if not isinstance(keys, tuple):
+            return
+        for key in keys:
+            self._sprite_cache.release(key)
+
+    def _peer_set_skin(self, peer: PeerRecord, skin_id: str, target_h: int) -> None:
         skin_assets_dir = self._resolve_skin_assets_dir(self._skin_root, skin_id)
-        peer_frames_raw, peer_react_raw = self._load_character_assets(skin_assets_dir)
-        frames_scaled, reacts_scaled = self._build_scaled_bundle(peer_frames_raw, peer_react_raw, target_h)
-        peer["skin_id"] = skin_id
-        peer["frames_scaled"] = frames_scaled
-        peer["react_scaled"] = reacts_scaled
-        if not str(peer.get("react_kind", "")).strip():
-            peer["react_kind"] = "chill"
-        if "react_until" not in peer:
-            peer["react_until"] = 0.0
+        if str(skin_assets_dir) not in self._decode_cache:
+            # Show the placeholder now; the real frames swap in once decoded.
+            source = peer.source
+            self._request_skin_frames(
+                skin_assets_dir, lambda ok, src=source, sid=skin_id: self._on_peer_skin_ready(src, sid, ok)
+            )
+            skin_assets_dir = self._placeholder_dir
+        frames_scaled, reacts_scaled, keys = self._acquire_scaled_bundle(skin_assets_dir, target_h)
+        self._release_sprite_keys(peer.sprite_keys)
+        peer.skin_id = skin_id
+        peer.frames_scaled = frames_scaled
+        peer.react_scaled = reacts_scaled
+        peer.sprite_keys = keys
+        if not peer.react_kind.strip():
+            peer.react_kind = "chill"
+
+    def _on_peer_skin_ready(self, source: str, skin_id: str, ok: bool) -> None:
+        peer = self._peer_entities.get(source)
+        if not ok or peer is None or peer.skin_id != skin_id:
+            return
+        self._peer_set_skin(peer, skin_id, int(self.height() * 0.36))
+        self.update()
 
     def _rebuild_scaled_pixmaps(self) -> None:
         h = self.height()
@@ -1080,14 +1373,12 @@ class _DugongWindow(QtWidgets.QWidget):
 
         target_h = int(h * 0.36)
 
-        self._local_frames_scaled, self._local_react_scaled = self._build_scaled_bundle(
-            self._local_frames_raw,
-            self._local_react_raw,
-            target_h,
-        )
+        frames_scaled, reacts_scaled, keys = self._acquire_scaled_bundle(self._local_sprite_dir, target_h)
+        self._release_sprite_keys(self._local_sprite_keys)
+        self._local_frames_scaled, self._local_react_scaled = frames_scaled, reacts_scaled
+        self._local_sprite_keys = keys
         for peer in self._peer_entities.values():
-            skin_id = str(peer.get("skin_id", "default")) or "default"
-            self._peer_set_skin(peer, skin_id, target_h)
+            self._peer_set_skin(peer, peer.skin_id or "default", target_h)
 
     def _layout_overlay(self) -> None:
         self._quit_top.move(8, 8)
@@ -1271,48 +1562,25 @@ class _DugongWindow(QtWidgets.QWidget):
             return True
         return False
 
-    def _new_peer(self, source: str, frame: QtGui.QPixmap) -> dict[str, float | str]:
+    def _new_peer(self, source: str, frame: QtGui.QPixmap) -> PeerRecord:
         min_x, max_x, min_y, max_y = self._motion_bounds(frame)
-        x = random.uniform(min_x, max_x)
-        y = random.uniform(min_y, max_y)
-        target_x = random.uniform(min_x, max_x)
-        target_y = random.uniform(min_y, max_y)
-        vx = random.choice([-1.0, 1.0]) * random.uniform(1.1, 1.8)
-        return {
-            "source": source,
-            "x": x,
-            "y": y,
-            "target_x": target_x,
-            "target_y": target_y,
-            "vx": vx,
-            "vy": 0.0,
-            "speed": random.uniform(1.0, 1.9),
-            "mode": "unknown",
-            "last_seen": time.time(),
-            "float_phase": random.uniform(0.0, 6.28),
-            "react_kind": "chill",
-            "react_until": 0.0,
-            "skin_id": "default",
-            "last_event_id": "",
-            "last_event_type": "",
-            "pomo_phase": "",
-            "pearls": 0,
-            "today_pearls": 0,
-            "lifetime_pearls": 0,
-            "exp": 0,
-            "today_exp": 0,
-            "lifetime_exp": 0,
-            "level": 1,
-            "exp_in_level": 0,
-            "exp_to_next": 50,
-            "focus_streak": 0,
-            "day_streak": 0,
-            "title_id": "drifter",
-            "bubble_style": "default",
-        }
+        self._peer_kin.add(
+            source,
+            x=random.uniform(min_x, max_x),
+            y=random.uniform(min_y, max_y),
+            target_x=random.uniform(min_x, max_x),
+            target_y=random.uniform(min_y, max_y),
+            vx=random.choice([-1.0, 1.0]) * random.uniform(1.1, 1.8),
+            speed=random.uniform(1.0, 1.9),
+            float_phase=random.uniform(0.0, 6.28),
+        )
+        return PeerRecord(source, last_seen=time.time())
 
     def set_shared_entities(
-        self, entities: list[dict[str, str | float]], local_source: str | None = None
+        self,
+        entities: list[dict[str, str | float]],
+        local_source: str | None = None,
+        removed: list[str] | None = None,
     ) -> None:
         if local_source:
             self._local_source = local_source
@@ -1336,51 +1604,36 @@ class _DugongWindow(QtWidgets.QWidget):
                 self._peer_set_skin(peer, peer_skin_id, target_h=int(self.height() * 0.36))
             else:
                 peer_skin_id = self._resolve_skin_id(source, "auto")
-                if str(peer.get("skin_id", "default")) != peer_skin_id:
+                if peer.skin_id != peer_skin_id:
                     self._peer_set_skin(peer, peer_skin_id, target_h=int(self.height() * 0.36))
 
-            prev_mode = str(peer.get("mode", "unknown"))
-            prev_event_id = str(peer.get("last_event_id", ""))
-            peer["mode"] = str(entity.get("mode", peer.get("mode", "unknown")))
-            peer["pomo_phase"] = str(entity.get("pomo_phase", peer.get("pomo_phase", "")))
-            peer["last_seen"] = float(entity.get("last_seen", time.time()))
-            peer["last_event_type"] = str(entity.get("last_event_type", peer.get("last_event_type", "")))
-            peer["last_event_id"] = str(entity.get("last_event_id", peer.get("last_event_id", "")))
-            peer["pearls"] = int(entity.get("pearls", peer.get("pearls", 0)))
-            peer["today_pearls"] = int(entity.get("today_pearls", peer.get("today_pearls", 0)))
-            peer["lifetime_pearls"] = int(entity.get("lifetime_pearls", peer.get("lifetime_pearls", 0)))
-            peer["exp"] = int(entity.get("exp", peer.get("exp", 0)))
-            peer["today_exp"] = int(entity.get("today_exp", peer.get("today_exp", 0)))
-            peer["lifetime_exp"] = int(entity.get("lifetime_exp", peer.get("lifetime_exp", 0)))
-            peer["level"] = int(entity.get("level", peer.get("level", 1)))
-            peer["exp_in_level"] = int(entity.get("exp_in_level", peer.get("exp_in_level", 0)))
-            peer["exp_to_next"] = int(entity.get("exp_to_next", peer.get("exp_to_next", 50)))
-            peer["focus_streak"] = int(entity.get("focus_streak", peer.get("focus_streak", 0)))
-            peer["day_streak"] = int(entity.get("day_streak", peer.get("day_streak", 0)))
-            peer["title_id"] = str(entity.get("title_id", peer.get("title_id", "drifter")))
-            peer["bubble_style"] = str(entity.get("bubble_style", peer.get("bubble_style", "default")))
-            peer["online"] = float(entity.get("online", peer.get("online", 1.0)))
+            prev_mode = peer.mode
+            prev_event_id = peer.last_event_id
+            peer.apply_entity(entity, now=time.time())
 
             # Trigger remote reaction on every new remote event id (not only mode changes).
-            if peer["last_event_id"] and peer["last_event_id"] != prev_event_id:
-                evt_type = str(peer.get("last_event_type", ""))
-                if evt_type == "mode_change":
-                    mode = str(peer.get("mode", "chill"))
-                    if mode not in {"study", "chill", "rest"}:
-                        mode = "chill"
-                    peer["react_kind"] = mode
-                    peer["react_until"] = time.monotonic() + 2.0
-                elif evt_type == "manual_ping":
-                    peer["react_kind"] = "chill"
-                    peer["react_until"] = time.monotonic() + 1.2
-            elif peer["mode"] != prev_mode and peer["mode"] in {"study", "chill", "rest"}:
+            if peer.last_event_id and peer.last_event_id != prev_event_id:
+                if peer.last_event_type == "mode_change":
+                    mode = peer.mode if peer.mode in {"study", "chill", "rest"} else "chill"
+                    peer.react_kind = mode
+                    self._peer_kin.set(source, "react_until", time.monotonic() + 2.0)
+                elif peer.last_event_type == "manual_ping":
+                    peer.react_kind = "chill"
+                    self._peer_kin.set(source, "react_until", time.monotonic() + 1.2)
+            elif peer.mode != prev_mode and peer.mode in {"study", "chill", "rest"}:
                 # Fallback for compatibility if event id is unavailable.
-                peer["react_kind"] = str(peer["mode"])
-                peer["react_until"] = time.monotonic() + 2.0
+                peer.react_kind = peer.mode
+                self._peer_kin.set(source, "react_until", time.monotonic() + 2.0)
 
-        stale = [src for src in self._peer_entities if src not in current_sources]
+        if removed is None:
+            stale = [src for src in self._peer_entities if src not in current_sources]
+        else:
+            stale = [src for src in removed if src in self._peer_entities]
         for src in stale:
-            self._peer_entities.pop(src, None)
+            peer = self._peer_entities.pop(src, None)
+            if peer is not None:
+                self._release_sprite_keys(peer.sprite_keys)
+            self._peer_kin.remove(src)
             self._peer_anim_index.pop(src, None)
             self._peer_current_frame.pop(src, None)
 
@@ -1426,6 +1679,131 @@ class _DugongWindow(QtWidgets.QWidget):
             self._did_initial_center = True
         super().showEvent(e)
         self._position_shop_dialog()
+        self._wake_frames()
+
+    def changeEvent(self, e: QtCore.QEvent) -> None:
+        super().changeEvent(e)
+        if e.type() == QtCore.QEvent.WindowStateChange and not self.isMinimized():
+            self._wake_frames()
+
+    # -------- frame loop ----------
+    def _scene_busy(self) -> bool:
+        return bool(
+            self._peer_entities
+            or self._floating_rewards
+            or self._anim_mode in {"react", "turn"}
+            or self._celebration_turns_remaining > 0
+            or self._dragging
+            or self._hover_pos.x() >= 0
+        )
+
+    def _window_exposed(self) -> bool:
+        handle = self.windowHandle()
+        return handle is None or handle.isExposed()
+
+    def _wake_frames(self) -> None:
+        if not self._frame_timer.isActive():
+            self._frame_pacer.reset()
+            self._frame_timer.setInterval(self._world_tick_ms)
+            self._frame_timer.start()
+
+    def _on_frame(self) -> None:
+        interval = self._frame_pacer.interval_ms(
+            visible=self.isVisible() and not self.isMinimized(),
+            exposed=self._window_exposed(),
+            busy=self._scene_busy(),
+        )
+        if interval <= 0:
+            # Hidden/minimized: stop waking up; show/restore restarts the loop.
+            self._frame_timer.stop()
+            return
+        if self._frame_timer.interval() != interval:
+            self._frame_timer.setInterval(interval)
+        if self._frame_pacer.mode == PACE_OCCLUDED:
+            self._frame_pacer.reset()
+            return
+
+        world_steps, anim_steps = self._frame_pacer.advance()
+        if world_steps <= 0 and anim_steps <= 0:
+            return
+        if anim_steps > 0:
+            self._tick_dugong()
+        for _ in range(world_steps):
+            self._tick_world()
+        self._tick_bg(world_steps)
+        region = self._frame_dirty_region(animated=anim_steps > 0)
+        self._frame_pacer.record_frame(partial=region is not None)
+        if region is None:
+            self.update()
+        elif not region.isEmpty():
+            self.update(region)
+
+    def render_metrics(self) -> dict:
+        payload = self._frame_pacer.metrics()
+        payload["glyph_cache"] = self._glyph_cache.metrics()
+        return payload
+
+    def _scene_anchors(self) -> dict[object, tuple[int, int]] | None:
+        # None: something new appeared whose bounds we have never measured.
+        anchors: dict[object, tuple[int, int]] = {}
+        if not self._dugong_frame.isNull():
+            anchors["local"] = (int(self._x), int(self._y))
+        for item in self._floating_rewards:
+            paint_id = item.get("_paint_id")
+            if paint_id is None:
+                return None
+            anchors[("reward", paint_id)] = (int(float(item.get("x", 0.0))), int(float(item.get("y", 0.0))))
+        for source in self._peer_entities:
+            anchors[("peer", source)] = self._peer_kin.position(source)
+        return anchors
+
+    def _frame_dirty_region(self, animated: bool = False) -> QtGui.QRegion | None:
+        """Old + new bounds of everything that moved, or None for a full repaint.
+
+        `animated`: sprite frames advanced this tick, so every sprite is dirty
+        even if it stayed in place.
+        """
+        # A background step repaints everything: the window is translucent, so
+        # Qt cannot scroll its backing store. The pre-tiled strip keeps that to
+        # one blit; frames where the offset held still stay partial.
+        if self._hover_pos.x() >= 0 or self._bg_scroll.offset != self._painted_bg_offset:
+            return None
+        anchors = self._scene_anchors()
+        if anchors is None or any(key not in self._painted_bounds for key in anchors):
+            return None
+        region = QtGui.QRegion()
+        for key, (old_x, old_y, rect) in self._painted_bounds.items():
+            anchor = anchors.get(key)
+            if anchor is None:
+                region += rect  # gone: erase where it was
+                continue
+            dx, dy = anchor[0] - old_x, anchor[1] - old_y
+            sprite = key == "local" or (isinstance(key, tuple) and key[0] == "peer")
+            if dx or dy or (animated and sprite):
+                region += rect
+                region += rect.translated(dx, dy)
+        return region
+
+    def _background_strip(self) -> QtGui.QPixmap | None:
+        # Tiles pre-composited into one strip (window width + one tile) so each
+        # paint is a single clipped blit at the scroll offset.
+        bg = self._bg_scaled
+        if not bg or bg.isNull() or bg.width() <= 0:
+            return None
+        key = (int(bg.cacheKey()), int(self.width()))
+        if self._bg_strip is None or key != self._bg_strip_key:
+            bg_w = bg.width()
+            strip = QtGui.QPixmap(self.width() + bg_w, bg.height())
+            strip.fill(QtCore.Qt.transparent)
+            painter = QtGui.QPainter(strip)
+            x = 0
+            while x < strip.width():
+                painter.drawPixmap(x, 0, bg)
+                x += bg_w
+            painter.end()
+            self._bg_strip = strip
+            self._bg_strip_key = key
+        return self._bg_strip
 
     # -------- animation state ----------
     def _frame_list(
@@ -1434,7 +1812,7 @@ class _DugongWindow(QtWidgets.QWidget):
         direction: str,
         role: str = "local",
         react_kind: str | None = None,
-        peer: dict[str, float | str] | None = None,
+        peer: PeerRecord | None = None,
     ) -> list[QtGui.QPixmap]:
         if role == "local":
             frames_scaled = self._local_frames_scaled
@@ -1443,11 +1821,9 @@ class _DugongWindow(QtWidgets.QWidget):
         else:
             if peer is None:
                 return []
-            frames_scaled = peer.get("frames_scaled", {})
-            react_scaled = peer.get("react_scaled", {})
-            if not isinstance(frames_scaled, dict) or not isinstance(react_scaled, dict):
-                return []
-            rk = react_kind or str(peer.get("react_kind", "chill"))
+            frames_scaled = peer.frames_scaled
+            react_scaled = peer.react_scaled
+            rk = react_kind or peer.react_kind
 
         if anim == "react":
             by_dir = react_scaled.get(direction, {})
@@ -1465,7 +1841,7 @@ class _DugongWindow(QtWidgets.QWidget):
         direction: str,
         role: str = "local",
         react_kind: str | None = None,
-        peer: dict[str, float | str] | None = None,
+        peer: PeerRecord | None = None,
     ) -> str:
         if self._frame_list(anim, direction, role=role, react_kind=react_kind, peer=peer):
             return anim
@@ -1681,80 +2057,10 @@ class _DugongWindow(QtWidgets.QWidget):
         self._float_phase += 0.20
         self._y += math.sin(self._float_phase) * 0.25
 
-    def _step_peer_towards_target(self, frame: QtGui.QPixmap, peer: dict[str, float | str]) -> None:
-        min_x, max_x, min_y, max_y = self._motion_bounds(frame)
-        x = float(peer.get("x", min_x))
-        y = float(peer.get("y", min_y))
-        target_x = float(peer.get("target_x", x))
-        target_y = float(peer.get("target_y", y))
-        vx = float(peer.get("vx", 1.0))
-        old_sign = 1 if vx >= 0 else -1
-
-        if not (min_x <= target_x <= max_x and min_y <= target_y <= max_y):
-            target_x = random.uniform(min_x, max_x)
-            target_y = random.uniform(min_y, max_y)
-
-        dx = target_x - x
-        dy = target_y - y
-        dist = math.hypot(dx, dy)
-        if dist < 14:
-            target_x = random.uniform(min_x, max_x)
-            target_y = random.uniform(min_y, max_y)
-            dx = target_x - x
-            dy = target_y - y
-            dist = max(0.1, math.hypot(dx, dy))
-
-        speed = float(peer.get("speed", 1.4))
-        vx = (dx / dist) * speed
-        vy = (dy / dist) * speed
-        if abs(vx) < 0.05:
-            vx = 0.05 if dx >= 0 else -0.05
-
-        x += vx
-        y += vy
-
-        if x < min_x:
-            x = min_x
-            target_x = random.uniform(min_x, max_x)
-            target_y = random.uniform(min_y, max_y)
-        elif x > max_x:
-            x = max_x
-            target_x = random.uniform(min_x, max_x)
-            target_y = random.uniform(min_y, max_y)
-
-        if y < min_y:
-            y = min_y
-            target_x = random.uniform(min_x, max_x)
-            target_y = random.uniform(min_y, max_y)
-        elif y > max_y:
-            y = max_y
-            target_x = random.uniform(min_x, max_x)
-            target_y = random.uniform(min_y, max_y)
-
-        phase = float(peer.get("float_phase", 0.0)) + 0.12
-        y += math.sin(phase) * 0.2
-
-        peer["x"] = x
-        peer["y"] = y
-        peer["target_x"] = target_x
-        peer["target_y"] = target_y
-        peer["vx"] = vx
-        peer["vy"] = vy
-        peer["float_phase"] = phase
-        old_facing = str(peer.get("facing", "right"))
-        if vx > 0.28:
-            facing = "right"
-        elif vx < -0.28:
-            facing = "left"
-        else:
-            facing = old_facing
-        peer["facing"] = facing
-        peer["turning"] = 1.0 if (1 if vx >= 0 else -1) != old_sign else 0.0
-
-    def _next_peer_frame(self, source: str, direction: str, peer: dict[str, float | str]) -> QtGui.QPixmap:
+    def _next_peer_frame(self, source: str, direction: str, peer: PeerRecord) -> QtGui.QPixmap:
         now = time.monotonic()
-        react_until = float(peer.get("react_until", 0.0))
-        react_kind = str(peer.get("react_kind", "chill"))
+        react_until = self._peer_kin.get(source, "react_until")
+        react_kind = peer.react_kind
         if react_until > now:
             anim = "react"
         else:
@@ -1775,13 +2081,9 @@ class _DugongWindow(QtWidgets.QWidget):
     def _tick_dugong(self) -> None:
         self._update_frame()
         for source, peer in self._peer_entities.items():
-            direction = str(peer.get("facing", "right"))
-            if direction not in {"left", "right"}:
-                direction = "right"
-            pm = self._next_peer_frame(source, direction, peer)
+            pm = self._next_peer_frame(source, self._peer_kin.facing(source), peer)
             if not pm.isNull():
                 self._peer_current_frame[source] = pm
-        self.update()
 
     def _tick_world(self) -> None:
         current = self._dugong_frame
@@ -1817,25 +2119,17 @@ class _DugongWindow(QtWidgets.QWidget):
         if self._anim_mode == "swim":
             self._step_towards_target(current)
 
-        now = time.monotonic()
-        for peer in self._peer_entities.values():
-            # Keep peer stationary while its react clip is playing.
-            if float(peer.get("react_until", 0.0)) > now:
-                continue
-            self._step_peer_towards_target(current, peer)
+        if len(self._peer_kin):
+            min_x, max_x, min_y, max_y = self._motion_bounds(current)
+            self._peer_kin.step(min_x, max_x, min_y, max_y, now=time.monotonic())
 
         self._tick_floating_rewards()
         self._position_bubble_near_mouth()
-        self.update()
 
-    def _tick_bg(self) -> None:
+    def _tick_bg(self, steps: int = 1) -> None:
         if not self._bg_scaled:
             return
-        bg_w = self._bg_scaled.width()
-        if bg_w <= 0:
-            return
-        self._bg_offset = (self._bg_offset + self._bg_speed_px) % bg_w
-        self.update()
+        self._bg_scroll.advance(steps, self._bg_scaled.width())
 
     def _draw_name_tag(
         self,
@@ -1848,20 +2142,35 @@ class _DugongWindow(QtWidgets.QWidget):
         anchor_w: int,
         anchor_h: int,
         title_text: str | None = None,
-    ) -> None:
+    ) -> QtCore.QRect:
         name = (source or "").strip()
         if not name:
-            return
+            return QtCore.QRect()
         name_text = name if len(name) <= 14 else f"{name[:13]}…"
         title = (title_text or "").strip()
         if not title and is_local:
             title = self._title_label(self._equipped_title_id)
         title = title if len(title) <= 16 else f"{title[:15]}…"
 
+        dpr = float(self.devicePixelRatioF())
+        pm, total_w, total_h = self._glyph_cache.get_or_build(
+            ("tag", name_text, title, bool(is_local), dpr),
+            lambda: self._render_name_tag(name_text, title, is_local, dpr),
+        )
+        center_x = x + (anchor_w // 2)
+        # PNG has transparent top padding; anchor label closer to visible head area.
+        head_anchor_y = y + int(anchor_h * 0.10)
+        ry = head_anchor_y - total_h - 1
+        left = center_x - (total_w // 2)
+        painter.drawPixmap(left - 1, ry - 1, pm)
+        return QtCore.QRect(left, ry, total_w, total_h).adjusted(-1, -1, 1, 1)
+
+    def _render_name_tag(
+        self, name_text: str, title: str, is_local: bool, dpr: float
+    ) -> tuple[QtGui.QPixmap, int, int]:
         font = QtGui.QFont()
         font.setPointSize(8 if not is_local else 9)
         font.setWeight(QtGui.QFont.DemiBold)
-        painter.setFont(font)
         metrics = QtGui.QFontMetrics(font)
         pad_x = 8
         pad_y = 3
@@ -1879,11 +2188,16 @@ class _DugongWindow(QtWidgets.QWidget):
             title_w = tmetrics.horizontalAdvance(title) + 12
             title_h = tmetrics.height() + 4
         total_w = max(name_w, title_w) if title else name_w
-        center_x = x + (anchor_w // 2)
-        # PNG has transparent top padding; anchor label closer to visible head area.
-        head_anchor_y = y + int(anchor_h * 0.10)
         total_h = name_h + (title_h + 3 if title else 0)
-        ry = head_anchor_y - total_h - 1
+        # 1px margin around the tag so the border pen is not clipped.
+        pm = QtGui.QPixmap(max(1, math.ceil((total_w + 2) * dpr)), max(1, math.ceil((total_h + 2) * dpr)))
+        pm.setDevicePixelRatio(dpr)
+        pm.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(pm)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        painter.setFont(font)
+        center_x = 1 + (total_w // 2)
+        ry = 1
 
         bg = QtGui.QColor(21, 42, 66, 190) if is_local else QtGui.QColor(26, 58, 92, 168)
         border = QtGui.QColor(169, 225, 255, 180) if is_local else QtGui.QColor(150, 200, 235, 140)
@@ -1913,6 +2227,8 @@ class _DugongWindow(QtWidgets.QWidget):
         painter.drawRoundedRect(name_x, name_y, name_w, name_h, 8, 8)
         painter.setPen(QtGui.QPen(fg))
         painter.drawText(name_x + pad_x, name_y + pad_y + metrics.ascent(), name_text)
+        painter.end()
+        return pm, total_w, total_h
 
     def _stage_from_pearls(self, pearls: int) -> tuple[str, str]:
         if pearls >= 1000:
@@ -2045,16 +2361,12 @@ class _DugongWindow(QtWidgets.QWidget):
             return None
 
         # Prioritize peer entities so overlapping local sprite does not block.
-        for source, peer in reversed(sorted(self._peer_entities.items(), key=lambda x: x[0])):
+        for source in reversed(sorted(self._peer_entities)):
             pm = self._peer_current_frame.get(source)
             if pm is None or pm.isNull():
                 continue
-            rect = QtCore.QRect(
-                int(float(peer.get("x", 0.0))),
-                int(float(peer.get("y", 0.0))),
-                pm.width(),
-                pm.height(),
-            )
+            x, y = self._peer_kin.position(source)
+            rect = QtCore.QRect(x, y, pm.width(), pm.height())
             if rect.contains(self._hover_pos):
                 return ("peer", source, rect)
 
@@ -2085,13 +2397,12 @@ class _DugongWindow(QtWidgets.QWidget):
                 f"Streak: {self._focus_streak}  Day: {self._day_streak}",
             ]
         else:
-            peer = self._peer_entities.get(source, {})
-            mode = str(peer.get("mode", "unknown"))
-            phase = str(peer.get("pomo_phase", "")).lower() or "idle"
-            last_seen = float(peer.get("last_seen", time.time()))
-            age = max(0, int(time.time() - last_seen))
-            online = float(peer.get("online", 1.0)) > 0.0
-            title = self._title_label(str(peer.get("title_id", "drifter")))
+            peer = self._peer_entities.get(source) or PeerRecord(source, last_seen=time.time())
+            mode = peer.mode
+            phase = peer.pomo_phase.lower() or "idle"
+            age = max(0, int(time.time() - peer.last_seen))
+            online = peer.online > 0.0
+            title = self._title_label(peer.title_id)
             status_line = "Status: online" if online else f"Last seen: {age}s ago"
             lines = [
                 "[ALLY] Co-focus Partner",
@@ -2099,9 +2410,9 @@ class _DugongWindow(QtWidgets.QWidget):
                 f"Title: {title}",
                 f"Mode: {mode}  Pomo: {phase}",
                 status_line,
-                f"Pearls: {int(peer.get('pearls', 0))} (+{int(peer.get('today_pearls', 0))} today)",
-                f"Level: {int(peer.get('level', 1))}  EXP: {int(peer.get('exp_in_level', 0))}/{int(peer.get('exp_to_next', 50))}  Total: {int(peer.get('exp', 0))}",
-                f"Streak: {int(peer.get('focus_streak', 0))}  Day: {int(peer.get('day_streak', 0))}",
+                f"Pearls: {peer.pearls} (+{peer.today_pearls} today)",
+                f"Level: {peer.level}  EXP: {peer.exp_in_level}/{peer.exp_to_next}  Total: {peer.exp}",
+                f"Streak: {peer.focus_streak}  Day: {peer.day_streak}",
             ]
 
         font = QtGui.QFont()
@@ -2141,45 +2452,67 @@ class _DugongWindow(QtWidgets.QWidget):
             painter.drawText(x + pad_x, ly, line)
 
     # -------- paint ----------
-    def paintEvent(self, _e: QtGui.QPaintEvent) -> None:
+    def paintEvent(self, e: QtGui.QPaintEvent) -> None:
+        started = time.perf_counter()
+        self._paint_scene(e)
+        self._frame_pacer.record_paint((time.perf_counter() - started) * 1000.0)
+
+    def _paint_scene(self, e: QtGui.QPaintEvent) -> None:
         painter = QtGui.QPainter(self)
         painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
         painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform, True)
+        clip = e.rect()
+        painter.setClipRect(clip)
+        previous = self._painted_bounds
+        painted: dict[object, tuple[int, int, QtCore.QRect]] = {}
+
+        def skip(key: object, x: int, y: int) -> bool:
+            # Outside the dirty rect: keep its bounds (moved along) and don't draw.
+            old = previous.get(key)
+            if old is None:
+                return False
+            rect = old[2].translated(x - old[0], y - old[1])
+            if rect.intersects(clip):
+                return False
+            painted[key] = (x, y, rect)
+            return True
 
-        if self._bg_scaled:
-            bg = self._bg_scaled
-            bg_w = bg.width()
-            off = int(self._bg_offset)
-            x = -off
-            while x < self.width():
-                painter.drawPixmap(x, 0, bg)
-                x += bg_w
+        strip = self._background_strip()
+        if strip is not None:
+            off = self._bg_scroll.offset
+            painter.drawPixmap(clip, strip, clip.translated(off, 0))
+        self._painted_bg_offset = self._bg_scroll.offset
 
         if not self._dugong_frame.isNull():
-            painter.drawPixmap(int(self._x), int(self._y), self._dugong_frame)
-            self._draw_name_tag(
-                painter,
-                int(self._x),
-                int(self._y),
-                self._local_source,
-                is_local=True,
-                anchor_w=self._dugong_frame.width(),
-                anchor_h=self._dugong_frame.height(),
-                title_text=self._title_label(self._equipped_title_id),
-            )
+            lx, ly = int(self._x), int(self._y)
+            if not skip("local", lx, ly):
+                painter.drawPixmap(lx, ly, self._dugong_frame)
+                tag = self._draw_name_tag(
+                    painter,
+                    lx,
+                    ly,
+                    self._local_source,
+                    is_local=True,
+                    anchor_w=self._dugong_frame.width(),
+                    anchor_h=self._dugong_frame.height(),
+                    title_text=self._title_label(self._equipped_title_id),
+                )
+                bounds = QtCore.QRect(lx, ly, self._dugong_frame.width(), self._dugong_frame.height()).united(tag)
+                painted["local"] = (lx, ly, bounds.adjusted(-2, -2, 2, 2))
 
         if self._floating_rewards:
-            font = QtGui.QFont()
-            font.setPointSize(10)
-            font.setWeight(QtGui.QFont.DemiBold)
-            painter.setFont(font)
             for item in self._floating_rewards:
                 life = max(0.0, min(1.0, float(item.get("life", 0.0)) / 1.6))
                 alpha = int(255 * life)
                 x = int(float(item.get("x", 0.0)))
                 y = int(float(item.get("y", 0.0)))
+                key = ("reward", item.setdefault("_paint_id", next(self._paint_ids)))
+                if skip(key, x, y):
+                    continue
                 if str(item.get("kind", "")) == "pearl_drop":
                     size = int(max(10, min(72, float(item.get("size", item.get("r", 10.0))))))
+                    # Reserve the full drop box even before the icon has decoded.
+                    painted[key] = (x, y, QtCore.QRect(x - size, y - size, size * 2, size * 2))
                     if self._pearl_icon_src.isNull():
                         continue
                     drop_pm = self._compose_pearl_icon(size)
@@ -2188,29 +2521,30 @@ class _DugongWindow(QtWidgets.QWidget):
                     painter.setOpacity(1.0)
                     continue
                 text = str(item.get("text", ""))
-                shadow = QtGui.QColor(12, 26, 38, alpha)
-                fg = QtGui.QColor(170, 255, 225, alpha)
-                painter.setPen(shadow)
-                painter.drawText(x + 1, y + 1, text)
-                painter.setPen(fg)
-                painter.drawText(x, y, text)
+                dpr = float(self.devicePixelRatioF())
+                text_pm, ox, oy, tw, th = self._glyph_cache.get_or_build(
+                    ("reward_text", text, dpr), lambda t=text, d=dpr: self._render_reward_text(t, d)
+                )
+                # Fade via opacity so one sprite serves every alpha step.
+                painter.setOpacity(alpha / 255.0)
+                painter.drawPixmap(x - ox, y - oy, text_pm)
+                painter.setOpacity(1.0)
+                painted[key] = (x, y, QtCore.QRect(x - ox, y - oy, tw, th).adjusted(-1, -1, 1, 1))
 
         for source, peer in sorted(self._peer_entities.items(), key=lambda x: x[0]):
             pm = self._peer_current_frame.get(source)
             if pm is None or pm.isNull():
-                direction = str(peer.get("facing", "right"))
-                if direction not in {"left", "right"}:
-                    direction = "right"
-                pm = self._next_peer_frame(source, direction, peer)
+                pm = self._next_peer_frame(source, self._peer_kin.facing(source), peer)
                 if not pm.isNull():
                     self._peer_current_frame[source] = pm
             if pm.isNull():
                 continue
-            x = int(float(peer.get("x", 0.0)))
-            y = int(float(peer.get("y", 0.0)))
+            x, y = self._peer_kin.position(source)
+            if skip(("peer", source), x, y):
+                continue
             painter.drawPixmap(x, y, pm)
-            peer_title = self._title_label(str(peer.get("title_id", "drifter")))
-            self._draw_name_tag(
+            peer_title = self._title_label(peer.title_id)
+            tag = self._draw_name_tag(
                 painter,
                 x,
                 y,
@@ -2220,7 +2554,10 @@ class _DugongWindow(QtWidgets.QWidget):
                 anchor_h=pm.height(),
                 title_text=peer_title,
             )
+            bounds = QtCore.QRect(x, y, pm.width(), pm.height()).united(tag)
+            painted[("peer", source)] = (x, y, bounds.adjusted(-2, -2, 2, 2))
 
+        self._painted_bounds = painted
         self._draw_hover_card(painter)
 
     # -------- hover ----------
@@ -2347,9 +2684,10 @@ class _DugongWindow(QtWidgets.QWidget):
         equipped_skin_id = str(stats.get("equipped_skin_id", self._equipped_skin_id))
         equipped_bubble_style = str(stats.get("equipped_bubble_style", self._equipped_bubble_style))
         equipped_title_id = str(stats.get("equipped_title_id", self._equipped_title_id))
-        owned_skins = stats.get("shop_owned_skins", [])
-        owned_bubbles = stats.get("shop_owned_bubbles", [])
-        owned_titles = stats.get("shop_owned_titles", [])
+        # Partial updates omit unchanged keys; missing owned lists keep the current sets.
+        owned_skins = stats.get("shop_owned_skins")
+        owned_bubbles = stats.get("shop_owned_bubbles")
+        owned_titles = stats.get("shop_owned_titles")
 
         delta = pearls - self._pearls_total
         if delta > 0:
@@ -2384,6 +2722,7 @@ class _DugongWindow(QtWidgets.QWidget):
             self._apply_local_skin(equipped_skin_id)
         self._update_pearl_text()
         self._layout_overlay()
+        self.update()  # name-tag titles may have changed size
 
     def _spawn_reward_float(self, gain: int) -> None:
         if self._dugong_frame.isNull():
@@ -2437,26 +2776,66 @@ class _DugongWindow(QtWidgets.QWidget):
             alive.append(item)
         self._floating_rewards = alive
 
-    def _apply_local_skin(self, skin_id: str) -> None:
+    def _apply_local_skin(self, skin_id: str, progressive: bool = False) -> None:
+        # Decoding never blocks the GUI thread: the current skin keeps animating
+        # until the new frames arrive, then they are swapped in.
         sid = (skin_id or "").strip()
-        if not sid:
+        if not sid or sid == self._local_skin_request:
             return
+        self._local_skin_request = sid
         assets_dir = self._resolve_skin_assets_dir(self._skin_root, sid)
-        try:
-            frames_raw, react_raw = self._load_character_assets(assets_dir)
-        except Exception:
+        key = str(assets_dir)
+        if progressive and key not in self._decode_cache:
+            # First paint: swim frames alone are enough to start animating.
+            def swim_ready(images: object, error: Exception | None) -> None:
+                if error is not None or not isinstance(images, tuple):
+                    return
+                if self._local_sprite_dir != self._placeholder_dir or self._local_skin_request != sid:
+                    return
+                pixmaps = self._images_to_pixmaps(images)
+                if not pixmaps[0].get("swim"):
+                    return
+                self._decode_cache.get_or_build(key + "#swim", lambda: pixmaps)
+                self._set_local_sprite_dir(Path(key + "#swim"), sid)
+
+            self._request_asset(
+                ("skin_swim", key),
+                lambda: self._load_character_assets(assets_dir, as_image=True, swim_only=True),
+                swim_ready,
+            )
+        self._request_skin_frames(assets_dir, lambda ok: self._on_local_skin_ready(sid, assets_dir, ok))
+
+    def _on_local_skin_ready(self, sid: str, assets_dir: Path, ok: bool) -> None:
+        if sid != self._local_skin_request:
+            return  # superseded by a newer equip
+        self._local_skin_request = ""
+        if not ok:
             return
+        self._local_skin_assets_dir = assets_dir
+        self._set_local_sprite_dir(assets_dir, sid)
+        self._prefetch_shop_skins()
+        self._prefetch_shop_badges()
+
+    def _set_local_sprite_dir(self, sprite_dir: Path, sid: str) -> None:
+        key = str(sprite_dir)
+        frames_raw, react_raw = self._decode_cache.acquire(key, lambda: self._skin_raw_assets(sprite_dir))
+        self._decode_cache.release(str(self._local_sprite_dir))
+        self._local_sprite_dir = sprite_dir
         self._skin_id = sid
         self._equipped_skin_id = sid
-        self._local_skin_assets_dir = assets_dir
         self._local_frames_raw = frames_raw
         self._local_react_raw = react_raw
         self._rebuild_scaled_pixmaps()
         self._update_frame(force=True)
         self.update()
 
+    def _prefetch_shop_skins(self) -> None:
+        for sid, _price, _label in self.SHOP_SKIN_ITEMS:
+            assets_dir = self._resolve_skin_assets_dir(self._skin_root, sid)
+            self._request_skin_frames(assets_dir, lambda _ok: None)
+
     def set_local_profile(self, profile: dict[str, str | int]) -> None:
-        self._local_profile = dict(profile)
+        self._local_profile.update(profile)
 
     def apply_sprite_hint(self, sprite: str) -> None:
         _ = sprite
@@ -2646,25 +3025,33 @@ class _DugongWindow(QtWidgets.QWidget):
         if cached is not None and not cached.isNull():
             return cached
         assets_dir = self._resolve_skin_assets_dir(self._skin_root, skin_id)
-        for prefix in ("Idle_loop", "Swim_loop", "React_chill"):
-            frames = self._load_by_prefix(assets_dir, prefix)
-            if frames:
-                pm = frames[0].scaled(size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-                self._shop_skin_preview_cache[key] = pm
-                return pm
+        if str(assets_dir) not in self._decode_cache:
+            # Not decoded yet: the caller shows an empty card and asks again later.
+            return QtGui.QPixmap()
+        # Reuse the shared decode: equipping a previewed skin then costs no disk I/O.
+        frames_raw, react_raw = self._skin_raw_assets(assets_dir)
+        idle = frames_raw.get("idle") or frames_raw.get("swim") or react_raw.get("chill") or []
         pm = QtGui.QPixmap()
+        if idle:
+            pm = idle[0].scaled(size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
         self._shop_skin_preview_cache[key] = pm
         return pm
 
-    def _shop_badge_preview(self, title_id: str, size: QtCore.QSize) -> QtGui.QPixmap:
-        key = (str(title_id), int(size.width()), int(size.height()))
-        cached = self._shop_badge_preview_cache.get(key)
-        if cached is not None and not cached.isNull():
-            return cached
+    def _set_shop_skin_icon(self, btn: QtWidgets.QPushButton, skin_id: str, size: QtCore.QSize) -> None:
+        pm = self._shop_skin_preview(skin_id, size)
+        if pm.isNull():
+            return
+        try:
+            btn.setIcon(QtGui.QIcon(pm))
+            btn.setIconSize(size)
+        except RuntimeError:
+            pass  # dialog closed before the decode finished
+
+    def _badge_candidates(self, title_id: str) -> list[Path]:
         badge_dir = self._assets_root / "badge"
         title_l = (title_id or "").strip().lower()
         alias = {"drifter": "wanderer"}.get(title_l, title_l)
-        candidates = [
+        return [
             badge_dir / f"{title_id}.png",
             badge_dir / f"{title_id}.PNG",
             badge_dir / f"{title_l}.png",
@@ -2676,13 +3063,45 @@ class _DugongWindow(QtWidgets.QWidget):
             badge_dir / f"{alias.capitalize()}.png",
             badge_dir / f"{alias.capitalize()}.PNG",
         ]
-        for path in candidates:
-            if path.exists() and path.is_file():
-                pm = QtGui.QPixmap(str(path))
-                if not pm.isNull():
-                    out = pm.scaled(size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-                    self._shop_badge_preview_cache[key] = out
-                    return out
+
+    def _request_badge(self, title_id: str, on_ready: Callable[[], None]) -> None:
+        tid = str(title_id)
+        if tid in self._badge_src:
+            on_ready()
+            return
+
+        def decode() -> QtGui.QImage:
+            # Worker thread: QImage only.
+            for path in self._badge_candidates(tid):
+                if path.exists() and path.is_file():
+                    img = QtGui.QImage(str(path))
+                    if not img.isNull():
+                        return img
+            return QtGui.QImage()
+
+        def done(image: object, error: Exception | None) -> None:
+            if tid not in self._badge_src:
+                ok = error is None and isinstance(image, QtGui.QImage) and not image.isNull()
+                self._badge_src[tid] = QtGui.QPixmap.fromImage(image) if ok else QtGui.QPixmap()
+            on_ready()
+
+        self._request_asset(("badge", tid), decode, done)
+
+    def _prefetch_shop_badges(self) -> None:
+        for tid, _price, _label in self.SHOP_BADGE_ITEMS:
+            self._request_badge(tid, lambda: None)
+
+    def _shop_badge_preview(self, title_id: str, size: QtCore.QSize) -> QtGui.QPixmap:
+        """Scaled badge art; the drawn letter badge until (or unless) the PNG is decoded."""
+        key = (str(title_id), int(size.width()), int(size.height()))
+        cached = self._shop_badge_preview_cache.get(key)
+        if cached is not None and not cached.isNull():
+            return cached
+        src = self._badge_src.get(str(title_id))
+        if src is not None and not src.isNull():
+            out = src.scaled(size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+            self._shop_badge_preview_cache[key] = out
+            return out
 
         pm = QtGui.QPixmap(size)
         pm.fill(QtCore.Qt.transparent)
@@ -2703,9 +3122,16 @@ class _DugongWindow(QtWidgets.QWidget):
         painter.setPen(fg)
         painter.drawText(pm.rect(), QtCore.Qt.AlignCenter, letter)
         painter.end()
-        self._shop_badge_preview_cache[key] = pm
+        if src is not None:
+            self._shop_badge_preview_cache[key] = pm  # no PNG: the letter is final
         return pm
 
+    def _set_shop_badge_icon(self, btn: QtWidgets.QPushButton, title_id: str, size: QtCore.QSize) -> None:
+        try:
+            btn.setIcon(QtGui.QIcon(self._shop_badge_preview(title_id, size)))
+        except RuntimeError:
+            pass  # dialog closed before the decode finished
+
     def _item_state_suffix(self, kind: str, item_id: str, price: int) -> str:
         item_l = item_id.lower()
         if kind == "skin":
@@ -2743,6 +3169,21 @@ class _DugongWindow(QtWidgets.QWidget):
         dlg.move(x, y)
         dlg.raise_()
 
+    def _shop_bg_placeholder(self, size: QtCore.QSize) -> QtGui.QPixmap:
+        pm = QtGui.QPixmap(size)
+        pm.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(pm)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        painter.setPen(QtGui.QPen(QtGui.QColor(128, 198, 234, 175), 2))
+        painter.setBrush(QtGui.QColor(18, 48, 74, 210))
+        painter.drawRoundedRect(QtCore.QRectF(pm.rect()).adjusted(1, 1, -1, -1), 18, 18)
+        painter.end()
+        return pm
+
+    def _on_shop_dialog_destroyed(self) -> None:
+        self._shop_dialog = None
+        self._shop_bg_label = None
+
     def _open_shop_dialog(self) -> None:
         if self._shop_dialog is not None and self._shop_dialog.isVisible():
             self._position_shop_dialog()
@@ -2758,10 +3199,13 @@ class _DugongWindow(QtWidgets.QWidget):
         dlg.setAttribute(QtCore.Qt.WA_TranslucentBackground, True)
 
         bg_src = self._shop_bg_src
+        # Not decoded yet: size the dialog from the PNG header (no pixel decode)
+        # and show a placeholder panel until the asset lane delivers.
         if bg_src.isNull():
-            bg_src = QtGui.QPixmap(str(self._assets_root / "dugong_shop.png"))
-            self._shop_bg_src = bg_src
-        if bg_src.isNull():
+            src_size = QtGui.QImageReader(str(self._assets_root / "dugong_shop.png")).size()
+        else:
+            src_size = bg_src.size()
+        if not src_size.isValid() or src_size.isEmpty():
             # fallback to old menu if asset is missing
             menu = QtWidgets.QMenu(self)
             menu.addAction("shop asset missing")
@@ -2776,9 +3220,14 @@ class _DugongWindow(QtWidgets.QWidget):
         else:
             target_h = min(620, max(380, int(self.height() * 1.72)))
             max_w = max(760, int(self.width() * 0.86))
-        bg = bg_src.scaledToHeight(target_h, QtCore.Qt.SmoothTransformation)
-        if bg.width() > max_w:
-            bg = bg.scaledToWidth(max_w, QtCore.Qt.SmoothTransformation)
+        bg_size = src_size.scaled(QtCore.QSize(10**6, target_h), QtCore.Qt.KeepAspectRatio)
+        if bg_size.width() > max_w:
+            bg_size = bg_size.scaled(QtCore.QSize(max_w, 10**6), QtCore.Qt.KeepAspectRatio)
+        if not bg_src.isNull():
+            bg = bg_src.scaled(bg_size, QtCore.Qt.IgnoreAspectRatio, QtCore.Qt.SmoothTransformation)
+        else:
+            bg = self._shop_bg_placeholder(bg_size)
+            self._request_shop_bg()
         dlg.setFixedSize(bg.width(), bg.height())
 
         root = QtWidgets.QFrame(dlg)
@@ -2789,6 +3238,7 @@ class _DugongWindow(QtWidgets.QWidget):
         bg_label.setGeometry(0, 0, dlg.width(), dlg.height())
         bg_label.setPixmap(bg)
         bg_label.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents, True)
+        self._shop_bg_label = bg_label if bg_src.isNull() else None
 
         # Keep shop fixed to magnetic center; no manual dragging surface.
 
@@ -2876,10 +3326,7 @@ class _DugongWindow(QtWidgets.QWidget):
         close_btn.clicked.connect(dlg.close)
 
         # Main target: left wooden shelf for skins (image cards)
-        skin_items = [
-            ("king", 160, "King"),
-            ("horse", 120, "Horse"),
-        ]
+        skin_items = list(self.SHOP_SKIN_ITEMS)
         # King on the left, horse on the right, and both enlarged x2.
         skin_rects = [
             QtCore.QRect(int(dlg.width() * 0.148), int(dlg.height() * 0.618), int(dlg.width() * 0.416), int(dlg.height() * 0.192)),  # king
@@ -2889,35 +3336,43 @@ class _DugongWindow(QtWidgets.QWidget):
             suffix = self._item_state_suffix("skin", sid, price)
             hover_text = f"皮肤 {label} | {suffix}"
             rect = skin_rects[idx]
-            icon = self._shop_skin_preview(sid, QtCore.QSize(rect.width() - 4, rect.height() - 2))
+            icon_size = QtCore.QSize(rect.width() - 4, rect.height() - 2)
+            icon = self._shop_skin_preview(sid, icon_size)
 
             def on_skin_click(_checked: bool = False, item_id: str = sid, p: int = price) -> None:
                 if self._on_shop_action:
                     self._on_shop_action("skin", item_id, p)
                 dlg.close()
 
-            mk_item_btn(icon, rect, hover_text, on_skin_click, hit_expand_w=14, hit_expand_h=8)
+            btn = mk_item_btn(icon, rect, hover_text, on_skin_click, hit_expand_w=14, hit_expand_h=8)
+            if icon.isNull():
+                self._request_skin_frames(
+                    self._resolve_skin_assets_dir(self._skin_root, sid),
+                    lambda ok, b=btn, item_id=sid, s=icon_size: ok and self._set_shop_skin_icon(b, item_id, s),
+                )
 
         # Right pearl seats reserved for title/badge icons.
-        badge_items = [
-            ("drifter", 0, "Wanderer"),
-            ("explorer", 60, "Explorer"),
-        ]
+        badge_items = list(self.SHOP_BADGE_ITEMS)
         badge_x = [int(dlg.width() * 0.68), int(dlg.width() * 0.77)]
         for idx, (tid, price, label) in enumerate(badge_items):
             suffix = self._item_state_suffix("title", tid, price)
             hover_text = f"徽章 {label} | {suffix}"
             rect = QtCore.QRect(badge_x[idx], int(dlg.height() * 0.54), int(dlg.width() * 0.108), int(dlg.height() * 0.162))
-            icon = self._shop_badge_preview(tid, QtCore.QSize(rect.width() - 8, rect.height() - 8))
+            badge_size = QtCore.QSize(rect.width() - 8, rect.height() - 8)
+            icon = self._shop_badge_preview(tid, badge_size)
 
             def on_title_click(_checked: bool = False, item_id: str = tid, p: int = price) -> None:
                 if self._on_shop_action:
                     self._on_shop_action("title", item_id, p)
                 dlg.close()
 
-            mk_item_btn(icon, rect, hover_text, on_title_click, hit_expand_w=14, hit_expand_h=10)
+            btn = mk_item_btn(icon, rect, hover_text, on_title_click, hit_expand_w=14, hit_expand_h=10)
+            if tid not in self._badge_src:
+                self._request_badge(
+                    tid, lambda b=btn, item_id=tid, s=badge_size: self._set_shop_badge_icon(b, item_id, s)
+                )
 
-        dlg.destroyed.connect(lambda _obj=None: setattr(self, "_shop_dialog", None))
+        dlg.destroyed.connect(lambda _obj=None: self._on_shop_dialog_destroyed())
         self._shop_dialog = dlg
         dlg.show()
         self._position_shop_dialog()
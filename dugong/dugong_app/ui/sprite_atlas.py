@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+
+# Packed per-skin sprite atlas written by scripts/prepare_sprites.py --atlas.
+# One texture + one manifest replace ~25 PNG decodes at startup; the manifest
+# records where each (alpha-trimmed) frame sits in the texture and how to pad it
+# back to its source canvas, so runtime scaling is identical to loose PNGs.
+ATLAS_VERSION = 1
+ATLAS_MANIFEST = "atlas.json"
+ATLAS_TEXTURE = "atlas.png"
+ATLAS_MAX_WIDTH = 4096
+
+# Prefixes the shell asks for, in lookup order (legacy aliases included).
+FRAME_PREFIXES = (
+    "Swim_loop",
+    "Idle_loop",
+    "Turn",
+    "seal_",
+    "React_study",
+    "React_chill",
+    "React_rest",
+    "React_happy",
+    "React_dumb",
+    "React_shock",
+)
+
+
+def frame_sort_key(path: Path) -> tuple[int, int, str]:
+    stem = path.stem.lower()
+    m = re.search(r"(\d+)$", stem)
+    if m:
+        return (0, int(m.group(1)), stem)
+    return (1, 9999, stem)
+
+
+def list_frame_files(assets_dir: Path) -> list[Path]:
+    if not assets_dir.exists():
+        return []
+    return sorted(
+        (p for p in assets_dir.iterdir() if p.is_file() and p.suffix.lower() == ".png" and p.name != ATLAS_TEXTURE),
+        key=lambda p: p.name,
+    )
+
+
+def group_frame_files(paths: list[Path]) -> dict[str, list[Path]]:
+    """Same prefix match + trailing-number order as the shell's loose-PNG loader."""
+    groups: dict[str, list[Path]] = {}
+    for prefix in FRAME_PREFIXES:
+        prefix_l = prefix.lower()
+        matched = [p for p in paths if p.stem.lower().startswith(prefix_l)]
+        if matched:
+            groups[prefix_l] = sorted(matched, key=frame_sort_key)
+    return groups
+
+
+def source_signature(paths: list[Path]) -> dict[str, int]:
+    # Name + byte size: cheap to stat, and stable across checkouts (unlike mtime).
+    return {p.name: int(p.stat().st_size) for p in paths}
+
+
+def pack_shelves(sizes: list[tuple[int, int]], max_width: int = ATLAS_MAX_WIDTH) -> tuple[list[tuple[int, int]], tuple[int, int]]:
+    """Shelf-pack rectangles (tallest first). Returns positions in input order and the texture size."""
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0], i))
+    widest = max((w for w, _h in sizes), default=0)
+    limit = max(int(max_width), widest)
+    positions: list[tuple[int, int]] = [(0, 0)] * len(sizes)
+    x = y = shelf_h = used_w = 0
+    for i in order:
+        w, h = sizes[i]
+        if x > 0 and x + w > limit:
+            y += shelf_h
+            x = shelf_h = 0
+        positions[i] = (x, y)
+        x += w
+        shelf_h = max(shelf_h, h)
+        used_w = max(used_w, x)
+    return positions, (used_w, y + shelf_h)
+
+
+def load_manifest(assets_dir: Path) -> dict | None:
+    """Return the atlas manifest if present, well-formed and not stale; else None."""
+    manifest_path = assets_dir / ATLAS_MANIFEST
+    if not manifest_path.exists() or not (assets_dir / ATLAS_TEXTURE).exists():
+        return None
+    try:
+        data = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or int(data.get("version", 0)) != ATLAS_VERSION:
+        return None
+    groups = data.get("groups")
+    if not isinstance(groups, dict):
+        return None
+    try:
+        if data.get("sources") != source_signature(list_frame_files(assets_dir)):
+            return None
+    except OSError:
+        return None
+    for frames in groups.values():
+        if not isinstance(frames, list):
+            return None
+        for frame in frames:
+            if not isinstance(frame, dict):
+                return None
+            if any(not _is_int_pair(frame.get(k)) for k in ("offset", "source_size")):
+                return None
+            rect = frame.get("rect")
+            if not (isinstance(rect, list) and len(rect) == 4 and all(isinstance(v, int) for v in rect)):
+                return None
+    return data
+
+
+def _is_int_pair(value: object) -> bool:
+    return isinstance(value, list) and len(value) == 2 and all(isinstance(v, int) for v in value)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class SpriteCache:
+    """Process-wide, ref-counted cache for decoded / scaled sprite sets.
+
+    Entries are built once per key (e.g. `(skin_id, target_h, direction)`) and
+    shared by every holder. `acquire` bumps a reference count, `release` drops
+    it; entries with no holders stay cached in LRU order until more than
+    `max_idle` of them pile up. `get_or_build` caches without taking a
+    reference (raw decoded frames, previews).
+    """
+
+    def __init__(self, max_idle: int = 8) -> None:
+        self.max_idle = max(0, int(max_idle))
+        self._lock = threading.RLock()
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._refs: dict[Hashable, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def acquire(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        with self._lock:
+            value = self._lookup_or_build(key, build)
+            self._refs[key] = self._refs.get(key, 0) + 1
+            return value
+
+    def release(self, key: Hashable) -> None:
+        with self._lock:
+            count = self._refs.get(key, 0) - 1
+            if count > 0:
+                self._refs[key] = count
+                return
+            self._refs.pop(key, None)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._evict_idle()
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        with self._lock:
+            value = self._lookup_or_build(key, build)
+            self._evict_idle()
+            return value
+
+    def refcount(self, key: Hashable) -> int:
+        with self._lock:
+            return self._refs.get(key, 0)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._refs.clear()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "referenced": len(self._refs),
+                "hits": int(self._hits),
+                "misses": int(self._misses),
+                "evictions": int(self._evictions),
+            }
+
+    def _lookup_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        if key in self._entries:
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        self._misses += 1
+        value = build()
+        self._entries[key] = value
+        return value
+
+    def _evict_idle(self) -> None:
+        idle = [key for key in self._entries if self._refs.get(key, 0) <= 0]
+        overflow = len(idle) - self.max_idle
+        for key in idle[: max(0, overflow)]:
+            del self._entries[key]
+            self._evictions += 1
+
+
+# Scaled/mirrored frame sets churn on every resize; raw decodes are kept apart
+# so that churn never pushes a skin back to disk.
+_SCALED_CACHE = SpriteCache(max_idle=8)
+_DECODED_CACHE = SpriteCache(max_idle=6)
+
+
+def shared_sprite_cache() -> SpriteCache:
+    return _SCALED_CACHE
+
+
+def shared_decode_cache() -> SpriteCache:
+    return _DECODED_CACHE
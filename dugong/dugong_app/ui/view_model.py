@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+# Entity fields that change on every refresh without changing what the shell
+# draws (the local entity is stamped with "now"; peers are only rendered while
+# online, so their last_seen never reaches the screen).
+VOLATILE_ENTITY_FIELDS = frozenset({"last_seen"})
+
+# Sections that are dicts and can be sent as a partial update.
+DICT_SECTIONS = frozenset({"reward_stats", "local_profile"})
+
+
+def _stable(entity: dict) -> dict:
+    return {key: value for key, value in entity.items() if key not in VOLATILE_ENTITY_FIELDS}
+
+
+class ViewModel:
+    """Last snapshot pushed to the shell; `diff` returns only what changed.
+
+    Scalar sections are sent whole when they differ, dict sections
+    (`DICT_SECTIONS`) only carry their changed keys, and entities are upserted
+    by source with a separate list of removed sources. `diff` returns None when
+    nothing changed so the caller can skip the shell call entirely.
+    """
+
+    def __init__(self) -> None:
+        self._sections: dict[str, object] = {}
+        self._entities: dict[str, dict] = {}
+        self._counters = {"pushed": 0, "skipped": 0, "entities_sent": 0, "entities_removed": 0}
+
+    def diff(self, sections: dict[str, object], entities: list[dict] | None = None) -> dict | None:
+        changes: dict[str, object] = {}
+        for name, value in sections.items():
+            if value is None:
+                continue
+            previous = self._sections.get(name)
+            if name in DICT_SECTIONS and isinstance(value, dict) and isinstance(previous, dict):
+                changed = {key: item for key, item in value.items() if key not in previous or previous[key] != item}
+                if changed:
+                    changes[name] = changed
+            elif previous != value or name not in self._sections:
+                changes[name] = value
+
+        upserts: list[dict] = []
+        removed: list[str] = []
+        if entities is not None:
+            current: dict[str, dict] = {}
+            for entity in entities:
+                source = str(entity.get("source", ""))
+                if not source:
+                    continue
+                stable = _stable(entity)
+                current[source] = stable
+                if self._entities.get(source) != stable:
+                    upserts.append(entity)
+            removed = [source for source in self._entities if source not in current]
+
+        if not changes and not upserts and not removed:
+            self._counters["skipped"] += 1
+            return None
+
+        for name, value in changes.items():
+            if name in DICT_SECTIONS and isinstance(self._sections.get(name), dict):
+                merged = dict(self._sections[name])
+                merged.update(value)
+                self._sections[name] = merged
+            else:
+                self._sections[name] = value
+        if entities is not None:
+            for entity in upserts:
+                self._entities[str(entity.get("source", ""))] = _stable(entity)
+            for source in removed:
+                del self._entities[source]
+            changes["entities"] = upserts
+            changes["removed_entities"] = removed
+        self._counters["pushed"] += 1
+        self._counters["entities_sent"] += len(upserts)
+        self._counters["entities_removed"] += len(removed)
+        return changes
+
+    def reset(self) -> None:
+        # Forget what the shell has; the next diff is a full snapshot.
+        self._sections.clear()
+        self._entities.clear()
+
+    def metrics(self) -> dict:
+        return dict(self._counters)
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from dugong_app.core import codec
+from dugong_app.core.events import (
+    DugongEvent,
+    manual_ping_event,
+    presence_heartbeat_event,
+    profile_update_event,
+    reward_grant_event,
+    state_tick_event,
+)
+from dugong_app.interaction.protocol import encode_event
+
+
+def build_sample_events() -> list[DugongEvent]:
+    return [
+        state_tick_event(
+            {"energy": 71, "mood": 64, "focus": 58, "mode": "study", "tick_count": 1234},
+            tick_seconds=60,
+            source="cornelius",
+        ),
+        presence_heartbeat_event(mode="study", pomo_phase="focus", instance_id="a1b2c3d4e5", source="cornelius"),
+        manual_ping_event("hello", source="cornelius"),
+        reward_grant_event(
+            pearls=15,
+            streak_bonus=5,
+            reason="pomo_complete",
+            session_id="9f1c2e7a0b3d4c5e6f708192a3b4c5d6",
+            focus_streak=4,
+            day_streak=3,
+            exp=26,
+            level=4,
+            levels_gained=1,
+            source="cornelius",
+        ),
+        profile_update_event(
+            pearls=240,
+            today_pearls=35,
+            lifetime_pearls=980,
+            exp=412,
+            today_exp=52,
+            lifetime_exp=412,
+            level=4,
+            exp_in_level=22,
+            exp_to_next=110,
+            focus_streak=4,
+            day_streak=3,
+            title_id="explorer",
+            skin_id="horse",
+            bubble_style="ocean",
+            source="cornelius",
+        ),
+    ]
+
+
+def build_workloads() -> dict[str, tuple[list, dict]]:
+    events = build_sample_events()
+    return {
+        "journal_line": ([e.to_dict() for e in events], {}),
+        "envelope": ([encode_event(sender="cornelius", receiver="*", event=e) for e in events], {}),
+        "presence_compact": ([{**e.to_dict()["payload"], "source_id": e.source} for e in events], {"compact": True}),
+        "state_indent": ([e.to_dict() for e in events], {"indent": True}),
+    }
+
+
+def _native_encoder(backend: str):
+    # Raw library encoders, shown for reference only: their output is not
+    # byte-compatible with the on-disk format, so codec.dumps() never uses them.
+    if backend == codec.BACKEND_ORJSON:
+        import orjson
+
+        return orjson.dumps
+    if backend == codec.BACKEND_MSGSPEC:
+        import msgspec
+
+        return msgspec.json.encode
+    return None
+
+
+def _rate(count: int, seconds: float) -> float:
+    return count / seconds if seconds > 0 else float("inf")
+
+
+def bench_backend(backend: str, rounds: int) -> list[dict]:
+    active = codec.set_backend(backend)
+    rows: list[dict] = []
+    for name, (objects, kwargs) in build_workloads().items():
+        encoded = [codec.dumps(obj, **kwargs) for obj in objects]
+        total = rounds * len(objects)
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for obj in objects:
+                codec.dumps(obj, **kwargs)
+        encode_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for text in encoded:
+                codec.loads(text)
+        decode_s = time.perf_counter() - started
+
+        native_ops_s = 0.0
+        native = _native_encoder(active)
+        if native is not None:
+            started = time.perf_counter()
+            for _ in range(rounds):
+                for obj in objects:
+                    native(obj)
+            native_ops_s = _rate(total, time.perf_counter() - started)
+
+        rows.append(
+            {
+                "backend": active,
+                "workload": name,
+                "encode_ops_s": _rate(total, encode_s),
+                "decode_ops_s": _rate(total, decode_s),
+                "decode_mb_s": _rate(rounds * sum(len(t) for t in encoded), decode_s) / 1_000_000,
+                "native_encode_ops_s": native_ops_s,
+            }
+        )
+    return rows
+
+
+def run_bench(args: argparse.Namespace) -> int:
+    previous = codec.backend_name()
+    backends = args.backends or codec.available_backends()
+    print(f"available={codec.available_backends()} rounds={args.rounds}")
+    print(
+        f"{'backend':8s} {'workload':16s} {'encode/s':>12s} {'decode/s':>12s} "
+        f"{'dec MB/s':>9s} {'native enc/s':>13s}"
+    )
+    try:
+        for backend in backends:
+            if backend not in codec.available_backends():
+                print(f"{backend:8s} (not installed, skipped)")
+                continue
+            for row in bench_backend(backend, rounds=max(1, int(args.rounds))):
+                print(
+                    f"{row['backend']:8s} {row['workload']:16s} "
+                    f"{row['encode_ops_s']:12.0f} {row['decode_ops_s']:12.0f} "
+                    f"{row['decode_mb_s']:9.2f} {row['native_encode_ops_s']:13.0f}"
+                )
+    finally:
+        codec.set_backend(previous)
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Dugong JSON codec throughput benchmark")
+    parser.add_argument("--rounds", type=int, default=20000)
+    parser.add_argument("--backends", nargs="*", default=None, help="subset of json/orjson/msgspec")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    raise SystemExit(run_bench(parse_args()))
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from dugong_app.core.events import DugongEvent
+from dugong_app.persistence.event_journal import EventJournal
+from dugong_app.persistence.event_journal_sqlite import SQLITE_JOURNAL_FILENAME, SqliteEventJournal
+from dugong_app.services.daily_summary import summarize_days, summarize_events
+from dugong_app.services.focus_sessions import build_focus_sessions
+
+
+def build_day(day: str, events_per_day: int) -> list[DugongEvent]:
+    events = [DugongEvent("mode_change", f"{day}T08:00:00+00:00", f"{day}-m0", "cornelius", payload={"mode": "study"})]
+    for n in range(max(0, events_per_day - 2)):
+        minute = n % 1440
+        ts = f"{day}T{minute // 60:02d}:{minute % 60:02d}:{n % 60:02d}+00:00"
+        if n % 10 == 9:
+            events.append(DugongEvent("click", ts, f"{day}-c{n}", "anson"))
+        else:
+            payload = {"energy": 70, "mood": 60, "focus": 50, "mode": "study" if n % 3 else "chill", "tick_seconds": 60}
+            events.append(DugongEvent("state_tick", ts, f"{day}-t{n}", "cornelius", payload=payload))
+    events.append(DugongEvent("mode_change", f"{day}T20:00:00+00:00", f"{day}-m1", "cornelius", payload={"mode": "chill"}))
+    return events
+
+
+def _open(backend: str, root: Path) -> EventJournal | SqliteEventJournal:
+    if backend == "sqlite":
+        return SqliteEventJournal(root / SQLITE_JOURNAL_FILENAME, retention_days=3650)
+    return EventJournal(root / "event_journal.jsonl", retention_days=3650)
+
+
+def bench_backend(backend: str, root: Path, days: int, events_per_day: int, appends: int) -> dict:
+    today = datetime.now(tz=timezone.utc).date()
+    journal = _open(backend, root)
+    started = time.perf_counter()
+    for offset in range(days, 0, -1):
+        journal.append_many(build_day((today - timedelta(days=offset)).isoformat(), events_per_day))
+    seed_s = time.perf_counter() - started
+
+    # Startup: what the controller + SyncEngine do (open, then load_all for known ids).
+    started = time.perf_counter()
+    journal = _open(backend, root)
+    events = journal.load_all()
+    startup_s = time.perf_counter() - started
+
+    now_day = today.isoformat()
+    started = time.perf_counter()
+    for n in range(appends):
+        journal.append(DugongEvent("click", f"{now_day}T12:00:00+00:00", f"bench-{n}", "cornelius"))
+    append_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    summary = summarize_days(journal.day_totals())
+    summary_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if isinstance(journal, SqliteEventJournal):
+        build_focus_sessions(journal.load_by_type(["mode_change"]))
+    else:
+        build_focus_sessions(journal.load_all())
+    sessions_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    summarize_events(journal.load_all())
+    scan_summary_s = time.perf_counter() - started
+
+    return {
+        "backend": backend,
+        "events": len(events),
+        "days": len(summary["days"]),
+        "seed_s": seed_s,
+        "startup_s": startup_s,
+        "append_ms": append_s * 1000.0 / max(1, appends),
+        "summary_s": summary_s,
+        "sessions_s": sessions_s,
+        "scan_summary_s": scan_summary_s,
+    }
+
+
+def run_bench(args: argparse.Namespace) -> int:
+    workdir = Path(tempfile.mkdtemp(prefix="dugong_bench_journal_"))
+    print(f"days={args.days} events_per_day={args.events_per_day} appends={args.appends}")
+    print(
+        f"{'backend':8s} {'events':>8s} {'seed s':>8s} {'startup s':>10s} {'append ms':>10s} "
+        f"{'summary s':>10s} {'sessions s':>11s} {'scan sum s':>11s}"
+    )
+    try:
+        for backend in args.backends:
+            row = bench_backend(backend, workdir / backend, args.days, args.events_per_day, args.appends)
+            print(
+                f"{row['backend']:8s} {row['events']:8d} {row['seed_s']:8.2f} {row['startup_s']:10.3f} "
+                f"{row['append_ms']:10.3f} {row['summary_s']:10.3f} {row['sessions_s']:11.3f} "
+                f"{row['scan_summary_s']:11.3f}"
+            )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Dugong event journal backend benchmark (one-year journal)")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--events-per-day", type=int, default=300)
+    parser.add_argument("--appends", type=int, default=500)
+    parser.add_argument("--backends", nargs="*", default=["jsonl", "sqlite"], choices=["jsonl", "sqlite"])
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    raise SystemExit(run_bench(parse_args()))
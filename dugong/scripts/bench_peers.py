@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from dugong_app.ui.peer_world import PeerKinematics
+
+BOUNDS = (0.0, 900.0, 40.0, 380.0)
+
+
+def _dict_step(peer: dict, min_x: float, max_x: float, min_y: float, max_y: float) -> None:
+    # The per-peer dict path PeerKinematics replaced, kept here as the baseline.
+    x = float(peer.get("x", min_x))
+    y = float(peer.get("y", min_y))
+    target_x = float(peer.get("target_x", x))
+    target_y = float(peer.get("target_y", y))
+    vx = float(peer.get("vx", 1.0))
+    old_sign = 1 if vx >= 0 else -1
+
+    if not (min_x <= target_x <= max_x and min_y <= target_y <= max_y):
+        target_x = random.uniform(min_x, max_x)
+        target_y = random.uniform(min_y, max_y)
+
+    dx = target_x - x
+    dy = target_y - y
+    dist = math.hypot(dx, dy)
+    if dist < 14:
+        target_x = random.uniform(min_x, max_x)
+        target_y = random.uniform(min_y, max_y)
+        dx = target_x - x
+        dy = target_y - y
+        dist = max(0.1, math.hypot(dx, dy))
+
+    speed = float(peer.get("speed", 1.4))
+    vx = (dx / dist) * speed
+    vy = (dy / dist) * speed
+    if abs(vx) < 0.05:
+        vx = 0.05 if dx >= 0 else -0.05
+
+    x += vx
+    y += vy
+    if x < min_x or x > max_x:
+        x = min_x if x < min_x else max_x
+        target_x = random.uniform(min_x, max_x)
+        target_y = random.uniform(min_y, max_y)
+    if y < min_y or y > max_y:
+        y = min_y if y < min_y else max_y
+        target_x = random.uniform(min_x, max_x)
+        target_y = random.uniform(min_y, max_y)
+
+    phase = float(peer.get("float_phase", 0.0)) + 0.12
+    y += math.sin(phase) * 0.2
+
+    peer["x"] = x
+    peer["y"] = y
+    peer["target_x"] = target_x
+    peer["target_y"] = target_y
+    peer["vx"] = vx
+    peer["vy"] = vy
+    peer["float_phase"] = phase
+    if vx > 0.28:
+        peer["facing"] = "right"
+    elif vx < -0.28:
+        peer["facing"] = "left"
+    peer["turning"] = (1 if vx >= 0 else -1) != old_sign
+
+
+def build_peers(count: int, seed: int = 7) -> tuple[dict[str, dict], PeerKinematics]:
+    rng = random.Random(seed)
+    min_x, max_x, min_y, max_y = BOUNDS
+    peers: dict[str, dict] = {}
+    store = PeerKinematics()
+    for n in range(count):
+        row = {
+            "x": rng.uniform(min_x, max_x),
+            "y": rng.uniform(min_y, max_y),
+            "target_x": rng.uniform(min_x, max_x),
+            "target_y": rng.uniform(min_y, max_y),
+            "vx": rng.choice([-1.0, 1.0]) * rng.uniform(1.1, 1.8),
+            "speed": rng.uniform(1.0, 1.9),
+            "float_phase": rng.uniform(0.0, 6.28),
+        }
+        source = f"peer{n}"
+        peers[source] = {**row, "vy": 0.0, "react_until": 0.0, "mode": "study", "skin_id": "default"}
+        store.add(source, **row)
+    return peers, store
+
+
+def _per_tick_us(fn, ticks: int) -> float:
+    started = time.perf_counter()
+    for _ in range(ticks):
+        fn()
+    return (time.perf_counter() - started) * 1_000_000 / ticks
+
+
+def bench_count(count: int, ticks: int) -> dict:
+    peers, store = build_peers(count)
+    min_x, max_x, min_y, max_y = BOUNDS
+    now = time.monotonic()
+
+    def dict_tick() -> None:
+        for peer in peers.values():
+            if float(peer.get("react_until", 0.0)) > now:
+                continue
+            _dict_step(peer, min_x, max_x, min_y, max_y)
+
+    def soa_tick() -> None:
+        store.step(min_x, max_x, min_y, max_y, now=now)
+
+    # Interleave short rounds so frequency scaling hits both paths alike.
+    dict_us: list[float] = []
+    soa_us: list[float] = []
+    rounds = 5
+    for _ in range(rounds):
+        dict_us.append(_per_tick_us(dict_tick, max(1, ticks // rounds)))
+        soa_us.append(_per_tick_us(soa_tick, max(1, ticks // rounds)))
+    return {"peers": count, "dict_us": min(dict_us), "soa_us": min(soa_us)}
+
+
+def run_bench(args: argparse.Namespace) -> int:
+    print(f"ticks={args.ticks} (best of 5 rounds, microseconds per world tick)")
+    print(f"{'peers':>6s} {'dict us':>10s} {'soa us':>10s} {'speedup':>8s}")
+    for count in args.peers:
+        row = bench_count(max(1, int(count)), max(5, int(args.ticks)))
+        speedup = row["dict_us"] / row["soa_us"] if row["soa_us"] > 0 else float("inf")
+        print(f"{row['peers']:6d} {row['dict_us']:10.2f} {row['soa_us']:10.2f} {speedup:7.2f}x")
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Peer world-tick cost: per-peer dicts vs PeerKinematics")
+    parser.add_argument("--ticks", type=int, default=5000)
+    parser.add_argument("--peers", type=int, nargs="*", default=[1, 4, 8, 16, 32, 64])
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    raise SystemExit(run_bench(parse_args()))
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import argparse
+import json
+import sys
 from pathlib import Path
 from typing import Iterable
 
@@ -8,6 +10,21 @@ import imageio.v3 as iio
 import numpy as np
 from PIL import Image, ImageSequence
 
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from dugong_app.ui.sprite_atlas import (
+    ATLAS_MANIFEST,
+    ATLAS_MAX_WIDTH,
+    ATLAS_TEXTURE,
+    ATLAS_VERSION,
+    group_frame_files,
+    list_frame_files,
+    pack_shelves,
+    source_signature,
+)
+
 
 IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".webp", ".bmp"}
 ANIM_EXTS = {".gif", ".webp", ".apng"}
@@ -16,8 +33,8 @@ VIDEO_EXTS = {".mp4", ".mov", ".mkv", ".avi", ".webm"}
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Prepare stable dugong sprite frames from generated media.")
-    parser.add_argument("--input", required=True, help="Input directory (frames) or single file (gif/webp/mp4).")
-    parser.add_argument("--output", required=True, help="Output directory for PNG sprites.")
+    parser.add_argument("--input", help="Input directory (frames) or single file (gif/webp/mp4).")
+    parser.add_argument("--output", help="Output directory for PNG sprites.")
     parser.add_argument("--count", type=int, default=8, help="Target output frame count.")
     parser.add_argument("--canvas", type=int, default=512, help="Output canvas size (square).")
     parser.add_argument("--prefix", default="dugong_swim_right", help="Output filename prefix.")
@@ -25,7 +42,17 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--tol", type=int, default=36, help="Color tolerance for keying (0-255).")
     parser.add_argument("--subject-ratio", type=float, default=0.72, help="Max subject size ratio in canvas.")
     parser.add_argument("--mirror", action="store_true", help="Also export mirrored left-facing frames.")
-    return parser.parse_args()
+    parser.add_argument(
+        "--atlas",
+        nargs="+",
+        default=None,
+        metavar="SKIN_DIR",
+        help="Pack each skin dir's frames into atlas.png + atlas.json (no --input/--output needed).",
+    )
+    args = parser.parse_args()
+    if not args.atlas and (not args.input or not args.output):
+        parser.error("--input and --output are required unless --atlas is given")
+    return args
 
 
 def hex_to_rgb(value: str) -> tuple[int, int, int]:
@@ -175,8 +202,69 @@ def save_frames(frames: Iterable[np.ndarray], out_dir: Path, prefix: str) -> lis
     return saved
 
 
+def build_skin_atlas(skin_dir: Path, max_width: int = ATLAS_MAX_WIDTH) -> tuple[np.ndarray, dict]:
+    files = list_frame_files(skin_dir)
+    groups = group_frame_files(files)
+    if not groups:
+        raise RuntimeError(f"No character frames found in {skin_dir}")
+
+    # Each source file is packed once, alpha-trimmed; groups reference its rect.
+    names: list[str] = []
+    trimmed: dict[str, np.ndarray] = {}
+    meta: dict[str, dict] = {}
+    for paths in groups.values():
+        for path in paths:
+            if path.name in trimmed:
+                continue
+            frame = np.array(Image.open(path).convert("RGBA"))
+            box = alpha_bbox(frame)
+            x0, y0, x1, y1 = box if box is not None else (0, 0, 1, 1)
+            names.append(path.name)
+            trimmed[path.name] = np.ascontiguousarray(frame[y0:y1, x0:x1])
+            meta[path.name] = {"offset": [x0, y0], "source_size": [int(frame.shape[1]), int(frame.shape[0])]}
+
+    sizes = [(int(trimmed[n].shape[1]), int(trimmed[n].shape[0])) for n in names]
+    positions, (atlas_w, atlas_h) = pack_shelves(sizes, max_width=max_width)
+    texture = np.zeros((atlas_h, atlas_w, 4), dtype=np.uint8)
+    for name, (x, y), (w, h) in zip(names, positions, sizes):
+        texture[y : y + h, x : x + w] = trimmed[name]
+        meta[name]["rect"] = [x, y, w, h]
+
+    manifest = {
+        "version": ATLAS_VERSION,
+        "texture": ATLAS_TEXTURE,
+        "size": [atlas_w, atlas_h],
+        # Assets are right-facing only; the shell mirrors once per scaled size.
+        "mirror": "runtime",
+        "sources": source_signature(files),
+        "groups": {
+            prefix: [{"name": p.name, **meta[p.name]} for p in paths]
+            for prefix, paths in groups.items()
+        },
+    }
+    return texture, manifest
+
+
+def write_skin_atlas(skin_dir: Path) -> Path:
+    texture, manifest = build_skin_atlas(skin_dir)
+    Image.fromarray(texture, mode="RGBA").save(skin_dir / ATLAS_TEXTURE, optimize=True)
+    manifest_path = skin_dir / ATLAS_MANIFEST
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest_path
+
+
 def main() -> int:
     args = parse_args()
+    if args.atlas:
+        for raw_dir in args.atlas:
+            skin_dir = Path(raw_dir).resolve()
+            if not skin_dir.is_dir():
+                continue
+            manifest_path = write_skin_atlas(skin_dir)
+            frames = sum(len(v) for v in json.loads(manifest_path.read_text(encoding="utf-8"))["groups"].values())
+            print(f"atlas skin={skin_dir.name} frames={frames} output={manifest_path}")
+        return 0
+
     input_path = Path(args.input).resolve()
     output_dir = Path(args.output).resolve()
     key_rgb = hex_to_rgb(args.bg_key)
@@ -0,0 +1,48 @@
+import random
+from datetime import date, timedelta
+
+from dugong_app.core.active_days import ActiveDayBitmap
+
+
+def _naive_runs(days: set[date]) -> tuple[int, int]:
+    current = 0
+    day = max(days)
+    while day in days:
+        current += 1
+        day -= timedelta(days=1)
+    longest = 0
+    for start in days:
+        if start - timedelta(days=1) in days:
+            continue
+        run = 0
+        while start + timedelta(days=run) in days:
+            run += 1
+        longest = max(longest, run)
+    return current, longest
+
+
+def test_bitmap_streaks_match_a_day_by_day_walk() -> None:
+    rng = random.Random(7)
+    origin = date(2023, 1, 1)
+    for _ in range(50):
+        days = {origin + timedelta(days=rng.randrange(900)) for _ in range(rng.randrange(1, 600))}
+        bitmap = ActiveDayBitmap()
+        for day in rng.sample(sorted(days), len(days)):  # out-of-order marks grow the start backwards
+            bitmap.mark(day)
+        assert (bitmap.current_streak(), bitmap.longest_streak()) == _naive_runs(days)
+        assert bitmap.last_active() == max(days)
+
+
+def test_bitmap_roundtrip_and_runs() -> None:
+    bitmap = ActiveDayBitmap()
+    assert bitmap.current_streak() == 0 and bitmap.longest_streak() == 0
+    bitmap.mark_run(date(2024, 2, 1), 0b1110111)
+    assert bitmap.mark(date(2024, 2, 4)) is True
+    assert bitmap.mark(date(2024, 2, 4)) is False
+    assert bitmap.streak_ending(date(2024, 2, 7)) == 7
+    assert bitmap.streak_ending(date(2024, 2, 8)) == 0
+
+    restored = ActiveDayBitmap.from_dict(bitmap.to_dict())
+    assert restored.start == date(2024, 2, 1)
+    assert restored.current_streak() == 7
+    assert ActiveDayBitmap.from_dict({"start": "bad"}).current_streak() == 0
@@ -0,0 +1,71 @@
+import threading
+import time
+
+from dugong_app.ui.asset_loader import AssetLoader
+
+
+def _drain_until(loader: AssetLoader, count: int, timeout: float = 2.0) -> list:
+    out: list = []
+    deadline = time.monotonic() + timeout
+    while len(out) < count and time.monotonic() < deadline:
+        out.extend(loader.drain())
+        time.sleep(0.005)
+    return out
+
+
+def test_pending_key_is_decoded_once() -> None:
+    release = threading.Event()
+    calls: list[str] = []
+
+    def decode() -> str:
+        calls.append("skin")
+        release.wait(2.0)
+        return "frames"
+
+    loader = AssetLoader()
+    try:
+        assert loader.submit(("skin", "king"), decode) is True
+        assert loader.submit(("skin", "king"), decode) is False
+        assert loader.is_pending(("skin", "king"))
+        release.set()
+        results = _drain_until(loader, 1)
+        assert results == [(("skin", "king"), "frames", None)]
+        assert calls == ["skin"]
+        assert loader.pending_count() == 0
+        assert loader.submit(("skin", "king"), decode) is True
+    finally:
+        release.set()
+        loader.stop()
+
+
+def test_results_come_back_in_completion_order_with_errors() -> None:
+    def boom() -> None:
+        raise ValueError("bad png")
+
+    loader = AssetLoader()
+    try:
+        loader.submit("bg", lambda: "ocean")
+        loader.submit("icon", boom)
+        loader.submit("shop", lambda: "shelf")
+        results = _drain_until(loader, 3)
+        assert [key for key, _value, _error in results] == ["bg", "icon", "shop"]
+        assert results[0][1] == "ocean" and results[0][2] is None
+        assert results[1][1] is None and isinstance(results[1][2], ValueError)
+        assert loader.metrics()["pending_keys"] == 0
+    finally:
+        loader.stop()
+
+
+def test_drain_respects_max_items() -> None:
+    loader = AssetLoader()
+    try:
+        for n in range(3):
+            loader.submit(n, lambda n=n: n)
+        deadline = time.monotonic() + 2.0
+        while loader.metrics()["completed"] < 3 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert len(loader.drain(max_items=2)) == 2
+        assert loader.pending_count() == 1
+        assert len(loader.drain()) == 1
+    finally:
+        loader.stop()
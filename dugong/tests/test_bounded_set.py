@@ -0,0 +1,26 @@
+from dugong_app.core.bounded_set import BoundedOrderedSet
+
+
+class _SmallChunks(BoundedOrderedSet):
+    CHUNK_SIZE = 4
+
+
+def test_bounded_set_evicts_oldest_and_tracks_dirty_chunks() -> None:
+    bounded = _SmallChunks(6, (f"s{n}" for n in range(5)))
+    assert bounded.drain_dirty_chunks() == {0: ["s0", "s1", "s2", "s3"], 1: ["s4"]}
+    assert bounded.add("s2") is False
+
+    for n in range(5, 9):
+        bounded.add(f"s{n}")
+    assert list(bounded) == ["s3", "s4", "s5", "s6", "s7", "s8"]
+    assert "s0" not in bounded and "s8" in bounded
+    # Adds filled the tail chunks; evictions trimmed the head one.
+    assert bounded.drain_dirty_chunks() == {0: ["s3"], 1: ["s4", "s5", "s6", "s7"], 2: ["s8"]}
+    assert bounded.drain_dirty_chunks() == {}
+
+    restored = _SmallChunks.from_chunks(6, {0: ["s3"], 1: ["s4", "s5", "s6", "s7"], 2: ["s8"]})
+    assert list(restored) == list(bounded)
+    assert restored.drain_dirty_chunks() == {}
+    restored.add("s9")
+    assert restored.drain_dirty_chunks() == {0: [], 2: ["s8", "s9"]}
+    assert restored.chunk_range() == (1, 2)
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from dugong_app.core import codec
+from dugong_app.interaction.protocol import encode_event
+from scripts.bench_codec import build_sample_events
+
+
+@pytest.fixture(params=codec.available_backends())
+def backend(request):
+    previous = codec.backend_name()
+    codec.set_backend(request.param)
+    yield request.param
+    codec.set_backend(previous)
+
+
+def _shapes() -> list:
+    events = build_sample_events()
+    shapes: list = [e.to_dict() for e in events]
+    shapes.extend(encode_event(sender="cornelius", receiver="*", event=e) for e in events)
+    shapes.append({"sessions": [], "nested": {"a": {}, "b": [1, {}]}})
+    shapes.append({"tiny": 1e-05, "huge": 1e16, "ratio": 0.8, "wall": 1700000000.0})
+    shapes.append({"message": "进入专注模式", "neg": -3})
+    return shapes
+
+
+def test_codec_output_is_byte_compatible_with_stdlib(backend) -> None:
+    for obj in _shapes():
+        assert codec.dumps(obj) == json.dumps(obj, ensure_ascii=True)
+        assert codec.dumps(obj, compact=True) == json.dumps(obj, ensure_ascii=True, separators=(",", ":"))
+        assert codec.dumps(obj, indent=True) == json.dumps(obj, ensure_ascii=True, indent=2)
+
+
+def test_codec_roundtrip_and_bad_input(backend) -> None:
+    for obj in _shapes():
+        assert codec.loads(codec.dumps(obj)) == obj
+    assert codec.loads(b'{"a": 1}') == {"a": 1}
+    assert codec.loads('{"x": NaN}')["x"] != codec.loads('{"x": NaN}')["x"]
+    with pytest.raises(codec.JSONDecodeError):
+        codec.loads('{"event_type":"manual_ping","timestamp":"BROKEN"')
+
+
+def test_codec_unknown_backend_falls_back_to_available() -> None:
+    previous = codec.backend_name()
+    try:
+        assert codec.set_backend("does-not-exist") in codec.available_backends()
+        assert codec.set_backend("json") == "json"
+    finally:
+        codec.set_backend(previous)
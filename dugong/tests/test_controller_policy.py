@@ -1,5 +1,19 @@
+import queue
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
 from dugong_app.controller import DugongController
 from dugong_app.core.events import DugongEvent
+from dugong_app.persistence.event_journal import EventJournal
+from dugong_app.persistence.pomodoro_state_json import PomodoroStateStorage
+from dugong_app.persistence.reward_state_json import RewardStateStorage
+from dugong_app.services.pomodoro_service import PomodoroService
+from dugong_app.services.job_lanes import OVERFLOW_DROP_OLDEST, JobLane
+from dugong_app.services.presence import PresenceTable
+from dugong_app.services.reward_service import RewardService
+from dugong_app.services.state_replay import CURSOR_KEY
 
 
 def test_controller_remote_signal_count_and_priority() -> None:
@@ -38,7 +52,7 @@ def test_controller_auto_sync_policy_backoff() -> None:
 def test_controller_remote_profile_update_presence() -> None:
     controller = DugongController.__new__(DugongController)
     controller.source_id = "cornelius"
-    controller._remote_presence = {}
+    controller._remote_presence = PresenceTable(ttl_seconds=90)
     events = [
         DugongEvent(
             event_type="profile_update",
@@ -57,3 +71,268 @@ def test_controller_remote_profile_update_presence() -> None:
     info = controller._remote_presence.get("anson", {})
     assert int(info.get("pearls", 0)) == 77
     assert str(info.get("title_id", "")) == "explorer"
+
+
+def test_controller_dropped_sync_job_releases_pending_flag() -> None:
+    controller = DugongController.__new__(DugongController)
+    controller._sync_lock = threading.Lock()
+    controller._sync_pending = True
+
+    controller._publish_lock = threading.Lock()
+    controller._unpublished = []
+    controller._publish_queued = True
+    controller._on_network_job_dropped({"kind": "publish"})
+    assert controller._sync_pending is True
+    assert controller._publish_queued is False  # nothing buffered: no new token
+
+    controller._on_network_job_dropped({"kind": "sync", "manual": False})
+    assert controller._sync_pending is False
+
+
+def test_controller_presence_records_are_last_value_wins() -> None:
+    controller = DugongController.__new__(DugongController)
+    controller.source_id = "cornelius"
+    controller._remote_presence = PresenceTable(ttl_seconds=90)
+    now_iso = datetime.now(tz=timezone.utc)
+    fresh = {"source_id": "anson", "instance_id": "i1", "last_heartbeat": now_iso.isoformat(), "mode": "study"}
+    stale = {**fresh, "last_heartbeat": (now_iso - timedelta(seconds=30)).isoformat(), "mode": "chill"}
+
+    assert controller._update_remote_presence_files([fresh]) == ["anson"]
+    assert controller._update_remote_presence_files([stale]) == []
+    assert controller._update_remote_presence_files([fresh]) == []
+    assert controller._remote_presence.get("anson")["mode"] == "study"
+
+    restarted = {**fresh, "instance_id": "i2"}
+    assert controller._update_remote_presence_files([restarted]) == ["anson"]
+
+
+def test_controller_background_compaction_runs_on_trigger_or_threshold(tmp_path) -> None:
+    controller = DugongController.__new__(DugongController)
+    controller.config = SimpleNamespace(
+        auto_compact_keep_days=2, auto_compact_max_mb=1, auto_compact_max_lines=5, auto_compact_throttle_ms=0
+    )
+    controller.journal = EventJournal(tmp_path / "event_journal.jsonl")
+    controller._results = queue.Queue()
+    controller._derived_dirty = False
+    old_day = (datetime.now(tz=timezone.utc).date() - timedelta(days=4)).isoformat()
+    controller.journal.append_many(
+        [DugongEvent("click", f"{old_day}T10:0{n}:00+00:00", f"c{n}", "cornelius") for n in range(4)]
+    )
+
+    controller._handle_compaction_job(trigger="")  # 3 droppable lines < 5: below threshold
+    assert controller._results.empty()
+
+    controller._handle_compaction_job(trigger="day_rollover")
+    stats = controller._results.get_nowait()["stats"]
+    assert stats["trigger"] == "day_rollover"
+    assert stats["backlog_lines"] == 3
+    assert stats["compacted_days"] == 1
+    assert stats["error"] == ""
+    assert controller._derived_dirty is True
+    assert controller.journal.day_totals()[0]["clicks"] == 4
+    assert controller.journal.day_totals()[0]["event_count"] == 1
+
+
+def test_controller_snapshots_daily_and_holds_compaction_behind_the_snapshot(tmp_path) -> None:
+    controller = DugongController.__new__(DugongController)
+    controller.config = SimpleNamespace(
+        auto_compact_keep_days=2,
+        auto_compact_max_mb=1,
+        auto_compact_max_lines=5,
+        auto_compact_throttle_ms=0,
+        state_snapshot_events=20,
+    )
+    controller.journal = EventJournal(tmp_path / "event_journal.jsonl")
+    controller._results = queue.Queue()
+    controller._derived_dirty = False
+    old_day = (datetime.now(tz=timezone.utc).date() - timedelta(days=4)).isoformat()
+    start = DugongEvent("pomo_start", f"{old_day}T10:00:00+00:00", "p1", "cornelius", payload={"phase": "focus"})
+    controller.journal.append_many([start, DugongEvent("click", f"{old_day}T10:01:00+00:00", "c1", "cornelius")])
+    controller._journal_cursor = {}
+    controller._events_since_snapshot = 0
+    controller._count_unsnapshotted(start, old_day)
+
+    # Its pomo_start is not in any snapshot yet, so the day stays raw.
+    controller._handle_compaction_job(trigger="day_rollover")
+    assert controller._results.get_nowait()["stats"]["compacted_days"] == 0
+
+    controller.pomodoro = PomodoroService()
+    controller.reward = RewardService()
+    controller.pomodoro_storage = PomodoroStateStorage(tmp_path / "pomodoro_state.json")
+    controller.reward_storage = RewardStateStorage(tmp_path / "reward_state.json")
+    controller._pomo_dirty = controller._reward_dirty = controller._snapshot_requested = False
+    controller._flush_snapshots_if_due()  # 1 event < 20, but from an earlier day
+    assert controller._events_since_snapshot == 0
+    assert PomodoroStateStorage(tmp_path / "pomodoro_state.json").load()[CURSOR_KEY]["event_ids"] == ["p1"]
+
+    controller._handle_compaction_job(trigger="day_rollover")
+    assert controller._results.get_nowait()["stats"]["compacted_days"] == 1
+
+
+def _replaying_controller(journal) -> DugongController:
+    controller = DugongController.__new__(DugongController)
+    controller.config = SimpleNamespace(cofocus_bonus_pearls=5)
+    controller.source_id = "cornelius"
+    controller.journal = journal
+    controller.pomodoro = PomodoroService(focus_seconds=180, break_seconds=60)
+    controller.reward = RewardService()
+    controller._events_since_snapshot = 0
+    controller._pomo_dirty = False
+    controller._reward_dirty = False
+    return controller
+
+
+def test_controller_rebuilds_pomodoro_and_reward_state_from_journal(tmp_path) -> None:
+    clock = SimpleNamespace(mono=1000.0, wall=time.time())
+    pomodoro = PomodoroService(
+        focus_seconds=180, break_seconds=60, monotonic_now=lambda: clock.mono, wall_now=lambda: clock.wall
+    )
+    reward = RewardService()
+    journal = EventJournal(tmp_path / "event_journal.jsonl")
+
+    def advance(seconds: int) -> None:
+        clock.mono += seconds
+        clock.wall += seconds
+
+    def record(event_type: str, payload: dict) -> None:
+        # What the controller does live: mutate, then journal the own-source event.
+        timestamp = datetime.fromtimestamp(clock.wall, tz=timezone.utc).isoformat()
+        journal.append(DugongEvent(event_type, timestamp, source="cornelius", payload=payload))
+        if event_type == "pomo_complete":
+            reward.grant_for_completion(payload)
+        elif event_type == "pomo_skip":
+            reward.on_skip(payload["from_phase"], session_id=payload["session_id"])
+        elif event_type == "co_focus_milestone":
+            reward.cofocus_seconds_total = payload["total_cofocus_seconds"]
+            reward.grant_for_cofocus(payload["milestone_id"], pearls=5)
+
+    def focus_tick(seconds: int) -> None:
+        advance(seconds)
+        view = pomodoro.view()
+        reward.grant_focus_progress(view.session_id, 180 - view.remaining_s)
+        for event_type, payload in pomodoro.tick():
+            record(event_type, payload)
+
+    record("pomo_start", pomodoro.start_focus())
+    for _ in range(3):
+        focus_tick(60)
+    advance(60)
+    for event_type, payload in pomodoro.tick():  # break ends
+        record(event_type, payload)
+    last = journal.load_all()[-1]
+    checkpoint = {
+        "pomodoro": pomodoro.snapshot(),
+        "reward": reward.snapshot(),
+        "cursor": {"timestamp": last.timestamp, "event_ids": [last.event_id]},
+    }
+    advance(1)
+    record("pomo_start", pomodoro.start_focus())
+    focus_tick(130)
+    record("co_focus_milestone", {"milestone_id": "cornelius:cofocus:1", "total_cofocus_seconds": 600})
+    for event_type, payload in pomodoro.skip():
+        record(event_type, payload)
+    advance(10)
+    record("pomo_pause", pomodoro.pause())
+    journal.append(DugongEvent("pomo_start", source="anson", payload={"phase": "focus", "duration_s": 60}))
+
+    # A corrupted snapshot loads as {}: everything comes back from the journal.
+    rebuilt = _replaying_controller(journal)
+    rebuilt._replay_journal({}, {})
+    assert rebuilt.reward.snapshot() == reward.snapshot()
+    assert rebuilt.reward.pearls == 15 and rebuilt.reward.exp == 20 + 2 + 6 + 1
+    assert (rebuilt.pomodoro.view().state, rebuilt.pomodoro.view().phase) == ("PAUSED", "break")
+    assert rebuilt.pomodoro.view().remaining_s == pomodoro.view().remaining_s == 50
+    assert rebuilt._events_since_snapshot == 9
+
+    resumed = _replaying_controller(journal)
+    resumed.pomodoro.restore(checkpoint["pomodoro"])
+    resumed.reward.restore(checkpoint["reward"])
+    resumed._replay_journal(checkpoint["cursor"], checkpoint["cursor"])
+    assert resumed.reward.snapshot() == reward.snapshot()
+    assert resumed.pomodoro.snapshot() == rebuilt.pomodoro.snapshot()
+    assert resumed._events_since_snapshot == 5
+    assert resumed._journal_cursor == rebuilt._journal_cursor
+
+    # Snapshots from before replay carry no cursor and are taken as complete.
+    legacy = _replaying_controller(journal)
+    legacy.reward.restore(reward.snapshot())
+    legacy._replay_journal(None, None)
+    assert legacy.reward.snapshot() == reward.snapshot()
+    assert CURSOR_KEY not in reward.snapshot()
+
+    # A previous generation restored over newer ledger chunks: the milestone is
+    # already marked as granted, yet its pearls are not in the snapshot.
+    fallback = _replaying_controller(journal)
+    fallback.pomodoro.restore(checkpoint["pomodoro"])
+    fallback.reward.restore({**checkpoint["reward"], "granted_cofocus_milestones": ["cornelius:cofocus:1"]})
+    fallback._replay_journal(checkpoint["cursor"], checkpoint["cursor"], reward_ledgers_ahead=True)
+    assert fallback.reward.snapshot() == reward.snapshot()
+
+
+def test_controller_scheduled_job_failure_prints_traceback_and_counts(capsys) -> None:
+    controller = DugongController.__new__(DugongController)
+    controller._health = {}
+    controller._health_dirty = False
+
+    def broken() -> None:
+        raise ValueError("boom")
+
+    try:
+        broken()
+    except ValueError as exc:
+        controller._on_scheduled_job_error("tick", exc)
+        controller._on_scheduled_job_error("tick", exc)
+
+    err = capsys.readouterr().err
+    assert "Traceback (most recent call last)" in err and "in broken" in err
+    failure = controller._health["scheduler_failures"]["tick"]
+    assert failure["count"] == 2 and failure["last_error"] == "ValueError('boom')"
+    assert controller._health_dirty is True
+
+
+def test_controller_publish_survives_network_lane_overflow() -> None:
+    controller = DugongController.__new__(DugongController)
+    published: list[str] = []
+    gate = threading.Event()
+    controller.journal = SimpleNamespace(append_many=lambda events: [True] * len(events))
+    controller.sync_engine = SimpleNamespace(
+        publish_local_events=lambda events: published.extend(e.event_id for e in events) or len(events),
+        last_status="ok",
+    )
+    controller.sync_status = "ok"
+    controller._results = queue.Queue()
+    controller._derived_dirty = False
+    controller._batch_lock = threading.Lock()
+    controller._batch_stats = {}
+    controller._publish_lock = threading.Lock()
+    controller._unpublished = []
+    controller._publish_queued = False
+    controller._sync_lock = threading.Lock()
+    controller._sync_pending = False
+    controller._publish_presence_file = lambda **kwargs: None
+    controller._handle_presence_job = lambda **kwargs: gate.wait(5)  # a slow transport call
+    controller._network_lane = JobLane(
+        "network",
+        controller._run_network_job,
+        maxsize=8,
+        overflow=OVERFLOW_DROP_OLDEST,
+        on_drop=controller._on_network_job_dropped,
+    )
+    try:
+        controller._network_lane.submit({"kind": "presence", "online": True, "reason": "heartbeat"})
+        expected: list[str] = []
+        for n in range(20):
+            event = DugongEvent("click", event_id=f"e{n}", source="cornelius")
+            expected.append(event.event_id)
+            controller._handle_local_events([event])
+            for _ in range(3):
+                controller._network_lane.submit({"kind": "presence", "online": True, "reason": "heartbeat"})
+        assert controller._network_lane.metrics()["dropped"] > 0
+        gate.set()
+        deadline = time.monotonic() + 5
+        while len(published) < len(expected) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert published == expected
+    finally:
+        gate.set()
+        controller._network_lane.stop()
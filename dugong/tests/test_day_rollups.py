@@ -0,0 +1,71 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from dugong_app.core.events import DugongEvent
+from dugong_app.persistence.event_journal import EventJournal
+from dugong_app.services import journal_compaction
+from dugong_app.services.daily_summary import summarize_days, summarize_events
+
+
+def _day(offset: int) -> str:
+    return (datetime.now(tz=timezone.utc).date() - timedelta(days=offset)).isoformat()
+
+
+def _events(day: str, prefix: str) -> list[DugongEvent]:
+    return [
+        DugongEvent("mode_change", f"{day}T09:00:00+00:00", f"{prefix}-m", "cornelius", payload={"mode": "study"}),
+        DugongEvent("state_tick", f"{day}T09:01:00+00:00", f"{prefix}-t1", "cornelius", payload={"mode": "study", "tick_seconds": 90}),
+        DugongEvent("state_tick", f"{day}T09:02:00+00:00", f"{prefix}-t2", "anson", payload={"mode": "chill"}),
+        DugongEvent("click", f"{day}T09:03:00+00:00", f"{prefix}-c", "anson"),
+    ]
+
+
+def test_rollups_track_appends_and_match_full_scan(tmp_path) -> None:
+    journal = EventJournal(tmp_path / "event_journal.jsonl")
+    journal.append_many(_events(_day(2), "a") + _events(_day(0), "b"))
+    journal.append_many(_events(_day(0), "b"))  # all dedupe hits: no double counting
+
+    totals = journal.day_totals()
+    assert summarize_days(totals)["days"] == summarize_events(journal.load_all())["days"]
+    assert totals[0]["sources"] == ["anson", "cornelius"]
+    assert [row["date"] for row in journal.day_totals(since_day=_day(1))] == [_day(0)]
+
+    # Restart: counters come back from the sidecar.
+    reopened = EventJournal(tmp_path / "event_journal.jsonl")
+    assert reopened.day_totals() == totals
+
+
+def test_stale_sidecar_entry_is_recounted_from_its_file(tmp_path) -> None:
+    journal = EventJournal(tmp_path / "event_journal.jsonl")
+    journal.append_many(_events(_day(0), "a"))
+    day_file = tmp_path / "event_journal" / f"{_day(0)}.jsonl"
+    extra = DugongEvent("manual_ping", f"{_day(0)}T10:00:00+00:00", "ext", "anson", payload={"message": "x"})
+    with day_file.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(extra.to_dict()) + "\n")  # written behind the journal's back
+
+    reopened = EventJournal(tmp_path / "event_journal.jsonl")
+    assert reopened.day_totals()[0]["manual_pings"] == 1
+    assert reopened.day_totals()[0]["event_count"] == 5
+
+
+def test_compaction_promotes_rollups_without_reading_raw_lines(tmp_path, monkeypatch) -> None:
+    journal = EventJournal(tmp_path / "event_journal.jsonl")
+    journal.append_many(_events(_day(5), "old") + _events(_day(0), "new"))
+    before = journal.day_totals()
+
+    def _no_raw_reads(_path, _day):
+        raise AssertionError("compaction re-read a raw journal file")
+
+    monkeypatch.setattr(journal_compaction, "_fold_day_file", _no_raw_reads)
+    result = journal_compaction.compact_daily_journal(tmp_path / "event_journal", keep_days=2)
+    assert result == {"scanned_days": 1, "compacted_days": 1, "saved_lines": 3, "resumed": 0}
+
+    rollup = json.loads((tmp_path / "event_journal" / f"{_day(5)}.jsonl").read_text(encoding="utf-8"))
+    assert rollup["payload"]["focus_seconds"] == 90
+    assert rollup["payload"]["rolled_up_event_count"] == 4
+    assert rollup["payload"]["rolled_up_source"] == "mixed"
+
+    reopened = EventJournal(tmp_path / "event_journal.jsonl")
+    after = reopened.day_totals()
+    assert summarize_days(after)["days"] == summarize_days(before)["days"]
+    assert journal_compaction.compact_daily_journal(tmp_path / "event_journal", keep_days=2)["compacted_days"] == 0
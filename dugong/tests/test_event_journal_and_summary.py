@@ -40,6 +40,37 @@ def test_event_journal_append_dedupes_by_event_id(tmp_path) -> None:
     assert len([e for e in loaded if e.event_id == "evt_dup_1"]) == 1
 
 
+def test_event_journal_append_many_groups_by_day_and_dedupes(tmp_path) -> None:
+    journal = EventJournal(tmp_path / "event_journal.jsonl", retention_days=3650)
+    events = [
+        DugongEvent(event_type="click", timestamp="2026-02-17T10:00:00+00:00", event_id="b1", payload={}),
+        DugongEvent(event_type="click", timestamp="2026-02-18T10:00:00+00:00", event_id="b2", payload={}),
+        DugongEvent(event_type="click", timestamp="2026-02-17T11:00:00+00:00", event_id="b1", payload={}),
+        DugongEvent(event_type="click", timestamp="2026-02-17T12:00:00+00:00", event_id="b3", payload={}),
+    ]
+
+    assert journal.append_many(events) == [True, True, False, True]
+    assert journal.append_many(events[:1]) == [False]
+
+    day_17 = (tmp_path / "event_journal" / "2026-02-17.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(day_17) == 2
+    assert [e.event_id for e in journal.load_all()] == ["b1", "b3", "b2"]
+
+
+def test_event_journal_skips_unterminated_tail_line(tmp_path) -> None:
+    day_dir = tmp_path / "event_journal"
+    day_dir.mkdir(parents=True, exist_ok=True)
+    (day_dir / "2026-02-17.jsonl").write_text(
+        '{"event_type":"click","timestamp":"2026-02-17T10:00:00+00:00","event_id":"ok1","payload":{}}\n'
+        '{"event_type":"click","timestamp":"2026-02-17T10:0',
+        encoding="utf-8",
+    )
+
+    journal = EventJournal(tmp_path / "event_journal.jsonl", retention_days=3650)
+    assert [e.event_id for e in journal.load_all()] == ["ok1"]
+    assert journal.last_read_stats()["bad_lines_skipped"] == 0
+
+
 def test_event_journal_bad_line_tolerant_reader(tmp_path, caplog) -> None:
     day_dir = tmp_path / "event_journal"
     day_dir.mkdir(parents=True, exist_ok=True)
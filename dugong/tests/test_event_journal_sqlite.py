@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+
+from dugong_app.core.events import DugongEvent
+from dugong_app.persistence.event_journal import EventJournal
+from dugong_app.persistence.event_journal_sqlite import SqliteEventJournal, open_event_journal
+from dugong_app.services.daily_summary import summarize_days, summarize_events
+from dugong_app.services.focus_sessions import build_focus_sessions
+from dugong_app.services.journal_compaction import compact_sqlite_journal
+
+
+def _day(offset: int) -> str:
+    return (datetime.now(tz=timezone.utc).date() - timedelta(days=offset)).isoformat()
+
+
+def _sample_events() -> list[DugongEvent]:
+    events: list[DugongEvent] = []
+    for offset in (4, 3, 0):
+        day = _day(offset)
+        events += [
+            DugongEvent("mode_change", f"{day}T09:00:00+00:00", f"m1-{day}", "cornelius", payload={"mode": "study"}),
+            DugongEvent("state_tick", f"{day}T09:01:00+00:00", f"t1-{day}", "cornelius", payload={"mode": "study", "tick_seconds": 120}),
+            DugongEvent("state_tick", f"{day}T09:02:00+00:00", f"t2-{day}", "anson", payload={"mode": "chill"}),
+            DugongEvent("click", f"{day}T09:03:00+00:00", f"c1-{day}", "anson", payload={}),
+            DugongEvent("manual_ping", f"{day}T09:04:00+00:00", f"p1-{day}", "cornelius", payload={"message": "x"}),
+            DugongEvent("mode_change", f"{day}T09:30:00+00:00", f"m2-{day}", "cornelius", payload={"mode": "chill"}),
+        ]
+    rollup_day = _day(5)
+    events.append(
+        DugongEvent(
+            "daily_rollup",
+            f"{rollup_day}T23:59:59+00:00",
+            f"rollup-{rollup_day}",
+            "dugong_rollup",
+            payload={"date": rollup_day, "focus_seconds": 600, "ticks": 10, "mode_changes": 2, "clicks": 1, "manual_pings": 0},
+        )
+    )
+    return events
+
+
+def test_append_many_dedupes_on_unique_event_id(tmp_path) -> None:
+    journal = SqliteEventJournal(tmp_path / "event_journal.sqlite3")
+    day = _day(0)
+    events = [
+        DugongEvent("click", f"{day}T10:00:00+00:00", "b1"),
+        DugongEvent("click", f"{day}T11:00:00+00:00", "b2"),
+        DugongEvent("click", f"{day}T10:30:00+00:00", "b1"),
+    ]
+    assert journal.append_many(events) == [True, True, False]
+    assert journal.append(events[0]) is False
+    assert [e.event_id for e in journal.load_all()] == ["b1", "b2"]
+    assert [e.event_id for e in journal.recent(1)] == ["b2"]
+
+
+def test_sql_aggregates_match_python_summary_and_sessions(tmp_path) -> None:
+    events = _sample_events()
+    journal = SqliteEventJournal(tmp_path / "event_journal.sqlite3")
+    journal.append_many(events)
+
+    assert summarize_days(journal.day_totals())["days"] == summarize_events(events)["days"]
+    assert summarize_days(journal.day_totals())["current_streak_days"] == summarize_events(events)["current_streak_days"]
+    assert build_focus_sessions(journal.load_by_type(["mode_change"])) == build_focus_sessions(events)
+
+
+def test_load_source_since_matches_jsonl_backend(tmp_path) -> None:
+    events = _sample_events()
+    jsonl = EventJournal(tmp_path / "event_journal.jsonl")
+    sqlite = SqliteEventJournal(tmp_path / "event_journal.sqlite3")
+    jsonl.append_many(events)
+    sqlite.append_many(events)
+
+    since = f"{_day(3)}T09:01:00+00:00"
+    types = ["mode_change", "manual_ping"]
+    expected = [e.event_id for e in events if e.source == "cornelius" and e.event_type in types and e.timestamp >= since]
+    for journal in (jsonl, sqlite):
+        loaded = journal.load_source_since("cornelius", since, types)
+        assert [e.event_id for e in loaded] == expected
+    assert expected[0] == f"p1-{_day(3)}"
+
+
+def test_open_event_journal_migrates_both_ways(tmp_path) -> None:
+    events = _sample_events()
+    to_sqlite = tmp_path / "a"
+    EventJournal(to_sqlite / "event_journal.jsonl").append_many(events)
+    journal = open_event_journal(to_sqlite, backend="sqlite")
+    assert isinstance(journal, SqliteEventJournal)
+    assert sorted(e.event_id for e in journal.load_all()) == sorted(e.event_id for e in events)
+
+    to_jsonl = tmp_path / "b"
+    seeded = SqliteEventJournal(to_jsonl / "event_journal.sqlite3")
+    seeded.append_many(events)
+    seeded.close()
+    back = open_event_journal(to_jsonl, backend="jsonl")
+    assert isinstance(back, EventJournal)
+    assert sorted(e.event_id for e in back.load_all()) == sorted(e.event_id for e in events)
+
+
+def test_open_event_journal_round_trip_keeps_events_from_both_backends(tmp_path) -> None:
+    first, on_sqlite, back_on_jsonl = _sample_events()[:3]
+    expected = sorted(e.event_id for e in (first, on_sqlite, back_on_jsonl))
+    open_event_journal(tmp_path, backend="jsonl").append(first)
+
+    sqlite_journal = open_event_journal(tmp_path, backend="sqlite")
+    sqlite_journal.append(on_sqlite)
+    sqlite_journal.close()
+    assert (tmp_path / "event_journal.migrated").is_dir()
+    assert not (tmp_path / "event_journal").exists()
+
+    jsonl_journal = open_event_journal(tmp_path, backend="jsonl")
+    jsonl_journal.append(back_on_jsonl)
+    assert sorted(e.event_id for e in jsonl_journal.load_all()) == expected
+    assert (tmp_path / "event_journal.sqlite3.migrated").exists()
+    assert not (tmp_path / "event_journal.sqlite3").exists()
+
+    # Once more: the event written after switching back follows into a fresh SQLite store.
+    again = open_event_journal(tmp_path, backend="sqlite")
+    assert sorted(e.event_id for e in again.load_all()) == expected
+    again.close()
+
+
+def test_compact_sqlite_journal_keeps_summary(tmp_path) -> None:
+    events = _sample_events()
+    journal = SqliteEventJournal(tmp_path / "event_journal.sqlite3")
+    journal.append_many(events)
+    before = summarize_days(journal.day_totals())["days"]
+
+    result = compact_sqlite_journal(journal, keep_days=2)
+    assert result["compacted_days"] == 2
+    assert result["saved_lines"] == 10
+    assert summarize_days(journal.day_totals())["days"] == before
+    assert journal.day_is_rollup(_day(4))
+    assert compact_sqlite_journal(journal, keep_days=2)["compacted_days"] == 0
@@ -0,0 +1,95 @@
+from dugong_app.ui.frame_pacer import PACE_ACTIVE, PACE_IDLE, PACE_OCCLUDED, PACE_PAUSED, BackgroundScroll, FramePacer
+
+
+def test_interval_throttles_by_visibility_and_activity() -> None:
+    pacer = FramePacer(step_ms=28, idle_interval_ms=100, occluded_interval_ms=500)
+
+    assert pacer.interval_ms(visible=True, busy=True) == 28
+    assert pacer.mode == PACE_ACTIVE
+    assert pacer.interval_ms(visible=True, busy=False) == 100
+    assert pacer.mode == PACE_IDLE
+    assert pacer.interval_ms(visible=True, exposed=False, busy=True) == 500
+    assert pacer.mode == PACE_OCCLUDED
+    assert pacer.interval_ms(visible=False, busy=True) == 0
+    assert pacer.mode == PACE_PAUSED
+
+
+def test_fixed_steps_keep_motion_speed_when_throttled() -> None:
+    pacer = FramePacer(step_ms=28, anim_ms=130, max_catchup_steps=6)
+    assert pacer.advance(now=10.0) == (1, 1)
+
+    # Idle pacing (100 ms frames) owes ~3.6 world steps per frame; over one
+    # second the total matches the active 28 ms loop.
+    world = anim = 0
+    now = 10.0
+    for _ in range(10):
+        now += 0.1
+        w, a = pacer.advance(now=now)
+        world += w
+        anim += a
+    assert 34 <= world <= 36
+    assert 7 <= anim <= 8
+
+
+def test_long_stall_is_capped_and_reset_skips_the_gap() -> None:
+    pacer = FramePacer(step_ms=28, anim_ms=130, max_catchup_steps=6)
+    pacer.advance(now=0.0)
+    world, _anim = pacer.advance(now=30.0)
+    assert world == 6
+
+    pacer.reset()
+    assert pacer.advance(now=100.0) == (1, 1)
+    assert pacer.advance(now=100.028) == (1, 0)
+
+
+def test_metrics_report_fps_and_paint_time() -> None:
+    pacer = FramePacer(step_ms=28)
+    now = 0.0
+    for n in range(41):
+        pacer.record_frame(now=now, partial=n % 2 == 1)
+        now += 0.025
+    pacer.record_paint(4.0)
+    pacer.record_paint(14.0)
+
+    metrics = pacer.metrics()
+    assert 39.0 <= metrics["fps"] <= 41.0
+    assert metrics["frames"] == 41
+    assert metrics["partial_frames"] == 20
+    assert metrics["paints"] == 2
+    assert metrics["paint_ms_max"] == 14.0
+    assert 4.0 < metrics["paint_ms_avg"] < 14.0
+
+
+def test_background_scroll_keeps_one_pixel_steps_and_leaves_partial_frames() -> None:
+    pacer = FramePacer(step_ms=28, anim_ms=130)
+    scroll = BackgroundScroll(speed_px=0.65)
+    pacer.advance(now=0.0)
+
+    moved_total = 0
+    now = 0.0
+    for _ in range(200):
+        now += 0.028
+        world, _anim = pacer.advance(now=now)
+        moved = scroll.advance(world, wrap=10_000)
+        assert moved <= 1  # smooth: never skips a pixel at one step per frame
+        moved_total += moved
+        # The shell can only repaint part of the window when the background held still.
+        pacer.record_frame(now=now, partial=moved == 0)
+
+    # Same average speed as a smooth 0.65 px/step scroll.
+    assert abs(moved_total - 200 * 0.65) < 1
+    assert scroll.offset == moved_total
+    metrics = pacer.metrics()
+    assert metrics["frames"] // 4 <= metrics["partial_frames"] <= metrics["frames"] // 2
+
+
+def test_background_scroll_wraps_at_the_tile_width() -> None:
+    scroll = BackgroundScroll(speed_px=1.0, step_px=4)
+    assert scroll.advance(3, wrap=10) == 0
+    assert scroll.offset == 0
+    assert scroll.advance(9, wrap=10) == 12
+    assert scroll.offset == 2
+    assert scroll.advance(0, wrap=10) == 0
+    # Rescaled to a narrower tile: wraps without waiting for the next jump.
+    scroll.advance(1, wrap=2)
+    assert scroll.offset == 0
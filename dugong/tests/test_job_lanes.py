@@ -0,0 +1,94 @@
+import threading
+import time
+
+from dugong_app.services.job_lanes import OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, JobLane
+
+
+def _wait_until(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return predicate()
+
+
+def test_slow_lane_does_not_delay_other_lane() -> None:
+    release = threading.Event()
+    fast_done: list[float] = []
+
+    slow = JobLane("network", lambda _job: release.wait(2.0), maxsize=4, overflow=OVERFLOW_DROP_OLDEST)
+    fast = JobLane("local", lambda _job: fast_done.append(time.monotonic()), maxsize=4, overflow=OVERFLOW_BLOCK)
+    try:
+        slow.submit({"kind": "sync"})
+        started = time.monotonic()
+        fast.submit({"kind": "local_event"})
+        assert _wait_until(lambda: bool(fast_done))
+        assert fast_done[0] - started < 0.5
+        assert fast.metrics()["last_wait_ms"] < 500
+    finally:
+        release.set()
+        slow.stop()
+        fast.stop()
+
+
+def test_drop_oldest_lane_reports_backpressure() -> None:
+    release = threading.Event()
+    dropped: list[dict] = []
+    lane = JobLane(
+        "network",
+        lambda _job: release.wait(2.0),
+        maxsize=2,
+        overflow=OVERFLOW_DROP_OLDEST,
+        on_drop=dropped.append,
+    )
+    try:
+        lane.submit({"n": 0})
+        assert _wait_until(lambda: lane.metrics()["busy"])
+        for n in range(1, 5):
+            lane.submit({"n": n})
+        metrics = lane.metrics()
+        assert metrics["depth"] == 2
+        assert metrics["dropped"] == 2
+        assert metrics["max_depth"] == 2
+        assert [job["n"] for job in dropped] == [1, 2]
+    finally:
+        release.set()
+        lane.stop()
+
+
+def test_lane_errors_are_reported_and_lane_keeps_running() -> None:
+    errors: list[tuple[str, str]] = []
+    seen: list[int] = []
+
+    def handler(job: dict) -> None:
+        if job["n"] == 0:
+            raise RuntimeError("boom")
+        seen.append(job["n"])
+
+    lane = JobLane("derived", handler, on_error=lambda name, exc: errors.append((name, str(exc))))
+    try:
+        lane.submit({"n": 0})
+        lane.submit({"n": 1})
+        assert _wait_until(lambda: seen == [1])
+        assert errors == [("derived", "boom")]
+        assert lane.metrics()["errors"] == 1
+    finally:
+        lane.stop()
+
+
+def test_drain_pending_takes_matching_jobs_in_order() -> None:
+    release = threading.Event()
+    lane = JobLane("network", lambda _job: release.wait(2.0), maxsize=8)
+    try:
+        lane.submit({"kind": "sync"})
+        assert _wait_until(lambda: lane.metrics()["busy"])
+        for job in ({"kind": "publish", "n": 1}, {"kind": "sync"}, {"kind": "publish", "n": 2}):
+            lane.submit(job)
+
+        taken = lane.drain_pending(lambda job: job["kind"] == "publish")
+        assert [job["n"] for job in taken] == [1, 2]
+        assert lane.depth() == 1
+    finally:
+        release.set()
+        lane.stop()
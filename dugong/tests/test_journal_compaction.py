@@ -4,7 +4,7 @@ from datetime import datetime, timedelta, timezone
 from dugong_app.core.events import DugongEvent
 from dugong_app.persistence.event_journal import EventJournal
 from dugong_app.services.daily_summary import summarize_events
-from dugong_app.services.journal_compaction import compact_daily_journal
+from dugong_app.services.journal_compaction import COMPACTION_MANIFEST, compact_daily_journal
 
 
 def test_compact_daily_journal_preserves_summary_and_shrinks_old_day(tmp_path) -> None:
@@ -88,3 +88,58 @@ def test_compact_daily_journal_is_idempotent(tmp_path) -> None:
 
     assert first["compacted_days"] == 1
     assert second["compacted_days"] == 0
+
+
+def _seed_old_days(journal_dir, offsets) -> None:
+    # Shards written directly, with no rollup sidecar, so compaction has to stream them.
+    journal_dir.mkdir(parents=True, exist_ok=True)
+    for offset in offsets:
+        day = (datetime.now(tz=timezone.utc).date() - timedelta(days=offset)).isoformat()
+        events = [
+            DugongEvent("mode_change", f"{day}T09:00:00+00:00", f"m-{day}", payload={"mode": "study"}),
+            DugongEvent("state_tick", f"{day}T09:01:00+00:00", f"t-{day}", payload={"mode": "study", "tick_seconds": 60}),
+            DugongEvent("click", f"{day}T09:02:00+00:00", f"c-{day}", "anson"),
+        ]
+        (journal_dir / f"{day}.jsonl").write_text(
+            "".join(json.dumps(event.to_dict()) + "\n" for event in events), encoding="utf-8"
+        )
+
+
+def test_compact_daily_journal_resumes_after_a_crash(tmp_path) -> None:
+    journal_dir = tmp_path / "event_journal"
+    _seed_old_days(journal_dir, [5, 4, 3])
+    before = summarize_events(EventJournal(tmp_path / "event_journal.jsonl").load_all())
+
+    # A run that died after finishing one shard and while writing another.
+    first = sorted(journal_dir.glob("*.jsonl"))[0]
+    compact_daily_journal(journal_dir, keep_days=1)
+    crashed = first.read_text(encoding="utf-8")
+    _seed_old_days(journal_dir, [4, 3])
+    (journal_dir / COMPACTION_MANIFEST).write_text(
+        json.dumps({"planned": [p.name for p in sorted(journal_dir.glob("*.jsonl"))]}) + "\n"
+        + json.dumps({"done": first.name}) + "\n" + '{"done": "torn',
+        encoding="utf-8",
+    )
+    (journal_dir / ".compact-leftover.tmp").write_text("partial", encoding="utf-8")
+
+    result = compact_daily_journal(journal_dir, keep_days=1)
+    assert result["resumed"] == 1
+    assert result["compacted_days"] == 2
+    assert first.read_text(encoding="utf-8") == crashed
+    assert not (journal_dir / COMPACTION_MANIFEST).exists()
+    assert not list(journal_dir.glob(".compact-*.tmp"))
+    assert summarize_events(EventJournal(tmp_path / "event_journal.jsonl").load_all())["days"] == before["days"]
+
+
+def test_compact_daily_journal_parallel_matches_serial(tmp_path) -> None:
+    serial_dir = tmp_path / "serial" / "event_journal"
+    parallel_dir = tmp_path / "parallel" / "event_journal"
+    _seed_old_days(serial_dir, range(2, 8))
+    _seed_old_days(parallel_dir, range(2, 8))
+
+    serial = compact_daily_journal(serial_dir, keep_days=1, workers=1)
+    parallel = compact_daily_journal(parallel_dir, keep_days=1, workers=2)
+    assert serial == parallel
+    assert serial["compacted_days"] == 6
+    for shard in sorted(serial_dir.glob("*.jsonl")):
+        assert (parallel_dir / shard.name).read_text(encoding="utf-8") == shard.read_text(encoding="utf-8")
@@ -0,0 +1,39 @@
+import random
+
+from dugong_app.core.levels import exp_required_for_level, level_for_exp, level_table, total_exp_for_level
+from dugong_app.services.reward_service import RewardService
+
+
+def _iterative_level(exp: int) -> tuple[int, int]:
+    # The loop RewardService._recompute_level used before the closed form.
+    remaining = max(0, exp)
+    level = 1
+    while remaining >= exp_required_for_level(level):
+        remaining -= exp_required_for_level(level)
+        level += 1
+    return level, remaining
+
+
+def test_closed_form_level_matches_iterative_up_to_1e9() -> None:
+    rng = random.Random(50)
+    samples = [0, 1, 49, 50, 69, 70, 10**9]
+    samples += [rng.randrange(10**9 + 1) for _ in range(60)]
+    for level in (rng.randrange(2, 10_000) for _ in range(30)):
+        boundary = total_exp_for_level(level)
+        samples += [boundary - 1, boundary, boundary + 1]
+    for exp in samples:
+        assert level_for_exp(exp) == _iterative_level(exp), exp
+
+
+def test_level_table_and_reward_progress() -> None:
+    rows = level_table(4)
+    assert rows == [(1, 50, 0), (2, 70, 50), (3, 90, 120), (4, 110, 210)]
+    assert level_table(2) == rows[:2]
+    assert level_table(6)[:4] == rows
+
+    reward = RewardService()
+    reward.restore({"exp": 130})
+    assert (reward.level, reward.exp_in_level, reward.exp_to_next_level()) == (3, 10, 90)
+    assert reward.progress_to_level(4) == (10, 90)
+    assert reward.progress_to_level(5) == (10, 200)
+    assert reward.progress_to_level(2) == (0, 0)
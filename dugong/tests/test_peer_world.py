@@ -0,0 +1,61 @@
+import random
+
+from dugong_app.ui.peer_world import PeerKinematics, PeerRecord
+
+
+def _add(kin: PeerKinematics, source: str, x: float, target_x: float, vx: float = 1.0) -> None:
+    kin.add(source, x=x, y=50.0, target_x=target_x, target_y=50.0, vx=vx, speed=1.5, float_phase=0.0)
+
+
+def test_remove_keeps_rows_dense_and_addressable() -> None:
+    kin = PeerKinematics()
+    for n, src in enumerate(("a", "b", "c")):
+        _add(kin, src, x=10.0 * (n + 1), target_x=200.0)
+
+    assert kin.remove("a") is True
+    assert kin.remove("a") is False
+    assert len(kin) == 2
+    assert sorted(kin.sources()) == ["b", "c"]
+    assert kin.position("c") == (30, 50)
+    assert kin.position("b") == (20, 50)
+
+
+def test_step_moves_towards_target_and_flips_facing() -> None:
+    kin = PeerKinematics()
+    _add(kin, "right", x=100.0, target_x=300.0, vx=-1.0)
+    _add(kin, "left", x=300.0, target_x=100.0, vx=1.0)
+
+    kin.step(0.0, 400.0, 0.0, 100.0, now=0.0, uniform=random.Random(1).uniform)
+
+    assert kin.get("right", "x") == 101.5
+    assert kin.facing("right") == "right"
+    assert kin.get("right", "turning") == 1.0
+    assert kin.get("left", "x") == 298.5
+    assert kin.facing("left") == "left"
+
+
+def test_step_holds_reacting_peers_and_clamps_to_bounds() -> None:
+    kin = PeerKinematics()
+    _add(kin, "busy", x=100.0, target_x=300.0)
+    _add(kin, "edge", x=399.5, target_x=399.9)
+    kin.set("busy", "react_until", 10.0)
+
+    for _ in range(5):
+        kin.step(0.0, 400.0, 0.0, 100.0, now=5.0, uniform=random.Random(2).uniform)
+
+    assert kin.get("busy", "x") == 100.0
+    assert 0.0 <= kin.get("edge", "x") <= 400.0
+
+
+def test_record_applies_entity_fields_and_keeps_missing_ones() -> None:
+    record = PeerRecord("anson", last_seen=1.0)
+    record.title_id = "explorer"
+    record.apply_entity({"mode": "study", "pearls": "12", "level": 3, "online": 0.0}, now=5.0)
+
+    assert record.mode == "study"
+    assert record.pearls == 12
+    assert record.level == 3
+    assert record.online == 0.0
+    assert record.title_id == "explorer"
+    assert record.last_seen == 5.0
+    assert not hasattr(record, "__dict__")
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
+
 from dugong_app.services.pomodoro_service import POMO_IDLE, POMO_PAUSED, PomodoroService
 from dugong_app.services.reward_service import RewardService
 
@@ -234,3 +236,34 @@ def test_shop_purchase_and_equip_flow() -> None:
     ok2, reason2 = reward.buy_shop_item("title", "explorer", 60)
     assert ok2 and reason2 == "equipped"
     assert reward.pearls == 140
+
+
+def test_reward_day_streak_reads_from_persisted_focus_days() -> None:
+    today = datetime.now(tz=timezone.utc).date()
+    reward = RewardService(base_pearls=10, valid_ratio=0.8)
+    # Pre-bitmap state: only the streak counter and its last day were stored.
+    reward.restore({"day_streak": 3, "last_focus_day": (today - timedelta(days=1)).isoformat()})
+    grant = reward.grant_for_completion({"phase": "focus", "session_id": "s1", "duration_s": 100, "completed_s": 100})
+    assert grant is not None and grant.day_streak == 4
+
+    restored = RewardService()
+    restored.restore(reward.snapshot())
+    assert restored.focus_days.current_streak() == 4
+    assert restored.snapshot()["longest_day_streak"] == 4
+    restored.grant_for_completion({"phase": "focus", "session_id": "s2", "duration_s": 100, "completed_s": 100})
+    assert restored.day_streak == 4  # same day: no change
+
+
+def test_reward_replay_keeps_other_days_out_of_today_counters() -> None:
+    yesterday = (datetime.now(tz=timezone.utc).date() - timedelta(days=1)).isoformat()
+    reward = RewardService(base_pearls=10, valid_ratio=0.8)
+    done = {"phase": "focus", "session_id": "s1", "duration_s": 180, "completed_s": 180}
+    reward.apply_event("pomo_complete", done, yesterday)
+    reward.apply_event("pomo_complete", done, yesterday)  # already granted
+    reward.apply_event("pomo_skip", {"from_phase": "focus", "session_id": "s2", "completed_s": 150}, yesterday)
+
+    assert (reward.pearls, reward.exp) == (10, 20 + 2 + 1)
+    assert (reward.today_pearls, reward.today_exp) == (0, 0)
+    assert reward.last_focus_day == yesterday
+    assert reward.focus_streak == 0
+    assert not reward.focus_progress_awarded_steps
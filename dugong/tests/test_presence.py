@@ -0,0 +1,72 @@
+from dugong_app.services.presence import PresencePublisher, PresenceTable, presence_digest
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+
+def _snap(mode: str = "study", heartbeat: str = "t0", online: bool = True) -> dict:
+    return {"source_id": "cornelius", "online": online, "mode": mode, "last_heartbeat": heartbeat, "last_event_id": heartbeat}
+
+
+def test_presence_digest_ignores_volatile_fields() -> None:
+    assert presence_digest(_snap(heartbeat="a")) == presence_digest(_snap(heartbeat="b"))
+    assert presence_digest(_snap(mode="study")) != presence_digest(_snap(mode="chill"))
+
+
+def test_presence_publisher_debounce_hash_guard_and_forced_bye() -> None:
+    clock = _Clock()
+    sent: list[dict] = []
+    publisher = PresencePublisher(min_interval_seconds=10, keepalive_seconds=30, monotonic_now=lambda: clock.now)
+
+    assert publisher.publish(_snap(heartbeat="t0"), sent.append) is True
+    clock.now += 1
+    assert publisher.publish(_snap(heartbeat="t1"), sent.append) is False  # unchanged
+    assert publisher.publish(_snap(mode="chill", heartbeat="t1"), sent.append) is False  # too soon
+    assert publisher.has_pending() is True
+
+    clock.now += 10
+    assert publisher.publish(_snap(mode="chill", heartbeat="t2"), sent.append) is True
+    assert publisher.has_pending() is False
+
+    clock.now += 31
+    assert publisher.due_for_keepalive() is True
+    assert publisher.publish(_snap(mode="chill", heartbeat="t3"), sent.append) is True  # keepalive
+
+    clock.now += 1
+    assert publisher.publish(_snap(mode="chill", heartbeat="t4", online=False), sent.append, force=True) is True
+
+    metrics = publisher.metrics()
+    assert len(sent) == 4
+    assert metrics["published"] == 4
+    assert metrics["forced"] == 1
+    assert metrics["suppressed_unchanged"] == 1
+    assert metrics["suppressed_interval"] == 1
+
+
+def test_presence_publisher_failure_keeps_pending() -> None:
+    publisher = PresencePublisher(min_interval_seconds=0, keepalive_seconds=30)
+
+    def _boom(_snapshot: dict) -> None:
+        raise RuntimeError("status=500")
+
+    assert publisher.publish(_snap(), _boom) is False
+    assert publisher.has_pending() is True
+    assert publisher.metrics()["failed"] == 1
+
+
+def test_presence_table_ttl_and_expiry() -> None:
+    clock = _Clock()
+    table = PresenceTable(ttl_seconds=90, expire_after_seconds=300, wall_now=lambda: clock.now)
+    table.entry("anson")["heartbeat_at"] = clock.now
+    table.entry("kai")["heartbeat_at"] = clock.now
+    table.entry("kai")["online"] = 0.0
+
+    assert [src for src, _ in table.online_items()] == ["anson"]
+    clock.now += 91
+    assert table.online_items() == []
+    assert table.expire() == 0
+    clock.now += 300
+    assert table.expire() == 2
+    assert len(table) == 0
@@ -0,0 +1,53 @@
+from datetime import date, timedelta
+
+from dugong_app.persistence.rollup_archive import RollupArchive
+from dugong_app.services.daily_summary import summarize_days
+
+
+def _rows(first: str, last: str, idle: set[str] = frozenset()) -> list[dict]:
+    rows = []
+    day = date.fromisoformat(first)
+    while day <= date.fromisoformat(last):
+        focus = 0 if day.isoformat() in idle else 600
+        rows.append(
+            {"date": day.isoformat(), "focus_seconds": focus, "ticks": 10, "mode_changes": 2, "clicks": 1, "manual_pings": 0, "event_count": 13}
+        )
+        day += timedelta(days=1)
+    return rows
+
+
+def test_days_fold_into_weeks_and_months_with_lineage(tmp_path) -> None:
+    rows = _rows("2025-01-01", "2025-06-30", idle={"2025-03-15"})
+    archive = RollupArchive(tmp_path / "rollup_archive.json")
+    archive.ingest(rows, before_day="2025-07-01")
+    assert archive.fold(before_day="2025-07-01")
+
+    months = archive.records("month")
+    weeks = archive.records("week")
+    assert [m["start"] for m in months] == ["2025-01-01", "2025-02-01", "2025-03-01"]
+    assert months[0]["rolled_up_from_dates"] == [r["date"] for r in rows[:31]]
+    assert months[2]["active_mask"] == (1 << 31) - 1 - (1 << 14)
+    assert weeks[0]["start"] == "2025-04-01" and weeks[0]["end"] == "2025-04-06"  # clipped to April
+    assert weeks[-1]["start"] == weeks[-1]["end"] == "2025-06-30"
+    assert not archive.records("day")
+    assert len(months) + len(weeks) < 20
+
+    archive.save()
+    reopened = RollupArchive(tmp_path / "rollup_archive.json")
+    full = summarize_days(rows)
+    tiered = summarize_days(rows[-5:], reopened.records())  # live rows overlap the archive
+    assert tiered["totals"] == full["totals"]
+    assert tiered["current_streak_days"] == full["current_streak_days"] == 107
+
+
+def test_late_rows_for_folded_days_are_not_counted_twice(tmp_path) -> None:
+    archive = RollupArchive(tmp_path / "rollup_archive.json")
+    archive.ingest(_rows("2025-01-06", "2025-01-19"), before_day="2025-02-01")
+    archive.fold(before_day="2025-01-20")
+    assert [w["start"] for w in archive.records("week")] == ["2025-01-06", "2025-01-13"]
+
+    assert archive.ingest(_rows("2025-01-10", "2025-01-21"), before_day="2025-01-21") is True
+    assert [d["start"] for d in archive.records("day")] == ["2025-01-20"]
+    summary = summarize_days([], archive.records())
+    assert summary["totals"]["focus_seconds"] == 15 * 600
+    assert summary["current_streak_days"] == 15
@@ -0,0 +1,84 @@
+import random
+
+from dugong_app.services.scheduler import DeadlineScheduler
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _simulate(scheduler: DeadlineScheduler, clock: _Clock, seconds: float) -> None:
+    end = clock.now + seconds
+    while True:
+        delay = scheduler.next_delay()
+        if delay is None or clock.now + delay > end:
+            clock.now = end
+            return
+        clock.now += delay
+        scheduler.run_due()
+
+
+def test_one_second_jobs_share_one_wakeup() -> None:
+    clock = _Clock()
+    scheduler = DeadlineScheduler(monotonic_now=clock)
+    runs: list[str] = []
+    for name in ("pomo", "drain", "flush_state", "flush_pomo", "flush_reward", "flush_health"):
+        scheduler.every(name, 1, lambda n=name: runs.append(n))
+    scheduler.every("sync", 10, lambda: runs.append("sync"))
+    scheduler.every("tick", 60, lambda: runs.append("tick"))
+
+    _simulate(scheduler, clock, 60.0)
+
+    metrics = scheduler.metrics()
+    assert metrics["wakeups"] == 60
+    assert runs.count("pomo") == 60
+    assert runs.count("sync") == 6
+    assert runs.count("tick") == 1
+
+
+def test_missed_periods_are_coalesced_into_one_run() -> None:
+    clock = _Clock()
+    scheduler = DeadlineScheduler(monotonic_now=clock)
+    runs: list[float] = []
+    scheduler.every("pomo", 1, lambda: runs.append(clock.now))
+
+    clock.now += 5.5  # e.g. laptop suspended
+    assert scheduler.run_due() == 1
+    assert len(runs) == 1
+    assert scheduler.metrics()["by_job"]["pomo"]["skipped"] == 4
+    assert abs(scheduler.next_delay() - 0.5) < 1e-9
+
+
+def test_cancel_reschedule_jitter_and_errors() -> None:
+    clock = _Clock()
+    errors: list[str] = []
+    scheduler = DeadlineScheduler(
+        monotonic_now=clock, rng=random.Random(7), on_error=lambda name, _exc: errors.append(name)
+    )
+    runs: list[str] = []
+
+    def boom() -> None:
+        raise RuntimeError("x")
+
+    scheduler.every("boom", 1, boom)
+    scheduler.every("ok", 1, lambda: runs.append("ok"))
+    scheduler.every("sync", 10, lambda: runs.append("sync"), jitter_seconds=2.0)
+
+    clock.now += 1.0
+    scheduler.run_due()
+    assert errors == ["boom"] and runs == ["ok"]
+
+    scheduler.cancel("boom")
+    scheduler.cancel("ok")
+    scheduler.reschedule("sync", 0.0)
+    assert scheduler.next_delay() == 0.0
+    scheduler.run_due()
+    assert runs == ["ok", "sync"]
+    assert 10.0 <= scheduler.next_delay() <= 12.0
+
+    scheduler.cancel("sync")
+    assert scheduler.next_delay() is None
@@ -0,0 +1,57 @@
+import json
+
+from dugong_app.ui.sprite_atlas import (
+    ATLAS_MANIFEST,
+    ATLAS_TEXTURE,
+    ATLAS_VERSION,
+    group_frame_files,
+    list_frame_files,
+    load_manifest,
+    pack_shelves,
+    source_signature,
+)
+
+
+def test_pack_shelves_places_rects_without_overlap() -> None:
+    sizes = [(120, 80), (300, 200), (50, 50), (300, 190), (90, 200), (10, 5)]
+    positions, (width, height) = pack_shelves(sizes, max_width=512)
+
+    assert width <= 512
+    rects = [(x, y, x + w, y + h) for (x, y), (w, h) in zip(positions, sizes)]
+    for x0, y0, x1, y1 in rects:
+        assert 0 <= x0 and 0 <= y0 and x1 <= width and y1 <= height
+    for i, a in enumerate(rects):
+        for b in rects[i + 1 :]:
+            assert a[2] <= b[0] or b[2] <= a[0] or a[3] <= b[1] or b[3] <= a[1]
+
+
+def test_group_frame_files_matches_shell_order(tmp_path) -> None:
+    for name in ("Swim_loop10.PNG", "Swim_loop2.PNG", "Swim_loop1.PNG", "Turn1.PNG", "React_chill.PNG", "notes.txt"):
+        (tmp_path / name).write_bytes(b"x")
+    (tmp_path / ATLAS_TEXTURE).write_bytes(b"atlas")
+
+    groups = group_frame_files(list_frame_files(tmp_path))
+    assert [p.name for p in groups["swim_loop"]] == ["Swim_loop1.PNG", "Swim_loop2.PNG", "Swim_loop10.PNG"]
+    assert [p.name for p in groups["turn"]] == ["Turn1.PNG"]
+    assert "idle_loop" not in groups
+
+
+def test_load_manifest_rejects_stale_or_malformed_atlas(tmp_path) -> None:
+    (tmp_path / "Swim_loop1.PNG").write_bytes(b"frame-one")
+    (tmp_path / ATLAS_TEXTURE).write_bytes(b"atlas")
+    manifest = {
+        "version": ATLAS_VERSION,
+        "texture": ATLAS_TEXTURE,
+        "sources": source_signature(list_frame_files(tmp_path)),
+        "groups": {"swim_loop": [{"name": "Swim_loop1.PNG", "rect": [0, 0, 4, 4], "offset": [1, 2], "source_size": [8, 8]}]},
+    }
+    (tmp_path / ATLAS_MANIFEST).write_text(json.dumps(manifest), encoding="utf-8")
+    assert load_manifest(tmp_path) == manifest
+
+    (tmp_path / "Swim_loop1.PNG").write_bytes(b"frame-one-edited")
+    assert load_manifest(tmp_path) is None
+
+    manifest["sources"] = source_signature(list_frame_files(tmp_path))
+    manifest["groups"]["swim_loop"][0]["rect"] = [0, 0, 4]
+    (tmp_path / ATLAS_MANIFEST).write_text(json.dumps(manifest), encoding="utf-8")
+    assert load_manifest(tmp_path) is None
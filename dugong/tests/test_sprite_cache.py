@@ -0,0 +1,41 @@
+from dugong_app.ui.sprite_cache import SpriteCache
+
+
+def test_sprite_cache_shares_entries_between_holders() -> None:
+    cache = SpriteCache(max_idle=1)
+    builds: list[tuple] = []
+
+    def build(key: tuple):
+        return lambda: builds.append(key) or [f"frame:{key}"]
+
+    key = ("default", 94, "right")
+    first = cache.acquire(key, build(key))
+    for _ in range(7):
+        assert cache.acquire(key, build(key)) is first
+    assert builds == [key]
+    assert cache.refcount(key) == 8
+
+    for _ in range(8):
+        cache.release(key)
+    assert cache.refcount(key) == 0
+    assert key in cache  # idle entries stay until LRU pressure
+
+
+def test_sprite_cache_evicts_least_recently_used_idle_entries() -> None:
+    cache = SpriteCache(max_idle=1)
+    held = ("horse", 94, "right")
+    cache.acquire(held, lambda: ["h"])
+    cache.acquire(("default", 94, "right"), lambda: ["d94"])
+    cache.acquire(("default", 120, "right"), lambda: ["d120"])
+
+    cache.release(("default", 94, "right"))
+    cache.release(("default", 120, "right"))
+
+    assert ("default", 94, "right") not in cache
+    assert ("default", 120, "right") in cache
+    assert held in cache
+    assert cache.metrics()["evictions"] == 1
+
+    cache.get_or_build(("King", 94, "left"), lambda: ["k"])
+    assert ("default", 120, "right") not in cache
+    assert held in cache
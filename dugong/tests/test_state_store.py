@@ -0,0 +1,118 @@
+import json
+import sqlite3
+
+import pytest
+
+from dugong_app.core.state import DugongState
+from dugong_app.persistence.pomodoro_state_json import PomodoroStateStorage
+from dugong_app.persistence.reward_state_json import RewardStateStorage
+from dugong_app.persistence.state_store import PREVIOUS_GENERATION_KEY, StateStore
+from dugong_app.persistence.storage_json import JsonStorage
+from dugong_app.persistence.sync_cursor_json import SyncCursorStorage
+from dugong_app.services.reward_service import RewardService
+
+
+def test_dirty_sections_are_committed_together(tmp_path) -> None:
+    store = StateStore(tmp_path / "state.sqlite3")
+    JsonStorage(tmp_path / "dugong_state.json", store=store).save(DugongState(energy=12, mode="study"))
+    RewardStateStorage(tmp_path / "reward_state.json", store=store).save({"pearls": 7})
+    RewardStateStorage(tmp_path / "reward_state.json", store=store).save({"pearls": 9})
+
+    # Nothing hits disk until commit, and then it is one transaction.
+    assert not (tmp_path / "dugong_state.json").exists()
+    assert store.commit() == 2
+    assert store.commit() == 0
+    assert store.metrics()["commits"] == 1
+    store.close()
+
+    reopened = StateStore(tmp_path / "state.sqlite3")
+    assert JsonStorage(tmp_path / "dugong_state.json", store=reopened).load().energy == 12
+    assert RewardStateStorage(tmp_path / "reward_state.json", store=reopened).load() == {"pearls": 9}
+
+
+def test_legacy_files_are_migrated_then_retired(tmp_path) -> None:
+    (tmp_path / "reward_state.json").write_text(json.dumps({"pearls": 42}), encoding="utf-8")
+    (tmp_path / "sync_cursor.json").write_text(json.dumps({"anson.jsonl": 12}), encoding="utf-8")
+    store = StateStore(tmp_path / "state.sqlite3")
+
+    assert RewardStateStorage(tmp_path / "reward_state.json", store=store).load() == {"pearls": 42}
+    cursor = SyncCursorStorage(tmp_path / "sync_cursor.json", store=store).load()
+    assert cursor["file_cursors"] == {"anson.jsonl": 12}
+    assert (tmp_path / "reward_state.json").exists()
+
+    assert store.commit() == 2
+    assert not (tmp_path / "reward_state.json").exists()
+    assert (tmp_path / "reward_state.json.migrated").exists()
+    assert store.metrics()["migrated"] == 2
+
+    fresh = StateStore(tmp_path / "state.sqlite3")
+    assert RewardStateStorage(tmp_path / "reward_state.json", store=fresh).load() == {"pearls": 42}
+
+
+def test_failed_commit_keeps_sections_dirty(tmp_path, monkeypatch) -> None:
+    store = StateStore(tmp_path / "state.sqlite3")
+    store.stage("reward_state", {"pearls": 1})
+
+    def _boom():
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(store, "_connect", _boom)
+    with pytest.raises(sqlite3.OperationalError):
+        store.commit()
+    assert store.dirty
+    assert store.metrics()["errors"] == 1
+
+    monkeypatch.undo()
+    assert store.commit() == 1
+    assert StateStore(tmp_path / "state.sqlite3").load("reward_state") == {"pearls": 1}
+
+
+def test_reward_ledgers_are_saved_as_changed_chunks(tmp_path) -> None:
+    store = StateStore(tmp_path / "state.sqlite3")
+    storage = RewardStateStorage(tmp_path / "reward_state.json", store=store)
+    reward = RewardService()
+    for n in range(300):
+        reward.granted_sessions.add(f"s{n}")
+    storage.save(reward.snapshot(include_ledgers=False), ledger_chunks=reward.drain_ledger_chunks())
+    assert store.commit() == 3  # main section + two chunks
+
+    reward.grant_for_cofocus("a:cofocus:1")
+    reward.granted_sessions.add("s300")
+    storage.save(reward.snapshot(include_ledgers=False), ledger_chunks=reward.drain_ledger_chunks())
+    assert store.commit() == 3  # main section + one session chunk + one milestone chunk
+    store.close()
+
+    reopened = RewardStateStorage(tmp_path / "reward_state.json", store=StateStore(tmp_path / "state.sqlite3")).load()
+    restored = RewardService()
+    restored.restore(reopened)
+    assert len(restored.granted_sessions) == 301 and "s0" in restored.granted_sessions
+    assert "a:cofocus:1" in restored.granted_cofocus_milestones
+    assert restored.drain_ledger_chunks() == {"granted_sessions": {}, "granted_cofocus_milestones": {}}
+
+
+def test_snapshot_sections_fall_back_to_the_previous_generation(tmp_path) -> None:
+    store = StateStore(tmp_path / "state.sqlite3")
+    storage = PomodoroStateStorage(tmp_path / "pomodoro_state.json", store=store)
+    storage.save({"n": 1})
+    storage.save({"n": 2})
+    store.commit()
+    assert store.load_previous("pomodoro_state") is None  # only committed payloads become the fallback
+    storage.save({"n": 3})
+    store.commit()
+    store.close()
+    conn = sqlite3.connect(str(tmp_path / "state.sqlite3"))
+    conn.execute("UPDATE sections SET payload = '{\"n\": 3' WHERE name = 'pomodoro_state'")
+    conn.commit()
+    conn.close()
+
+    reopened = StateStore(tmp_path / "state.sqlite3")
+    storage = PomodoroStateStorage(tmp_path / "pomodoro_state.json", store=reopened)
+    assert storage.load() == {"n": 2, PREVIOUS_GENERATION_KEY: True}
+
+    # The unreadable payload never replaces the good previous one.
+    storage.save({"n": 4})
+    reopened.commit()
+    assert reopened.load_previous("pomodoro_state") == {"n": 2}
+    storage.save({"n": 5})
+    reopened.commit()
+    assert StateStore(tmp_path / "state.sqlite3").load_previous("pomodoro_state") == {"n": 4}
@@ -1,4 +1,4 @@
-from dugong_app.core.events import manual_ping_event
+from dugong_app.core.events import manual_ping_event, presence_heartbeat_event
 from dugong_app.interaction.transport_file import FileTransport
 from dugong_app.persistence.event_journal import EventJournal
 from dugong_app.persistence.sync_cursor_json import SyncCursorStorage
@@ -32,6 +32,55 @@ def test_file_transport_and_sync_engine_deduplicate(tmp_path) -> None:
     assert len([e for e in loaded if e.event_type == "manual_ping"]) == 1
 
 
+def test_sync_engine_does_not_journal_legacy_presence_events(tmp_path) -> None:
+    shared_dir = tmp_path / "shared"
+    a_engine = SyncEngine(
+        source_id="cornelius",
+        journal=EventJournal(tmp_path / "a" / "event_journal.jsonl"),
+        transport=FileTransport(shared_dir=shared_dir, source_id="cornelius"),
+    )
+    b_journal = EventJournal(tmp_path / "b" / "event_journal.jsonl")
+    b_engine = SyncEngine(
+        source_id="anson",
+        journal=b_journal,
+        transport=FileTransport(shared_dir=shared_dir, source_id="anson"),
+    )
+
+    heartbeat = presence_heartbeat_event(mode="study", pomo_phase="focus", instance_id="i1", source="cornelius")
+    a_engine.publish_local_events([heartbeat, manual_ping_event("hi", source="cornelius")])
+
+    result = b_engine.sync_once()
+    assert result["imported"] == 1
+    assert [e.event_type for e in result["presence_events"]] == ["presence_heartbeat"]
+    assert [e.event_type for e in b_journal.load_all()] == ["manual_ping"]
+    assert b_engine.sync_once()["presence_events"] == []
+
+
+def test_sync_engine_publish_batch_is_single_send_and_idempotent(tmp_path) -> None:
+    class BatchTransport:
+        def __init__(self) -> None:
+            self.batches: list[list[dict]] = []
+
+        def send(self, payload: dict) -> None:
+            self.batches.append([payload])
+
+        def send_many(self, payloads: list[dict]) -> None:
+            self.batches.append(list(payloads))
+
+        def receive(self) -> list[dict]:
+            return []
+
+    transport = BatchTransport()
+    engine = SyncEngine(source_id="cornelius", journal=EventJournal(tmp_path / "event_journal.jsonl"), transport=transport)
+    e1 = manual_ping_event("a", source="cornelius")
+    e2 = manual_ping_event("b", source="cornelius")
+
+    assert engine.publish_local_events([e1, e2, e1]) == 2
+    assert engine.publish_local_events([e1, e2]) == 0
+    assert len(transport.batches) == 1
+    assert [p["event_id"] for p in transport.batches[0]] == [e1.event_id, e2.event_id]
+
+
 def test_sync_engine_backoff_and_force(tmp_path) -> None:
     class FailingTransport:
         def __init__(self) -> None:
@@ -116,3 +165,32 @@ def test_sync_engine_cursor_persistence_across_restart(tmp_path) -> None:
     a_engine.publish_local_event(event2)
     r3 = b_engine2.sync_once()
     assert r3["imported"] == 1
+
+
+def test_sync_engine_publishes_versioned_cursor_snapshot(tmp_path) -> None:
+    shared_dir = tmp_path / "shared"
+    a_journal = EventJournal(tmp_path / "a" / "event_journal.jsonl")
+    b_journal = EventJournal(tmp_path / "b" / "event_journal.jsonl")
+    a_engine = SyncEngine(source_id="cornelius", journal=a_journal, transport=FileTransport(shared_dir, "cornelius"))
+    b_engine = SyncEngine(source_id="anson", journal=b_journal, transport=FileTransport(shared_dir, "anson"))
+    before = b_engine.cursor_snapshot
+
+    event = manual_ping_event("hello", source="cornelius")
+    a_journal.append(event)
+    a_engine.publish_local_event(event)
+    b_engine.sync_once()
+
+    after = b_engine.cursor_snapshot
+    assert after.version == before.version + 1
+    assert after.last_seen_event_id_by_source == {"cornelius": event.event_id}
+    assert before.last_seen_event_id_by_source == {}
+    try:
+        after.last_seen_event_id_by_source["cornelius"] = "x"  # type: ignore[index]
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("snapshot maps must be read-only")
+
+    # Nothing new: same snapshot object, no new version for readers to copy.
+    b_engine.sync_once()
+    assert b_engine.cursor_snapshot is after
@@ -17,6 +17,22 @@ def test_github_transport_send_appends_line(monkeypatch) -> None:
     assert text.splitlines() == ['{"a":1}', '{"event_id": "e2"}']
 
 
+def test_github_transport_send_many_is_one_commit(monkeypatch) -> None:
+    gt = GithubTransport(repo="owner/repo", token="t", source_id="cornelius")
+    reads: list[str] = []
+    writes: list[tuple[str, str, str | None, str]] = []
+
+    monkeypatch.setattr(gt, "_read_remote_file", lambda path: (reads.append(path), ('{"a":1}', "sha1"))[1])
+    monkeypatch.setattr(gt, "_write_remote_file", lambda path, text, sha, message: writes.append((path, text, sha, message)))
+
+    gt.send_many([{"event_id": "e2"}, {"event_id": "e3"}])
+
+    assert len(reads) == 1
+    assert len(writes) == 1
+    assert writes[0][1].splitlines() == ['{"a":1}', '{"event_id": "e2"}', '{"event_id": "e3"}']
+    assert writes[0][3].endswith("append 2 events")
+
+
 def test_github_transport_receive_skips_own_file(monkeypatch) -> None:
     gt = GithubTransport(repo="owner/repo", token="t", source_id="cornelius")
 
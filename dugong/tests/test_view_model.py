@@ -0,0 +1,48 @@
+from dugong_app.ui.view_model import ViewModel
+
+
+def _entity(source: str, **fields) -> dict:
+    return {"source": source, "mode": "study", "pearls": 0, "last_seen": 1.0, **fields}
+
+
+def test_first_diff_is_full_and_unchanged_view_short_circuits() -> None:
+    vm = ViewModel()
+    sections = {"state_text": "[study] ok", "reward_stats": {"pearls": 3, "level": 1}}
+    entities = [_entity("local"), _entity("anson")]
+
+    first = vm.diff(sections, entities)
+    assert first is not None
+    assert first["state_text"] == "[study] ok"
+    assert first["reward_stats"] == {"pearls": 3, "level": 1}
+    assert [e["source"] for e in first["entities"]] == ["local", "anson"]
+    assert first["removed_entities"] == []
+
+    # Only the volatile last_seen moved: nothing to push.
+    again = [_entity("local", last_seen=99.0), _entity("anson", last_seen=50.0)]
+    assert vm.diff(dict(sections), again) is None
+    assert vm.metrics()["skipped"] == 1
+
+
+def test_dict_sections_send_only_changed_keys() -> None:
+    vm = ViewModel()
+    vm.diff({"reward_stats": {"pearls": 3, "level": 1, "shop_owned_skins": ["default"]}})
+
+    changes = vm.diff({"reward_stats": {"pearls": 5, "level": 1, "shop_owned_skins": ["default"]}})
+    assert changes == {"reward_stats": {"pearls": 5}}
+
+    changes = vm.diff({"reward_stats": {"pearls": 5, "level": 1, "shop_owned_skins": ["default", "king"]}})
+    assert changes == {"reward_stats": {"shop_owned_skins": ["default", "king"]}}
+
+
+def test_entities_are_upserted_and_removed_by_source() -> None:
+    vm = ViewModel()
+    vm.diff({}, [_entity("local"), _entity("anson"), _entity("cornelius")])
+
+    changes = vm.diff({}, [_entity("local"), _entity("anson", pearls=10)])
+    assert changes is not None
+    assert [e["source"] for e in changes["entities"]] == ["anson"]
+    assert changes["removed_entities"] == ["cornelius"]
+
+    vm.reset()
+    full = vm.diff({}, [_entity("local"), _entity("anson", pearls=10)])
+    assert full is not None and len(full["entities"]) == 2